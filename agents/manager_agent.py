@@ -120,6 +120,28 @@ class ManagerAgent(BaseAgent):
                 return f"Error retrieving context: {str(e)}"
         
         self.register_tool("get_context", get_context)
+        
+        def get_context_for_plans(question: str, plan_names: List[str]) -> str:
+            """
+            Pass question and the plan names to compare, to get details for each plan in one call
+            Supported plan name are: 
+                1.familyHealthOptimaInsurancePlan 
+                2.seniorCitizensRedCarpetHealthInsurancePolicy 
+                3.starComprehensiveInsurancePolicy 
+                4.starHealthGainInsurancePolicy
+            """
+            try:
+                results = vector_store.search_batch([question] * len(plan_names), filters=plan_names, top_k=5)
+                context = "\n".join(
+                    f"Plan {plan_name}:\n{self._format_context(plan_results)}"
+                    for plan_name, plan_results in zip(plan_names, results)
+                )
+                logger.info(f"Getting context for question: {question} plan_names {plan_names} and context: {context}")
+                return context
+            except Exception as e:
+                return f"Error retrieving context: {str(e)}"
+        
+        self.register_tool("get_context_for_plans", get_context_for_plans)
     
 
     def register_assistant_agents(self, assistant_agents: AssistantAgent) -> None:
@@ -31,6 +31,7 @@ def main():
     logger.info("Starting Agentic RAG System")
     logger.info("=" * 50)
 
+    orchestrator = None
     try:
 
         logger.info("Loading configuration...")
@@ -48,6 +49,7 @@ def main():
         logger.info(f"Assistant Agent: {info['components']['assistant_agent']}")
 
         logger.info("Processing Document...")
+        # Documents are ingested resumably with: python ingest.py documents
         # document_path = [
         #     {
         #         "path": "documents/Family Health Optima Insurance Plan.pdf",
@@ -111,6 +113,9 @@ def main():
     except Exception as e:
         logger.error(f"Error initializing system: {e}")
         return 1
+    finally:
+        if orchestrator is not None:
+            orchestrator.close()
 
     return 0
 
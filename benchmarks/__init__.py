@@ -0,0 +1,3 @@
+"""
+Benchmarks for the Agentic RAG ingestion and retrieval paths.
+"""
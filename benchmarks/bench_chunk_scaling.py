@@ -0,0 +1,88 @@
+"""
+Benchmark chunk_parallel scaling from 1 to N worker processes.
+
+Chunks the parsed policy documents with chunk_parallel at 1, 2, 4, ... up to
+N workers and reports the time, speedup over one process and parallel
+efficiency, and checks the nodes match chunk(). Each worker pool is warmed up
+by an untimed run first, so the timings leave out process startup. Use
+--copies to repeat the documents when there are fewer of them than cores.
+
+Usage:
+    python benchmarks/bench_chunk_scaling.py --chunker hierarchical
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.common import load_policy_documents, print_table, timed
+from chunkers.hierarchical_chunker import HierarchicalChunker
+from chunkers.layout_chunker import LayoutChunker
+
+
+def make_chunker(name: str):
+    """Create the chunker to benchmark."""
+    if name == "hierarchical":
+        return HierarchicalChunker(chunk_sizes=[1536, 512, 128])
+    if name == "layout":
+        return LayoutChunker()
+    # Imported here so the other chunkers do not need the embedding model
+    from chunkers.semantic_chunker import SemanticChunker
+    return SemanticChunker(threshold=95)
+
+
+def worker_counts(max_workers: int):
+    """Powers of two up to max_workers, always including max_workers."""
+    counts = []
+    count = 1
+    while count < max_workers:
+        counts.append(count)
+        count *= 2
+    counts.append(max_workers)
+    return counts
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents-dir", default="documents")
+    parser.add_argument("--chunker", choices=["hierarchical", "layout", "semantic"], default="hierarchical")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--copies", type=int, default=1, help="Repeat the documents this many times")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per worker count, the fastest is reported")
+    args = parser.parse_args()
+
+    documents = load_policy_documents(args.documents_dir) * args.copies
+    total_chars = sum(len(document.text) for document in documents)
+    chunker = make_chunker(args.chunker)
+    expected = [(node.node_id, node.text) for node in chunker.chunk(documents)]
+
+    rows = []
+    baseline = None
+    for workers in worker_counts(args.max_workers):
+        nodes = chunker.chunk_parallel(documents, max_workers=workers)
+        best = None
+        for _ in range(args.repeat):
+            nodes, elapsed = timed(chunker.chunk_parallel, documents, max_workers=workers)
+            best = elapsed if best is None else min(best, elapsed)
+
+        baseline = baseline or best
+        rows.append([
+            workers,
+            len(nodes),
+            best,
+            total_chars / best / 1e6,
+            baseline / best,
+            baseline / best / workers,
+            [(node.node_id, node.text) for node in nodes] == expected,
+        ])
+
+    chunker.close()
+    print(f"{args.chunker}: {len(documents)} documents, {total_chars / 1e6:.1f}M characters")
+    print_table(["workers", "nodes", "seconds", "MB/sec", "speedup", "efficiency", "matches chunk()"], rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
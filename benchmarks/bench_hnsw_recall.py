@@ -0,0 +1,123 @@
+"""
+Benchmark HnswStore recall and latency against exact search in NumpyStore.
+
+Builds one HnswStore per M value over synthetic clustered embeddings spread
+across plans, then sweeps ef and reports recall@k against the exact top-k of
+NumpyStore, with the mean and p95 query latency of both, for unfiltered and
+plan_name filtered queries. Graph search is used for filtered queries too,
+unless --exact-threshold is raised.
+
+Usage:
+    python benchmarks/bench_hnsw_recall.py --points 200000 --m 8 16 32 --ef 16 32 64 128 256
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.common import print_table, timed
+from util.chunk_batch import ChunkBatch, ChunkRecord
+from vector_stores.hnsw_store import HnswStore
+from vector_stores.numpy_store import NumpyStore
+
+
+def make_batch(points: int, dim: int, plans: int, clusters: int, seed: int) -> ChunkBatch:
+    """Build an already embedded batch of clustered vectors, assigned round-robin to plans."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, clusters, points)] + 0.5 * rng.standard_normal((points, dim)).astype(np.float32)
+    records = [
+        ChunkRecord(node_id=f"point-{index}", text="", metadata={"plan_name": f"plan{index % plans}"}, relationships={})
+        for index in range(points)
+    ]
+    batch = ChunkBatch(records)
+    batch.set_embeddings(range(points), vectors)
+    return batch
+
+
+def run_queries(store, queries, top_k, plan_names, **kwargs):
+    """Run every query and get the result IDs and latencies in milliseconds."""
+    results = []
+    latencies = []
+    for query, plan_name in zip(queries, plan_names):
+        start = time.perf_counter()
+        nodes = store.search_by_vector(query, top_k=top_k, plan_name=plan_name, **kwargs)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append([node.node.node_id for node in nodes])
+    return results, latencies
+
+
+def recall(results, expected) -> float:
+    """Mean fraction of the exact top-k found."""
+    return statistics.mean(
+        len(set(found) & set(truth)) / len(truth) for found, truth in zip(results, expected) if truth
+    )
+
+
+def p95(latencies) -> float:
+    """95th percentile latency."""
+    return sorted(latencies)[int(len(latencies) * 0.95)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--plans", type=int, default=40)
+    parser.add_argument("--clusters", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--m", type=int, nargs="+", default=[8, 16, 32])
+    parser.add_argument("--ef", type=int, nargs="+", default=[16, 32, 64, 128, 256])
+    parser.add_argument("--ef-construction", type=int, default=200)
+    parser.add_argument("--exact-threshold", type=int, default=0,
+                        help="Search plans of at most this many points exactly")
+    args = parser.parse_args()
+
+    batch = make_batch(args.points, args.dim, args.plans, args.clusters, seed=0)
+    rng = np.random.default_rng(1)
+    queries = batch.embeddings[rng.integers(0, args.points, args.queries)]
+    queries = queries + 0.5 * rng.standard_normal(queries.shape).astype(np.float32)
+    filtered_plans = [f"plan{index % args.plans}" for index in range(args.queries)]
+
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="bench_hnsw_") as work_dir:
+        exact_store = NumpyStore(collection_name="exact", store_dir=work_dir, manifest_dir=work_dir,
+                                 enable_embedding_cache=False)
+        exact_store.add(batch)
+        expected = {}
+        for label, plan_names in (("all", [None] * args.queries), ("plan", filtered_plans)):
+            results, latencies = run_queries(exact_store, queries, args.top_k, plan_names)
+            expected[label] = (plan_names, results)
+            rows.append(["exact", "-", "-", label, 1.0, statistics.mean(latencies), p95(latencies)])
+        exact_store.close()
+
+        for m in args.m:
+            store = HnswStore(collection_name=f"hnsw_m{m}", store_dir=work_dir, manifest_dir=work_dir,
+                              enable_embedding_cache=False, m=m, ef_construction=args.ef_construction,
+                              initial_capacity=args.points, exact_search_threshold=args.exact_threshold,
+                              save_interval=args.points + 1)
+            _, build_seconds = timed(store.add, batch)
+            for ef in args.ef:
+                for label, (plan_names, truth) in expected.items():
+                    results, latencies = run_queries(store, queries, args.top_k, plan_names, ef=ef)
+                    rows.append([
+                        "hnsw", m, ef, label, recall(results, truth),
+                        statistics.mean(latencies), p95(latencies),
+                    ])
+            print(f"M={m}: built {args.points} points in {build_seconds:.1f}s")
+            store.drop_collection()
+
+    print(f"{args.points} points, {args.dim} dims, {args.plans} plans, top_k={args.top_k}")
+    print_table(["search", "M", "ef", "filter", f"recall@{args.top_k}", "mean ms", "p95 ms"], rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
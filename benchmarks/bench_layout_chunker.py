@@ -0,0 +1,63 @@
+"""
+Benchmark LayoutChunker against HierarchicalChunker.
+
+Chunks the parsed policy documents with both chunkers and reports chunking
+speed and the number and size of the chunks each one produces. For the
+hierarchical chunker, leaf chunks (the ones retrieval starts from) are
+reported separately from all levels.
+
+Usage:
+    python benchmarks/bench_layout_chunker.py
+"""
+import argparse
+import statistics
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from llama_index.core.node_parser import get_leaf_nodes
+
+from benchmarks.common import load_policy_documents, print_table, timed
+from chunkers.hierarchical_chunker import HierarchicalChunker
+from chunkers.layout_chunker import LayoutChunker
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents-dir", default="documents")
+    parser.add_argument("--max-chunk-tokens", type=int, default=512)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per chunker, the fastest is reported")
+    args = parser.parse_args()
+
+    documents = load_policy_documents(args.documents_dir)
+    total_chars = sum(len(document.text) for document in documents)
+
+    chunkers = (
+        ("HierarchicalChunker", lambda: HierarchicalChunker(chunk_sizes=[1536, 512, 128])),
+        ("LayoutChunker", lambda: LayoutChunker(max_chunk_tokens=args.max_chunk_tokens)),
+    )
+
+    rows = []
+    for label, make_chunker in chunkers:
+        best = None
+        for _ in range(args.repeat):
+            nodes, elapsed = timed(make_chunker().chunk, documents)
+            best = elapsed if best is None else min(best, elapsed)
+
+        leaves = get_leaf_nodes(nodes) if label == "HierarchicalChunker" else nodes
+        rows.append([
+            label,
+            len(nodes),
+            len(leaves),
+            int(statistics.mean(len(node.get_content()) for node in leaves)) if leaves else 0,
+            best,
+            total_chars / best / 1e6,
+        ])
+
+    print_table(["chunker", "chunks", "leaf chunks", "mean leaf chars", "seconds", "MB/sec"], rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
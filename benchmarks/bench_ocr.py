@@ -0,0 +1,53 @@
+"""
+Benchmark full-page OCR against selective per-page OCR in DoclingParser.
+
+Parses the policy PDFs with the parser cache disabled and reports pages/sec
+for each OCR mode, along with how many pages selective mode sent to OCR.
+
+Usage:
+    python benchmarks/bench_ocr.py
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.common import get_policy_paths, print_table, timed
+from parsers.docling_parser import DoclingParser
+from parsers.pdf_pages import get_page_count
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents-dir", default="documents")
+    parser.add_argument("--table-structure", action="store_true")
+    args = parser.parse_args()
+
+    file_paths = get_policy_paths(args.documents_dir)
+    total_pages = sum(get_page_count(file_path["path"]) for file_path in file_paths)
+
+    rows = []
+    for ocr_mode in ("full", "selective"):
+        docling_parser = DoclingParser(
+            enable_ocr=True,
+            table_structure=args.table_structure,
+            ocr_mode=ocr_mode,
+            enable_cache=False,
+        )
+
+        ocr_pages = 0
+        elapsed = 0.0
+        for file_path in file_paths:
+            documents, seconds = timed(docling_parser.parse, file_path)
+            elapsed += seconds
+            ocr_pages += documents[0].metadata.get("ocr_page_count", get_page_count(file_path["path"]))
+
+        rows.append([ocr_mode, total_pages, ocr_pages, elapsed, total_pages / elapsed])
+
+    print_table(["mode", "pages", "OCR'd pages", "seconds", "pages/sec"], rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Benchmark ParserCache storage formats on the policy documents.
+
+Reports the compression ratio, the latency of reading a whole cached
+document and the latency of reading one section lazily, for plain
+markdown files read with f.read() and for each framed storage format.
+
+Usage:
+    python benchmarks/bench_parser_cache.py --repeat 50
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.common import get_policy_paths, load_policy_documents, print_table
+from util.cache_util import ParserCache, zstandard
+
+
+def median_ms(func, repeat: int) -> float:
+    """Median latency of a call in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    file_paths = get_policy_paths()
+    documents = load_policy_documents()
+    markdown = {file_path["path"]: document.text for file_path, document in zip(file_paths, documents)}
+    raw_size = sum(len(text.encode("utf-8")) for text in markdown.values())
+
+    rows = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Previous format: one plain .md file read in full
+        plain_paths = []
+        for index, text in enumerate(markdown.values()):
+            plain_path = Path(temp_dir) / f"plain_{index}.md"
+            plain_path.write_text(text, encoding="utf-8")
+            plain_paths.append(plain_path)
+
+        def read_plain():
+            for plain_path in plain_paths:
+                with open(plain_path, "r", encoding="utf-8") as f:
+                    f.read()
+
+        rows.append(["plain f.read()", 1.0, median_ms(read_plain, args.repeat), "-"])
+
+        formats = ["none", "zlib"] + (["zstd"] if zstandard is not None else [])
+        for storage_format in formats:
+            cache = ParserCache(str(Path(temp_dir) / storage_format), compression=storage_format)
+            for file_path, text in markdown.items():
+                cache.cache_markdown(file_path, "bench", text)
+
+            def read_full():
+                for file_path in markdown:
+                    cache.get_cached_markdown(file_path, "bench")
+
+            def read_section():
+                for file_path in markdown:
+                    with cache.open_cached_markdown(file_path, "bench") as cached_markdown:
+                        cached_markdown.section(len(cached_markdown) // 2)
+
+            stored_size = cache.get_cache_info()["total_size"]
+            rows.append([
+                f"framed {storage_format}",
+                raw_size / stored_size,
+                median_ms(read_full, args.repeat),
+                median_ms(read_section, args.repeat),
+            ])
+
+    print(f"{len(markdown)} documents, {raw_size} bytes of markdown")
+    print_table(["format", "compression ratio", "full read ms", "one section ms"], rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
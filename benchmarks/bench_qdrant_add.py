@@ -0,0 +1,74 @@
+"""
+Benchmark QdrantStore.add against the previous per-node ingest path.
+
+The previous path embedded one node per call and wrote every node twice,
+once through the vector store and once through the index. The current path
+embeds in batches and writes each point once.
+
+Usage:
+    python benchmarks/bench_qdrant_add.py --url http://localhost:6333
+"""
+import argparse
+import sys
+import uuid
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from llama_index.core.node_parser import SentenceSplitter
+from llama_index.core.schema import BaseNode
+
+from benchmarks.common import load_policy_documents, print_table, timed
+from vector_stores.qdrant_store import QdrantStore
+
+
+def legacy_add(store: QdrantStore, nodes: List[BaseNode]) -> List[str]:
+    """Reproduce the previous QdrantStore.add behaviour."""
+    store._ensure_initialized()
+    for node in nodes:
+        if node.embedding is None:
+            node.embedding = store._embed_model.get_text_embedding(node.get_content())
+    node_ids = store._vector_store.add(nodes)
+    store._index.insert_nodes(nodes)
+    return node_ids
+
+
+def make_nodes(limit: int) -> List[BaseNode]:
+    """Chunk the policy documents into fresh nodes without embeddings."""
+    documents = load_policy_documents()
+    nodes = SentenceSplitter(chunk_size=512).get_nodes_from_documents(documents)
+    return nodes[:limit]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:6333")
+    parser.add_argument("--nodes", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--parallel", type=int, default=1)
+    args = parser.parse_args()
+
+    rows = []
+    for label, add in (("per-node (previous)", legacy_add), ("batched", QdrantStore.add)):
+        store = QdrantStore(
+            url=args.url,
+            collection_name=f"bench_add_{uuid.uuid4().hex[:8]}",
+            enable_hybrid=False,
+            batch_size=args.batch_size,
+            parallel=args.parallel,
+        )
+        store._ensure_initialized()
+        nodes = make_nodes(args.nodes)
+        try:
+            _, elapsed = timed(add, store, nodes)
+            rows.append([label, len(nodes), elapsed, len(nodes) / elapsed])
+        finally:
+            store._client.delete_collection(store.collection_name)
+
+    print_table(["path", "nodes", "seconds", "nodes/sec"], rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Benchmark Qdrant REST against gRPC for bulk upsert and search.
+
+Upserts synthetic embeddings into a scratch collection and runs single-vector
+searches with three clients: the default REST client (one pooled httpx client
+with httpx's connection limits), REST with the connection limits QdrantStore
+sets when pool_size is configured, and gRPC. Needs a local Qdrant with both
+ports exposed, e.g. the docker command in the README.
+
+Usage:
+    python benchmarks/bench_qdrant_transport.py --url http://localhost:6333 --points 20000
+"""
+import argparse
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+import qdrant_client
+from qdrant_client.http import models as rest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.common import print_table, timed
+from vector_stores.qdrant_store import get_client_options
+
+
+def make_clients(url: str, pool_size: int):
+    """Create the clients to compare, by label, with the options QdrantStore would use."""
+    return {
+        "rest": qdrant_client.QdrantClient(**get_client_options(url)),
+        f"rest pool_size={pool_size}": qdrant_client.QdrantClient(
+            **get_client_options(url, pool_size=pool_size)
+        ),
+        "grpc": qdrant_client.QdrantClient(**get_client_options(url, prefer_grpc=True)),
+    }
+
+
+def upsert_all(client: qdrant_client.QdrantClient, collection: str, vectors: np.ndarray, batch_size: int) -> None:
+    """Upsert the vectors in batches, waiting for each batch."""
+    for start in range(0, len(vectors), batch_size):
+        client.upsert(
+            collection_name=collection,
+            points=[
+                rest.PointStruct(id=str(uuid.uuid4()), vector=vector.tolist(), payload={"plan_name": "bench"})
+                for vector in vectors[start:start + batch_size]
+            ],
+            wait=True,
+        )
+
+
+def search_all(client: qdrant_client.QdrantClient, collection: str, queries: np.ndarray, top_k: int):
+    """Run every query and get the latencies in milliseconds."""
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        client.query_points(collection_name=collection, query=query.tolist(), limit=top_k)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:6333")
+    parser.add_argument("--points", type=int, default=20_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--pool-size", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((args.points, args.dim)).astype(np.float32)
+    queries = rng.standard_normal((args.queries, args.dim)).astype(np.float32)
+
+    rows = []
+    for label, client in make_clients(args.url, args.pool_size).items():
+        collection = f"bench_transport_{uuid.uuid4().hex[:8]}"
+        client.create_collection(
+            collection_name=collection,
+            vectors_config=rest.VectorParams(size=args.dim, distance=rest.Distance.COSINE),
+        )
+        try:
+            _, upsert_seconds = timed(upsert_all, client, collection, vectors, args.batch_size)
+            # Warm up the connection and the collection before timing searches
+            search_all(client, collection, queries[:10], args.top_k)
+            latencies = search_all(client, collection, queries, args.top_k)
+        finally:
+            client.delete_collection(collection_name=collection)
+            client.close()
+
+        rows.append([
+            label,
+            upsert_seconds,
+            args.points / upsert_seconds,
+            statistics.mean(latencies),
+            sorted(latencies)[int(len(latencies) * 0.95)],
+        ])
+
+    print(f"{args.points} points, {args.dim} dims, batches of {args.batch_size}, {args.queries} queries")
+    print_table(["transport", "upsert seconds", "points/sec", "search mean ms", "search p95 ms"], rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
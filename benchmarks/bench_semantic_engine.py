@@ -0,0 +1,78 @@
+"""
+Benchmark the vectorized semantic engine against SemanticSplitterNodeParser.
+
+Chunks the policy documents with both engines using the same embedding model
+and reports sentence throughput, and checks that both produce identical nodes.
+Sentence window embeddings are cached, and a warm-up pass fills the cache, so
+the timings compare the splitting work rather than the model; pass --cold to
+embed from scratch in every run.
+
+Usage:
+    python benchmarks/bench_semantic_engine.py
+"""
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from llama_index.core.node_parser import SemanticSplitterNodeParser
+from llama_index.embeddings.fastembed import FastEmbedEmbedding
+
+from benchmarks.common import load_policy_documents, print_table, timed
+from chunkers.semantic_engine import VectorizedSemanticSplitter
+from util.embedding_cache import CachedEmbedding, EmbeddingCache
+
+
+def node_signature(nodes):
+    """Reduce nodes to the fields that must match between engines."""
+    return [(node.text, node.start_char_idx, node.end_char_idx) for node in nodes]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents-dir", default="documents")
+    parser.add_argument("--embed-model", default="BAAI/bge-small-en-v1.5")
+    parser.add_argument("--buffer-size", type=int, default=1)
+    parser.add_argument("--threshold", type=float, default=0.75)
+    parser.add_argument("--cold", action="store_true", help="Embed without the cache")
+    args = parser.parse_args()
+
+    documents = load_policy_documents(args.documents_dir)
+    embed_model = FastEmbedEmbedding(model_name=args.embed_model)
+    cache_dir = tempfile.mkdtemp(prefix="bench_semantic_")
+
+    splitters = (
+        ("SemanticSplitterNodeParser", SemanticSplitterNodeParser),
+        ("VectorizedSemanticSplitter", VectorizedSemanticSplitter),
+    )
+
+    if not args.cold:
+        embed_model = CachedEmbedding(embed_model, EmbeddingCache(cache_dir))
+        splitters[0][1](
+            embed_model=embed_model,
+            buffer_size=args.buffer_size,
+            breakpoint_percentile_threshold=args.threshold,
+        ).get_nodes_from_documents(documents)
+
+    rows = []
+    outputs = []
+    for label, splitter_class in splitters:
+        splitter = splitter_class(
+            embed_model=embed_model,
+            buffer_size=args.buffer_size,
+            breakpoint_percentile_threshold=args.threshold,
+        )
+        sentence_count = sum(len(splitter.sentence_splitter(document.text)) for document in documents)
+        nodes, elapsed = timed(splitter.get_nodes_from_documents, documents)
+        outputs.append(node_signature(nodes))
+        rows.append([label, len(documents), sentence_count, len(nodes), elapsed, sentence_count / elapsed])
+
+    print_table(["engine", "documents", "sentences", "nodes", "seconds", "sentences/sec"], rows)
+    print(f"identical nodes: {outputs[0] == outputs[1]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
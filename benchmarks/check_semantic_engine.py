@@ -0,0 +1,128 @@
+"""
+Check that the vectorized semantic engine produces the nodes of SemanticSplitterNodeParser.
+
+Chunks synthetic documents with both engines using a deterministic fake
+embedding (a vector seeded by the hash of the text) and compares node IDs,
+text, offsets, metadata and relationships. Covers several documents at once,
+a single-sentence document, an empty document, and documents passed already
+split into sentences (sentences_per_document, as chunking workers do). Needs
+no documents or models.
+
+Usage:
+    python benchmarks/check_semantic_engine.py
+"""
+import argparse
+import hashlib
+import random
+import re
+import sys
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.node_parser import SemanticSplitterNodeParser
+from llama_index.core.schema import Document
+
+from benchmarks.common import print_table
+from chunkers.semantic_engine import VectorizedSemanticSplitter
+
+WORDS = ("copay", "deductible", "premium", "claim", "network", "hospital", "room", "rent",
+         "waiting", "period", "cover", "limit", "member", "policy", "renewal", "cashless")
+
+
+class HashEmbedding(BaseEmbedding):
+    """Fake embedding model: a random vector seeded by the hash of the text."""
+
+    def _embed(self, text: str) -> List[float]:
+        seed = int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+        return np.random.RandomState(seed).randn(32).tolist()
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._embed(text)
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self._embed(query)
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return self._embed(query)
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text after every period, keeping the whitespace so sentences join back to the text."""
+    return re.findall(r"[^.]+\.\s*|[^.]+$", text)
+
+
+def make_document(rng: random.Random, doc_id: str, sentence_count: int) -> Document:
+    """Build a document of random sentences."""
+    sentences = [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 12))).capitalize() + ". "
+        for _ in range(sentence_count)
+    ]
+    return Document(text="".join(sentences).strip(), id_=doc_id, metadata={"plan_name": doc_id})
+
+
+def node_signature(nodes):
+    """Reduce nodes to the fields that must match between engines."""
+    return [
+        (
+            node.node_id, node.text, node.start_char_idx, node.end_char_idx, node.metadata,
+            {str(key): getattr(related, "node_id", None) for key, related in node.relationships.items()},
+        )
+        for node in nodes
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--threshold", type=float, default=75)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    several = [make_document(rng, f"doc{index}", rng.randint(2, 60)) for index in range(8)]
+    single = Document(text="Room rent is covered up to the policy limit.", id_="single")
+    empty = Document(text="", id_="empty")
+    cases = (
+        ("several documents", several),
+        ("single sentence", [single]),
+        ("empty document", [empty]),
+        ("mixed", [several[0], single, empty, several[1]]),
+    )
+
+    embed_model = HashEmbedding()
+    # Deterministic IDs, so nodes of both engines can be compared by ID
+    id_func = lambda index, document: f"{document.doc_id}-{index}"
+
+    rows = []
+    for buffer_size in (1, 2):
+        options = dict(
+            embed_model=embed_model,
+            buffer_size=buffer_size,
+            breakpoint_percentile_threshold=args.threshold,
+            sentence_splitter=split_sentences,
+            id_func=id_func,
+        )
+        reference = SemanticSplitterNodeParser(**options)
+        vectorized = VectorizedSemanticSplitter(pool_embeddings=True, **options)
+
+        for label, documents in cases:
+            expected = node_signature(reference.get_nodes_from_documents(documents))
+            nodes = vectorized.get_nodes_from_documents(documents)
+            presplit = vectorized.get_nodes_from_documents(
+                documents, sentences_per_document=[split_sentences(document.text) for document in documents]
+            )
+            for mode, result in (("documents", nodes), ("sentences_per_document", presplit)):
+                ok = node_signature(result) == expected
+                rows.append([label, buffer_size, mode, len(expected), len(result), ok])
+                if not ok:
+                    print(f"--- {label}, buffer {buffer_size}, {mode}: nodes differ")
+
+    print_table(["case", "buffer", "input", "reference nodes", "vectorized nodes", "ok"], rows)
+    return 0 if all(row[-1] for row in rows) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+Check how the markdown of consecutive PDF page ranges is stitched together.
+
+Runs join_markdown_shards on synthetic shard pairs covering the boundary
+cases of sharded parsing: a table continued with a repeated header, two
+separate tables of the same width, and a section whose heading is repeated
+on the next page. Needs no documents or models.
+
+Usage:
+    python benchmarks/check_shard_stitching.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.common import print_table
+from parsers.pdf_pages import stitch_markdown_shards
+
+TABLE_HEAD = "| Service | Copay |\n|---|---|\n"
+
+CASES = [
+    (
+        "table continued, header repeated",
+        [
+            "## Schedule\n\n" + TABLE_HEAD + "| Dental | $20 |",
+            TABLE_HEAD + "| Vision | $10 |",
+        ],
+        "## Schedule\n\n" + TABLE_HEAD + "| Dental | $20 |\n| Vision | $10 |",
+    ),
+    (
+        "separate tables, same width",
+        [
+            "## Schedule\n\n" + TABLE_HEAD + "| Dental | $20 |",
+            "| Drug tier | Coinsurance |\n|---|---|\n| Generic | 10% |",
+        ],
+        "## Schedule\n\n" + TABLE_HEAD + "| Dental | $20 |\n\n"
+        "| Drug tier | Coinsurance |\n|---|---|\n| Generic | 10% |",
+    ),
+    (
+        "table after a caption",
+        [
+            TABLE_HEAD + "| Dental | $20 |",
+            "Table 2: Pharmacy\n\n" + TABLE_HEAD + "| Generic | $5 |",
+        ],
+        TABLE_HEAD + "| Dental | $20 |\n\nTable 2: Pharmacy\n\n" + TABLE_HEAD + "| Generic | $5 |",
+    ),
+    (
+        "heading repeated as continued",
+        [
+            "## Exclusions\n\nCosmetic surgery is not covered.",
+            "## Exclusions (continued)\n\nExperimental treatment is not covered.",
+        ],
+        "## Exclusions\n\nCosmetic surgery is not covered.\n\nExperimental treatment is not covered.",
+    ),
+    (
+        "heading repeated as is",
+        [
+            "# Plan\n\n## Exclusions\n\nCosmetic surgery is not covered.",
+            "## Exclusions\n\nExperimental treatment is not covered.",
+        ],
+        "# Plan\n\n## Exclusions\n\nCosmetic surgery is not covered.\n\nExperimental treatment is not covered.",
+    ),
+    (
+        "new section",
+        [
+            "## Exclusions\n\nCosmetic surgery is not covered.",
+            "## Claims\n\nFile within 90 days.",
+        ],
+        "## Exclusions\n\nCosmetic surgery is not covered.\n\n## Claims\n\nFile within 90 days.",
+    ),
+]
+
+
+def main() -> int:
+    rows = []
+    for label, shards, expected in CASES:
+        stitched = stitch_markdown_shards(shards)
+        rows.append([label, stitched == expected])
+        if stitched != expected:
+            print(f"--- {label}\nexpected:\n{expected}\ngot:\n{stitched}\n")
+
+    print_table(["case", "ok"], rows)
+    return 0 if all(ok for _, ok in rows) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
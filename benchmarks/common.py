@@ -0,0 +1,87 @@
+"""
+Shared helpers for benchmark scripts.
+"""
+import re
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from llama_index.core.schema import Document
+
+DOCUMENTS_DIR = "documents"
+
+
+def plan_name_from_path(file_path: str) -> str:
+    """
+    Derive a camelCase plan name from a document file name.
+
+    Args:
+        file_path: Path to the document
+
+    Returns:
+        Plan name, e.g. "starHealthGainInsurancePolicy"
+    """
+    words = re.findall(r"[A-Za-z0-9]+", Path(file_path).stem)
+    if not words:
+        return Path(file_path).stem
+    return words[0].lower() + "".join(word[:1].upper() + word[1:].lower() for word in words[1:])
+
+
+def get_policy_paths(documents_dir: str = DOCUMENTS_DIR) -> List[Dict[str, str]]:
+    """
+    List the policy PDFs used by the benchmarks.
+
+    Args:
+        documents_dir: Directory containing policy PDFs
+
+    Returns:
+        List of {"path", "name"} dicts accepted by the parsers
+    """
+    return [
+        {"path": str(path), "name": plan_name_from_path(str(path))}
+        for path in sorted(Path(documents_dir).glob("*.pdf"))
+    ]
+
+
+def load_policy_documents(documents_dir: str = DOCUMENTS_DIR) -> List[Document]:
+    """
+    Parse the policy PDFs, reusing the parser cache when available.
+
+    Args:
+        documents_dir: Directory containing policy PDFs
+
+    Returns:
+        List of parsed documents
+    """
+    from parsers.docling_parser import DoclingParser
+
+    parser = DoclingParser(enable_ocr=False, table_structure=False)
+    documents = []
+    for file_path in get_policy_paths(documents_dir):
+        documents.extend(parser.parse(file_path))
+    return documents
+
+
+def timed(func: Callable[..., Any], *args, **kwargs) -> Tuple[Any, float]:
+    """
+    Run a function and measure its wall-clock time.
+
+    Returns:
+        Tuple of (result, elapsed seconds)
+    """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def print_table(headers: List[str], rows: List[List[Any]]) -> None:
+    """Print rows as an aligned plain-text table."""
+    cells = [[str(header) for header in headers]] + [
+        [f"{value:.3f}" if isinstance(value, float) else str(value) for value in row]
+        for row in rows
+    ]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(headers))]
+    for index, row in enumerate(cells):
+        print("  ".join(value.ljust(width) for value, width in zip(row, widths)))
+        if index == 0:
+            print("  ".join("-" * width for width in widths))
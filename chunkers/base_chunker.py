@@ -1,17 +1,202 @@
 """
 Base chunker implementation.
 """
-from typing import List, Dict, Any
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from core.interfaces.chunker_interface import ChunkerInterface
 from llama_index.core.schema import Document, BaseNode
+from util.chunk_ids import assign_stable_ids
+from util.chunk_batch import ChunkBatch
+
+# Chunker of the current chunking worker process, set by the pool initializer
+_worker_chunker: Optional["BaseChunker"] = None
+
+
+def _init_chunk_worker(chunker: "BaseChunker") -> None:
+    """Keep the chunker a chunking worker was started with."""
+    global _worker_chunker
+    # IDs are assigned once over the merged shards, shards alone would repeat them
+    chunker.config = {**chunker.config, "stable_ids": False}
+    _worker_chunker = chunker
+
+
+def _chunk_shard(documents: List[Document], kwargs: Dict[str, Any]) -> List[BaseNode]:
+    """Chunk one shard of documents inside a chunking worker."""
+    return _worker_chunker.chunk(documents, **kwargs)
+
+
+def shard_documents(documents: List[Document], shard_count: int) -> List[List[Document]]:
+    """
+    Split documents into contiguous shards of roughly equal text size.
+    
+    Args:
+        documents: Documents in order
+        shard_count: Maximum number of shards
+    
+    Returns:
+        Non-empty shards that concatenate back to the documents in order
+    """
+    total = sum(len(document.text) for document in documents)
+    target = total / max(shard_count, 1)
+    shards: List[List[Document]] = []
+    current: List[Document] = []
+    size = 0
+    for document in documents:
+        current.append(document)
+        size += len(document.text)
+        if size >= target * (len(shards) + 1) and len(shards) < shard_count - 1:
+            shards.append(current)
+            current = []
+    if current:
+        shards.append(current)
+    return shards
 
 
 class BaseChunker(ChunkerInterface):
     """Base chunker implementation with common functionality."""
     
+    # Lazily built objects (models, parsers) that are not sent to chunking workers
+    _LAZY_ATTRIBUTES: Tuple[str, ...] = ()
+    
     def __init__(self, **kwargs):
-        """Initialize base chunker."""
+        """
+        Initialize base chunker.
+        
+        Args:
+            **kwargs: Chunker configuration; set stable_ids to False to keep the
+                random node IDs of the underlying parser
+        """
         self.config = kwargs
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_workers = 0
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle the configuration only; workers rebuild models and parsers on first use."""
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        state["_pool_workers"] = 0
+        for name in self._LAZY_ATTRIBUTES:
+            state[name] = None
+        return state
+    
+    def _assign_ids(self, nodes: List[BaseNode],
+                    stream_state: Optional[Dict[str, Any]] = None) -> List[BaseNode]:
+        """
+        Give chunked nodes deterministic IDs derived from plan name, section path and content.
+        
+        Args:
+            nodes: Chunked nodes, modified in place
+            stream_state: State shared by the documents of one chunk_iter source
+        
+        Returns:
+            The same nodes
+        """
+        if self.config.get("stable_ids", True):
+            occurrences = stream_state.setdefault("occurrences", {}) if stream_state is not None else None
+            assign_stable_ids(nodes, occurrences=occurrences)
+        return nodes
+    
+    def chunk_iter(self, documents: Iterable[Document], **kwargs) -> Iterator[BaseNode]:
+        """
+        Chunk a stream of documents one at a time.
+        
+        Consecutive documents of the same plan (e.g. the windows of one parse_iter
+        stream) share a stream state, so chunk IDs stay unique across them.
+        
+        Args:
+            documents: Iterable of documents to chunk
+            **kwargs: Additional chunking options
+            
+        Yields:
+            Chunked nodes
+        """
+        source = None
+        stream_state: Dict[str, Any] = {}
+        for document in documents:
+            plan_name = document.metadata.get("plan_name")
+            if plan_name != source:
+                source = plan_name
+                stream_state = {}
+            yield from self.chunk([document], stream_state=stream_state, **kwargs)
+    
+    def _get_pool(self, max_workers: int) -> ProcessPoolExecutor:
+        """Get or create the chunking worker pool, kept warm between calls."""
+        if self._pool is not None and self._pool_workers != max_workers:
+            self.close()
+        if self._pool is None:
+            # Spawned workers do not inherit loaded models or open connections
+            self._pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_chunk_worker,
+                initargs=(self,),
+            )
+            self._pool_workers = max_workers
+        return self._pool
+    
+    def _use_parallel(self, documents: List[Document], max_workers: int) -> bool:
+        """Check if documents are worth sharding across worker processes."""
+        # Workers of another pool (e.g. ingestion workers) chunk in process
+        return max_workers > 1 and len(documents) > 1 and multiprocessing.parent_process() is None
+    
+    def chunk_parallel(self, documents: List[Document], max_workers: Optional[int] = None,
+                       **kwargs) -> List[BaseNode]:
+        """
+        Chunk documents across a pool of worker processes.
+        
+        Documents are split into contiguous shards of similar size, chunked in
+        parallel and merged back in input order. Workers keep random node IDs and
+        stable IDs are assigned once over the merged nodes, so the result matches
+        chunk() whatever the worker count.
+        The pool is spawned on first use and reused until close().
+        
+        Args:
+            documents: List of documents to chunk
+            max_workers: Number of worker processes, defaults to CPU count
+            **kwargs: Additional chunking options
+            
+        Returns:
+            List of chunked nodes
+        """
+        documents = list(documents)
+        max_workers = max_workers or os.cpu_count() or 1
+        if not self._use_parallel(documents, max_workers):
+            return self.chunk(documents, **kwargs)
+        
+        # A few shards per worker evens out documents of different sizes
+        shards = shard_documents(documents, max_workers * 2)
+        try:
+            pool = self._get_pool(max_workers)
+            results = list(pool.map(_chunk_shard, shards, [kwargs] * len(shards)))
+        except Exception as e:
+            raise RuntimeError(f"Failed to chunk documents in parallel: {str(e)}")
+        
+        return self._assign_ids([node for nodes in results for node in nodes])
+    
+    def chunk_batch(self, documents: List[Document], **kwargs) -> ChunkBatch:
+        """
+        Chunk documents into a compact chunk batch.
+        
+        A batch pickles to a fraction of the size of its nodes, so workers hand
+        batches rather than nodes back to the ingestion process.
+        
+        Args:
+            documents: List of documents to chunk
+            **kwargs: Additional chunking options
+            
+        Returns:
+            Chunk batch of the chunked nodes
+        """
+        return ChunkBatch.from_nodes(self.chunk(documents, **kwargs))
+    
+    def close(self) -> None:
+        """Shut down the chunking worker pool."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+            self._pool_workers = 0
     
     def get_chunking_config(self) -> Dict[str, Any]:
         """Get current chunking configuration."""
@@ -10,6 +10,8 @@ from chunkers.base_chunker import BaseChunker
 class HierarchicalChunker(BaseChunker):
     """Hierarchical chunker creating multi-level document hierarchy."""
     
+    _LAZY_ATTRIBUTES = ("_parser",)
+    
     def __init__(self, chunk_sizes: List[int] = [1536, 512, 128], **kwargs):
         """
         Initialize hierarchical chunker.
@@ -54,7 +56,7 @@ class HierarchicalChunker(BaseChunker):
                     "chunker": "hierarchical",
                 })
             
-            return nodes
+            return self._assign_ids(nodes, kwargs.get("stream_state"))
             
         except Exception as e:
             raise RuntimeError(f"Failed to chunk documents with hierarchical chunker: {str(e)}")
@@ -0,0 +1,293 @@
+"""
+Layout chunker implementation.
+"""
+import re
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from llama_index.core.schema import Document, BaseNode, TextNode, NodeRelationship
+from llama_index.core.node_parser import SentenceSplitter
+from llama_index.core.utils import get_tokenizer
+from chunkers.base_chunker import BaseChunker
+
+_HEADING_PATTERN = re.compile(r"(#{1,6})\s+(.*?)\s*#*\s*$")
+
+
+class LayoutChunker(BaseChunker):
+    """Structure-aware chunker splitting Docling markdown on section and table boundaries."""
+    
+    _LAZY_ATTRIBUTES = ("_splitter", "_tokenizer")
+    
+    def __init__(self, max_chunk_tokens: int = 512, chunk_overlap: int = 32,
+                 merge_small_sections: bool = True, repeat_table_header: bool = True, **kwargs):
+        """
+        Initialize layout chunker.
+        
+        Args:
+            max_chunk_tokens: Maximum chunk size; larger sections are split with a
+                sentence splitter and larger tables by rows
+            chunk_overlap: Token overlap when splitting oversized sections
+            merge_small_sections: Merge consecutive small sections into one chunk while
+                it stays under the maximum size
+            repeat_table_header: Repeat the table header in every piece of a split table
+            **kwargs: Additional configuration
+        """
+        super().__init__(**kwargs)
+        self.max_chunk_tokens = max_chunk_tokens
+        self.chunk_overlap = chunk_overlap
+        self.merge_small_sections = merge_small_sections
+        self.repeat_table_header = repeat_table_header
+        self._splitter = None
+        self._tokenizer = None
+    
+    def _get_splitter(self) -> SentenceSplitter:
+        """Get or create the splitter used for oversized sections."""
+        if self._splitter is None:
+            self._splitter = SentenceSplitter(
+                chunk_size=self.max_chunk_tokens,
+                chunk_overlap=self.chunk_overlap,
+            )
+        return self._splitter
+    
+    def _count_tokens(self, text: str) -> int:
+        """Count the tokens of a text."""
+        if self._tokenizer is None:
+            self._tokenizer = get_tokenizer()
+        return len(self._tokenizer(text))
+    
+    def _fits(self, text: str) -> bool:
+        """Check if text fits in a chunk, only tokenizing text that might not."""
+        # A token spans at least one character, so short text always fits
+        return len(text) <= self.max_chunk_tokens or self._count_tokens(text) <= self.max_chunk_tokens
+    
+    def _iter_blocks(self, text: str, headings: Optional[List[Tuple[int, str]]] = None
+                     ) -> Iterator[Tuple[str, int, int, List[str]]]:
+        """
+        Split markdown into section and table blocks in one pass over its lines.
+        
+        A heading starts a new section block. A run of table rows is a block of its
+        own, and text after a table starts a new block of the same section.
+        Headings directly followed by another heading or a table stay attached to
+        the block that follows them.
+        
+        Args:
+            text: Markdown text
+            headings: Open (level, title) headings the text continues under,
+                updated in place; None to start at the top of a document
+        
+        Yields:
+            Tuples of (block type, start offset, end offset, heading path)
+        """
+        if headings is None:
+            headings = []
+        block_kind = "text"
+        block_start = 0
+        block_path: List[str] = [title for _, title in headings]
+        has_body = False
+        in_code = False
+        offset = 0
+        
+        for line in text.splitlines(keepends=True):
+            stripped = line.strip()
+            line_kind = "text"
+            
+            if stripped.startswith("```"):
+                in_code = not in_code
+            elif not in_code:
+                heading = _HEADING_PATTERN.fullmatch(stripped)
+                if heading is not None:
+                    if has_body:
+                        yield block_kind, block_start, offset, block_path
+                        block_kind, block_start, has_body = "text", offset, False
+                    elif block_kind == "table":
+                        block_kind = "text"
+                    
+                    level = len(heading.group(1))
+                    while headings and headings[-1][0] >= level:
+                        headings.pop()
+                    headings.append((level, heading.group(2)))
+                    block_path = [title for _, title in headings]
+                    offset += len(line)
+                    continue
+                
+                if stripped.startswith("|"):
+                    line_kind = "table"
+            
+            if stripped and line_kind != block_kind:
+                if has_body:
+                    yield block_kind, block_start, offset, block_path
+                    block_start = offset
+                block_kind = line_kind
+                has_body = False
+            
+            has_body = has_body or bool(stripped)
+            offset += len(line)
+        
+        if has_body:
+            yield block_kind, block_start, offset, block_path
+    
+    def _split_table(self, text: str, start: int) -> List[Tuple[str, int, int]]:
+        """Split an oversized table into runs of rows, optionally repeating its header."""
+        lines = text.splitlines(keepends=True)
+        # Headings attached to the table stay in the first piece only
+        first_row = next(index for index, line in enumerate(lines) if line.lstrip().startswith("|"))
+        header: List[str] = []
+        if (first_row + 2 < len(lines) and "-" in lines[first_row + 1]
+                and set(lines[first_row + 1].strip()) <= set("|-: ")):
+            header = lines[first_row:first_row + 2]
+        header_tokens = self._count_tokens("".join(header)) if header else 0
+        
+        pieces: List[Tuple[str, int, int]] = []
+        rows = lines[:first_row] + header
+        rows_tokens = self._count_tokens("".join(rows)) if rows else 0
+        rows_start = start
+        offset = start + len("".join(rows))
+        has_rows = False
+        for line in lines[len(rows):]:
+            line_tokens = self._count_tokens(line)
+            if has_rows and rows_tokens + line_tokens > self.max_chunk_tokens:
+                pieces.append(("".join(rows), rows_start, offset))
+                rows = list(header) if self.repeat_table_header else []
+                rows_tokens = header_tokens if self.repeat_table_header else 0
+                rows_start = offset
+                has_rows = False
+            rows.append(line)
+            rows_tokens += line_tokens
+            offset += len(line)
+            has_rows = True
+        
+        pieces.append(("".join(rows), rows_start, offset))
+        return pieces
+    
+    def _split_text(self, text: str, start: int) -> List[Tuple[str, int, int]]:
+        """Split an oversized section with the sentence splitter."""
+        pieces: List[Tuple[str, int, int]] = []
+        cursor = 0
+        for split in self._get_splitter().split_text(text):
+            position = text.find(split, cursor)
+            if position < 0:
+                position = cursor
+            else:
+                cursor = position + 1
+            pieces.append((split, start + position, start + position + len(split)))
+        return pieces
+    
+    def _can_merge(self, text: str, pending: List[Any], end: int, path: List[str]) -> bool:
+        """Check if a section can join the pending chunk: same parent section, and small enough."""
+        pending_path = pending[2]
+        common = 0
+        while common < min(len(pending_path), len(path)) and pending_path[common] == path[common]:
+            common += 1
+        if common < min(len(pending_path), len(path)) - 1:
+            return False
+        return self._fits(text[pending[0]:end].strip())
+    
+    def _build_chunks(self, text: str, headings: Optional[List[Tuple[int, str]]] = None
+                      ) -> List[Tuple[str, int, int, str, List[str]]]:
+        """Turn a document's markdown into (text, start, end, block type, heading path) chunks."""
+        # (start, end, block type, heading path, text if not a contiguous span of the document)
+        spans: List[Tuple[int, int, str, List[str], Optional[str]]] = []
+        pending: Optional[List[Any]] = None
+        
+        for kind, start, end, path in self._iter_blocks(text, headings):
+            if kind == "text" and pending is not None and self._can_merge(text, pending, end, path):
+                pending[1] = end
+                pending[2] = [title for title, other in zip(pending[2], path) if title == other]
+                continue
+            
+            if pending is not None:
+                spans.append((pending[0], pending[1], "text", pending[2], None))
+                pending = None
+            
+            block = text[start:end]
+            if self._fits(block):
+                if kind == "text" and self.merge_small_sections:
+                    pending = [start, end, list(path)]
+                else:
+                    spans.append((start, end, kind, list(path), None))
+                continue
+            
+            pieces = self._split_table(block, start) if kind == "table" else self._split_text(block, start)
+            for piece, piece_start, piece_end in pieces:
+                # Pieces with a repeated table header are not a contiguous span of the document
+                contiguous = text[piece_start:piece_end] == piece
+                spans.append((piece_start, piece_end, kind, list(path), None if contiguous else piece))
+        
+        if pending is not None:
+            spans.append((pending[0], pending[1], "text", pending[2], None))
+        
+        chunks: List[Tuple[str, int, int, str, List[str]]] = []
+        for start, end, kind, path, piece in spans:
+            chunk_text = text[start:end] if piece is None else piece
+            stripped = chunk_text.strip()
+            if not stripped:
+                continue
+            if piece is None:
+                start += len(chunk_text) - len(chunk_text.lstrip())
+                end = start + len(stripped)
+            chunks.append((stripped, start, end, kind, path))
+        return chunks
+    
+    def chunk(self, documents: List[Document], **kwargs) -> List[BaseNode]:
+        """
+        Chunk documents on markdown section and table boundaries.
+        
+        Within a chunk_iter stream, the heading path goes on from one document to
+        the next, so sections of a document streamed in parts keep their path.
+        
+        Args:
+            documents: List of documents to chunk
+            **kwargs: Additional chunking options
+        
+        Returns:
+            List of chunked nodes
+        """
+        stream_state = kwargs.get("stream_state")
+        headings = stream_state.setdefault("headings", []) if stream_state is not None else None
+        
+        try:
+            all_nodes: List[BaseNode] = []
+            for document in documents:
+                nodes = []
+                for chunk_text, start, end, kind, path in self._build_chunks(document.text, headings):
+                    node = TextNode(
+                        text=chunk_text,
+                        start_char_idx=start,
+                        end_char_idx=end,
+                        metadata={
+                            **document.metadata,
+                            "chunker": "layout",
+                            "block_type": kind,
+                            "section_path": " > ".join(path),
+                        },
+                        excluded_embed_metadata_keys=list(document.excluded_embed_metadata_keys),
+                        excluded_llm_metadata_keys=list(document.excluded_llm_metadata_keys),
+                    )
+                    node.relationships[NodeRelationship.SOURCE] = document.as_related_node_info()
+                    if nodes:
+                        node.relationships[NodeRelationship.PREVIOUS] = nodes[-1].as_related_node_info()
+                        nodes[-1].relationships[NodeRelationship.NEXT] = node.as_related_node_info()
+                    nodes.append(node)
+                all_nodes.extend(nodes)
+            
+            return self._assign_ids(all_nodes, stream_state)
+        
+        except Exception as e:
+            raise RuntimeError(f"Failed to chunk documents with layout chunker: {str(e)}")
+    
+    def get_chunking_strategy(self) -> str:
+        """Get chunking strategy name."""
+        return "layout"
+    
+    def update_config(self, config: Dict[str, Any]) -> None:
+        """Update chunking configuration."""
+        super().update_config(config)
+        
+        if "max_chunk_tokens" in config:
+            self.max_chunk_tokens = config["max_chunk_tokens"]
+            self._splitter = None
+        if "chunk_overlap" in config:
+            self.chunk_overlap = config["chunk_overlap"]
+            self._splitter = None
+        if "merge_small_sections" in config:
+            self.merge_small_sections = config["merge_small_sections"]
+        if "repeat_table_header" in config:
+            self.repeat_table_header = config["repeat_table_header"]
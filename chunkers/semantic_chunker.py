@@ -1,19 +1,27 @@
 """
 Semantic chunker implementation.
 """
-from typing import List, Dict, Any
+import os
+from typing import List, Dict, Any, Optional
 from llama_index.core.schema import Document, BaseNode
 from llama_index.core.node_parser import SemanticSplitterNodeParser
 from llama_index.embeddings.fastembed import FastEmbedEmbedding
 from llama_index.core import Settings
-from chunkers.base_chunker import BaseChunker
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from chunkers.base_chunker import BaseChunker, shard_documents
+from chunkers.semantic_engine import VectorizedSemanticSplitter, split_sentences
+from util.embedding_cache import EmbeddingCache, CachedEmbedding
 
 
 class SemanticChunker(BaseChunker):
     """Semantic chunker using semantic similarity for intelligent splitting."""
     
+    _LAZY_ATTRIBUTES = ("_embed_model", "_splitter")
+    
     def __init__(self, buffer_size: int = 1, threshold: float = 0.75, 
-                 embed_model_name: str = "BAAI/bge-small-en-v1.5", **kwargs):
+                 embed_model_name: str = "BAAI/bge-small-en-v1.5",
+                 enable_embedding_cache: bool = True, embedding_cache_dir: str = "cache/embeddings",
+                 embedding_cache_max_entries: int = 500_000, pool_embeddings: bool = True, engine: str = "numpy", **kwargs):
         """
         Initialize semantic chunker.
         
@@ -21,19 +29,39 @@ class SemanticChunker(BaseChunker):
             buffer_size: Buffer size for semantic splitting
             threshold: Threshold for semantic similarity
             embed_model_name: Name of the embedding model
+            enable_embedding_cache: Cache sentence embeddings on disk
+            embedding_cache_dir: Directory to store the embedding cache
+            embedding_cache_max_entries: Maximum number of cached embeddings per model
+            pool_embeddings: Give each node the mean of its sentence embeddings, so the
+                vector store does not embed it again (numpy engine only)
+            engine: Breakpoint engine, "numpy" for the vectorized engine or "llama_index"
+                for SemanticSplitterNodeParser; both produce the same nodes
             **kwargs: Additional configuration
         """
         super().__init__(**kwargs)
+        if engine not in ("numpy", "llama_index"):
+            raise ValueError(f"Unknown semantic engine: {engine}")
+        
         self.buffer_size = buffer_size
         self.threshold = threshold
         self.embed_model_name = embed_model_name
+        self.enable_embedding_cache = enable_embedding_cache
+        self.embedding_cache_dir = embedding_cache_dir
+        self.embedding_cache_max_entries = embedding_cache_max_entries
+        self.pool_embeddings = pool_embeddings
+        self.engine = engine
         self._embed_model = None
         self._splitter = None
     
-    def _get_embed_model(self) -> FastEmbedEmbedding:
+    def _get_embed_model(self) -> BaseEmbedding:
         """Get or create embedding model."""
         if self._embed_model is None:
             self._embed_model = FastEmbedEmbedding(model_name=self.embed_model_name)
+            if self.enable_embedding_cache:
+                self._embed_model = CachedEmbedding(
+                    self._embed_model,
+                    EmbeddingCache(self.embedding_cache_dir, self.embedding_cache_max_entries),
+                )
             Settings.embed_model = self._embed_model
         return self._embed_model
     
@@ -41,11 +69,19 @@ class SemanticChunker(BaseChunker):
         """Get or create semantic splitter."""
         if self._splitter is None:
             embed_model = self._get_embed_model()
-            self._splitter = SemanticSplitterNodeParser(
-                buffer_size=self.buffer_size,
-                breakpoint_percentile_threshold=self.threshold,
-                embed_model=embed_model,
-            )
+            if self.engine == "numpy":
+                self._splitter = VectorizedSemanticSplitter(
+                    buffer_size=self.buffer_size,
+                    breakpoint_percentile_threshold=self.threshold,
+                    embed_model=embed_model,
+                    pool_embeddings=self.pool_embeddings,
+                )
+            else:
+                self._splitter = SemanticSplitterNodeParser(
+                    buffer_size=self.buffer_size,
+                    breakpoint_percentile_threshold=self.threshold,
+                    embed_model=embed_model,
+                )
         return self._splitter
     
     def chunk(self, documents: List[Document], **kwargs) -> List[BaseNode]:
@@ -64,22 +100,70 @@ class SemanticChunker(BaseChunker):
         try:
             nodes = splitter.get_nodes_from_documents(documents)
             
-            # Add chunking metadata to each node
-            for node in nodes:
-                if not hasattr(node, 'metadata'):
-                    node.metadata = {}
-                node.metadata.update({
-                    "chunker": "semantic",
-                    "buffer_size": self.buffer_size,
-                    "threshold": self.threshold,
-                    "embed_model": self.embed_model_name
-                })
-            
-            return nodes
+            return self._finalize_nodes(nodes, kwargs.get("stream_state"))
             
         except Exception as e:
             raise RuntimeError(f"Failed to chunk documents with semantic chunker: {str(e)}")
     
+    def chunk_parallel(self, documents: List[Document], max_workers: Optional[int] = None,
+                       **kwargs) -> List[BaseNode]:
+        """
+        Chunk documents across worker processes, embedding in this process only.
+        
+        Workers only split documents into sentences and never load an embedding
+        model. The sentence windows of all documents are embedded here in one
+        batch, which the model already spreads over every core, and breakpoints
+        are found here. The llama_index engine has no separate sentence stage and
+        chunks in process.
+        
+        Args:
+            documents: List of documents to chunk
+            max_workers: Number of worker processes, defaults to CPU count
+            **kwargs: Additional chunking options
+            
+        Returns:
+            List of chunked nodes
+        """
+        documents = list(documents)
+        max_workers = max_workers or os.cpu_count() or 1
+        if self.engine != "numpy" or not self._use_parallel(documents, max_workers):
+            return self.chunk(documents, **kwargs)
+        
+        splitter = self._get_splitter()
+        shards = [
+            [document.text for document in shard]
+            for shard in shard_documents(documents, max_workers * 2)
+        ]
+        
+        try:
+            pool = self._get_pool(max_workers)
+            sentences_per_document = [
+                sentences for shard in pool.map(split_sentences, shards) for sentences in shard
+            ]
+            nodes = splitter.get_nodes_from_documents(
+                documents, sentences_per_document=sentences_per_document
+            )
+            
+            return self._finalize_nodes(nodes)
+            
+        except Exception as e:
+            raise RuntimeError(f"Failed to chunk documents in parallel with semantic chunker: {str(e)}")
+    
+    def _finalize_nodes(self, nodes: List[BaseNode],
+                        stream_state: Optional[Dict[str, Any]] = None) -> List[BaseNode]:
+        """Add chunking metadata and stable IDs to chunked nodes."""
+        for node in nodes:
+            if not hasattr(node, 'metadata'):
+                node.metadata = {}
+            node.metadata.update({
+                "chunker": "semantic",
+                "buffer_size": self.buffer_size,
+                "threshold": self.threshold,
+                "embed_model": self.embed_model_name
+            })
+        
+        return self._assign_ids(nodes, stream_state)
+    
     def get_chunking_strategy(self) -> str:
         """Get chunking strategy name."""
         return "semantic"
@@ -92,6 +176,12 @@ class SemanticChunker(BaseChunker):
             self.buffer_size = config["buffer_size"]
         if "threshold" in config:
             self.threshold = config["threshold"]
+        if "pool_embeddings" in config:
+            self.pool_embeddings = config["pool_embeddings"]
+            self._splitter = None
+        if "engine" in config:
+            self.engine = config["engine"]
+            self._splitter = None
         if "embed_model_name" in config:
             self.embed_model_name = config["embed_model_name"]
             # Reset embed model to use new name
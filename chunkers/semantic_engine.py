@@ -0,0 +1,221 @@
+"""
+Vectorized semantic breakpoint engine.
+"""
+from typing import List, Sequence, Tuple, Any, Callable, Optional
+import numpy as np
+from llama_index.core.bridge.pydantic import Field
+from llama_index.core.node_parser import SemanticSplitterNodeParser
+from llama_index.core.node_parser.node_utils import build_nodes_from_splits
+from llama_index.core.node_parser.text.utils import split_by_sentence_tokenizer
+from llama_index.core.schema import BaseNode, Document
+
+# Default sentence tokenizer, loaded once per process
+_sentence_splitter: Optional[Callable[[str], List[str]]] = None
+
+
+def split_sentences(texts: List[str]) -> List[List[str]]:
+    """
+    Split texts into sentences with the default sentence tokenizer.
+    
+    Used by chunking workers, which only need the tokenizer and not the
+    embedding model.
+    
+    Args:
+        texts: Document texts
+    
+    Returns:
+        Sentences of each text
+    """
+    global _sentence_splitter
+    if _sentence_splitter is None:
+        _sentence_splitter = split_by_sentence_tokenizer()
+    return [_sentence_splitter(text) for text in texts]
+
+
+def build_sentence_windows(sentences: List[str], buffer_size: int) -> List[str]:
+    """
+    Join each sentence with up to `buffer_size` neighbours on either side.
+    
+    Args:
+        sentences: Sentences of a document, in order
+        buffer_size: Number of neighbouring sentences on each side
+    
+    Returns:
+        One window of text per sentence
+    """
+    return [
+        "".join(sentences[max(i - buffer_size, 0):i + buffer_size + 1])
+        for i in range(len(sentences))
+    ]
+
+
+def adjacent_cosine_distances(embeddings: np.ndarray) -> np.ndarray:
+    """
+    Compute the cosine distance between every pair of consecutive embeddings.
+    
+    Args:
+        embeddings: Matrix with one embedding per row
+    
+    Returns:
+        Array of len(embeddings) - 1 distances
+    """
+    if len(embeddings) < 2:
+        return np.empty(0, dtype=np.float64)
+    
+    current, following = embeddings[:-1], embeddings[1:]
+    products = np.einsum("ij,ij->i", current, following)
+    norms = np.linalg.norm(current, axis=1) * np.linalg.norm(following, axis=1)
+    return 1 - products / norms
+
+
+def find_breakpoints(distances: np.ndarray, percentile: float) -> np.ndarray:
+    """
+    Find the positions whose distance exceeds the given percentile of all distances.
+    
+    Args:
+        distances: Consecutive sentence distances
+        percentile: Percentile of the distances a breakpoint must exceed
+    
+    Returns:
+        Indices i where a chunk ends after sentence i
+    """
+    if distances.size == 0:
+        return np.empty(0, dtype=np.int64)
+    return np.flatnonzero(distances > np.percentile(distances, percentile))
+
+
+def group_sentences(sentence_count: int, breakpoints: np.ndarray) -> List[Tuple[int, int]]:
+    """
+    Turn breakpoints into [start, end) sentence ranges covering the document.
+    
+    Args:
+        sentence_count: Number of sentences
+        breakpoints: Indices of the last sentence of each chunk but the final one
+    
+    Returns:
+        List of (start, end) sentence ranges
+    """
+    boundaries = (breakpoints + 1).tolist()
+    return list(zip([0] + boundaries, boundaries + [sentence_count]))
+
+
+class VectorizedSemanticSplitter(SemanticSplitterNodeParser):
+    """
+    Semantic splitter with a vectorized breakpoint search.
+    
+    Produces the same nodes as SemanticSplitterNodeParser. Sentence windows of
+    all documents are embedded in one batch call, consecutive cosine distances
+    are computed as one matrix operation, and percentile breakpoints are found
+    with array comparisons instead of a per-pair Python loop.
+    """
+    
+    pool_embeddings: bool = Field(
+        default=False,
+        description="Give each node the normalized mean of its sentence window embeddings.",
+    )
+    
+    @classmethod
+    def class_name(cls) -> str:
+        return "VectorizedSemanticSplitter"
+    
+    def _parse_nodes(self, nodes: Sequence[BaseNode], show_progress: bool = False,
+                     **kwargs: Any) -> List[BaseNode]:
+        """
+        Parse all documents at once, so their sentence windows share one embedding call.
+        
+        Documents already split into sentences (e.g. by chunking workers) are
+        passed as `sentences_per_document`.
+        """
+        sentences_per_document = kwargs.get("sentences_per_document")
+        if sentences_per_document is not None:
+            return self.build_nodes_from_sentences(nodes, sentences_per_document, show_progress)
+        return self.build_semantic_nodes_from_documents(nodes, show_progress)
+    
+    async def _aparse_nodes(self, nodes: Sequence[BaseNode], show_progress: bool = False,
+                            **kwargs: Any) -> List[BaseNode]:
+        """Asynchronously parse all documents at once."""
+        return await self.abuild_semantic_nodes_from_documents(nodes, show_progress)
+    
+    def _split_documents(self, documents: Sequence[Document]) -> Tuple[List[List[str]], List[str]]:
+        """Split documents into sentences and build every sentence window."""
+        sentences_per_document = [self.sentence_splitter(document.text) for document in documents]
+        windows = [
+            window
+            for sentences in sentences_per_document
+            for window in build_sentence_windows(sentences, self.buffer_size)
+        ]
+        return sentences_per_document, windows
+    
+    def build_nodes_from_sentences(self, documents: Sequence[Document],
+                                   sentences_per_document: List[List[str]],
+                                   show_progress: bool = False) -> List[BaseNode]:
+        """
+        Build nodes from documents already split into sentences.
+        
+        Args:
+            documents: Documents the sentences come from
+            sentences_per_document: Sentences of each document, in order
+            show_progress: Show embedding progress
+        
+        Returns:
+            List of nodes
+        """
+        windows = [
+            window
+            for sentences in sentences_per_document
+            for window in build_sentence_windows(sentences, self.buffer_size)
+        ]
+        window_embeddings = (
+            self.embed_model.get_text_embedding_batch(windows, show_progress=show_progress)
+            if windows else []
+        )
+        return self._build_nodes(documents, sentences_per_document, window_embeddings)
+    
+    def _build_nodes(self, documents: Sequence[Document], sentences_per_document: List[List[str]],
+                     window_embeddings: List[List[float]]) -> List[BaseNode]:
+        """Build the nodes of every document from its window embeddings."""
+        embeddings = np.asarray(window_embeddings, dtype=np.float64)
+        all_nodes: List[BaseNode] = []
+        offset = 0
+        
+        for document, sentences in zip(documents, sentences_per_document):
+            document_embeddings = embeddings[offset:offset + len(sentences)]
+            offset += len(sentences)
+            
+            distances = adjacent_cosine_distances(document_embeddings)
+            if distances.size:
+                breakpoints = find_breakpoints(distances, self.breakpoint_percentile_threshold)
+                groups = group_sentences(len(sentences), breakpoints)
+                chunks = ["".join(sentences[start:end]) for start, end in groups]
+            else:
+                # Documents with a single sentence (or none) become a single node
+                groups = [(0, len(sentences))]
+                chunks = [" ".join(sentences)]
+            
+            nodes = build_nodes_from_splits(chunks, document, id_func=self.id_func)
+            
+            if self.pool_embeddings and len(sentences) and len(nodes) == len(groups):
+                for node, (start, end) in zip(nodes, groups):
+                    pooled = document_embeddings[start:end].mean(axis=0)
+                    norm = np.linalg.norm(pooled)
+                    node.embedding = (pooled / norm if norm else pooled).tolist()
+            
+            all_nodes.extend(nodes)
+        
+        return all_nodes
+    
+    def build_semantic_nodes_from_documents(self, documents: Sequence[Document],
+                                            show_progress: bool = False) -> List[BaseNode]:
+        """Build nodes from documents."""
+        sentences_per_document = [self.sentence_splitter(document.text) for document in documents]
+        return self.build_nodes_from_sentences(documents, sentences_per_document, show_progress)
+    
+    async def abuild_semantic_nodes_from_documents(self, documents: Sequence[Document],
+                                                   show_progress: bool = False) -> List[BaseNode]:
+        """Asynchronously build nodes from documents."""
+        sentences_per_document, windows = self._split_documents(documents)
+        window_embeddings = (
+            await self.embed_model.aget_text_embedding_batch(windows, show_progress=show_progress)
+            if windows else []
+        )
+        return self._build_nodes(documents, sentences_per_document, window_embeddings)
@@ -9,7 +9,10 @@ from core.factories.agent_factory import AgentFactory
 from parsers.docling_parser import DoclingParser
 from chunkers.semantic_chunker import SemanticChunker
 from chunkers.hierarchical_chunker import HierarchicalChunker
+from chunkers.layout_chunker import LayoutChunker
 from vector_stores.qdrant_store import QdrantStore
+from vector_stores.numpy_store import NumpyStore
+from vector_stores.hnsw_store import HnswStore
 from agents.manager_agent import ManagerAgent
 from agents.assistant_agent import AssistantAgent
 
@@ -21,8 +24,11 @@ def register_all_components():
     
     ChunkerFactory.register_chunker("SemanticChunker", SemanticChunker)
     ChunkerFactory.register_chunker("HierarchicalChunker", HierarchicalChunker)
+    ChunkerFactory.register_chunker("LayoutChunker", LayoutChunker)
     
     VectorStoreFactory.register_vector_store("QdrantStore", QdrantStore)
+    VectorStoreFactory.register_vector_store("NumpyStore", NumpyStore)
+    VectorStoreFactory.register_vector_store("HnswStore", HnswStore)
     
     AgentFactory.register_agent("ManagerAgent", ManagerAgent)
     AgentFactory.register_agent("AssistantAgent", AssistantAgent)
@@ -2,8 +2,9 @@
 Chunker interface for document chunking strategies.
 """
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator
 from llama_index.core.schema import Document, BaseNode
+from util.chunk_batch import ChunkBatch
 
 
 class ChunkerInterface(ABC):
@@ -23,6 +24,50 @@ class ChunkerInterface(ABC):
         """
         pass
     
+    @abstractmethod
+    def chunk_iter(self, documents: Iterable[Document], **kwargs) -> Iterator[BaseNode]:
+        """
+        Chunk a stream of documents, yielding nodes as each document is chunked.
+        
+        Args:
+            documents: Iterable of documents to chunk
+            **kwargs: Additional chunking options
+            
+        Yields:
+            Chunked nodes
+        """
+        pass
+    
+    @abstractmethod
+    def chunk_parallel(self, documents: List[Document], max_workers: Optional[int] = None,
+                       **kwargs) -> List[BaseNode]:
+        """
+        Chunk documents across worker processes, keeping the order of chunk().
+        
+        Args:
+            documents: List of documents to chunk
+            max_workers: Number of worker processes, defaults to CPU count
+            **kwargs: Additional chunking options
+            
+        Returns:
+            List of chunked nodes
+        """
+        pass
+    
+    @abstractmethod
+    def chunk_batch(self, documents: List[Document], **kwargs) -> ChunkBatch:
+        """
+        Chunk documents into a compact chunk batch.
+        
+        Args:
+            documents: List of documents to chunk
+            **kwargs: Additional chunking options
+            
+        Returns:
+            Chunk batch of the chunked nodes
+        """
+        pass
+    
     @abstractmethod
     def get_chunking_strategy(self) -> str:
         """
@@ -2,7 +2,7 @@
 Parser interface for document processing.
 """
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator
 from llama_index.core.schema import Document
 
 
@@ -23,6 +23,20 @@ class ParserInterface(ABC):
         """
         pass
     
+    @abstractmethod
+    def parse_iter(self, file_path: {str, str}, **kwargs) -> Iterator[Document]:
+        """
+        Parse a document lazily, yielding Document objects as they are produced.
+        
+        Args:
+            file_path: Path to the document to parse
+            **kwargs: Additional parsing options
+            
+        Yields:
+            Document objects
+        """
+        pass
+    
     @abstractmethod
     def get_supported_formats(self) -> List[str]:
         """
@@ -2,20 +2,21 @@
 Vector store interface for document storage and retrieval.
 """
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Union
 from llama_index.core.schema import BaseNode, NodeWithScore
+from util.chunk_batch import ChunkBatch
 
 
 class VectorStoreInterface(ABC):
     """Abstract base class for vector stores."""
     
     @abstractmethod
-    def add(self, nodes: List[BaseNode], **kwargs) -> List[str]:
+    def add(self, nodes: Union[List[BaseNode], ChunkBatch], **kwargs) -> List[str]:
         """
         Add nodes to the vector store.
         
         Args:
-            nodes: List of nodes to add
+            nodes: List of nodes or a chunk batch to add
             **kwargs: Additional storage options
             
         Returns:
@@ -23,6 +24,53 @@ class VectorStoreInterface(ABC):
         """
         pass
     
+    @abstractmethod
+    def add_stream(self, nodes: Iterable[BaseNode], batch_size: Optional[int] = None, **kwargs) -> List[str]:
+        """
+        Add a stream of nodes to the vector store in fixed-size batches.
+        
+        Args:
+            nodes: Iterable of nodes to add
+            batch_size: Number of nodes embedded and written per batch
+            **kwargs: Additional storage options
+            
+        Returns:
+            List of node IDs that were added
+        """
+        pass
+    
+    @abstractmethod
+    def sync(self, nodes: Union[List[BaseNode], ChunkBatch], source: str, **kwargs) -> Dict[str, Any]:
+        """
+        Replace the stored nodes of one source, writing only what changed.
+        
+        Args:
+            nodes: Every node chunked from the source, as nodes or a chunk batch
+            source: Source (plan) name
+            **kwargs: Additional storage options
+        
+        Returns:
+            Dictionary with the "upserted" and "deleted" node IDs and the "unchanged" count
+        """
+        pass
+    
+    @abstractmethod
+    def sync_stream(self, nodes: Iterable[BaseNode], source: str, batch_size: Optional[int] = None,
+                    **kwargs) -> Dict[str, Any]:
+        """
+        Replace the stored nodes of one source from a stream of nodes.
+        
+        Args:
+            nodes: Iterable of every node chunked from the source
+            source: Source (plan) name
+            batch_size: Number of nodes embedded and written per batch
+            **kwargs: Additional storage options
+        
+        Returns:
+            Dictionary with the "upserted" and "deleted" node IDs and the "unchanged" count
+        """
+        pass
+    
     @abstractmethod
     def search(self, query: str, top_k: int = 5, **kwargs) -> List[NodeWithScore]:
         """
@@ -38,6 +86,23 @@ class VectorStoreInterface(ABC):
         """
         pass
     
+    @abstractmethod
+    def search_batch(self, queries: List[str], filters: Optional[List[Optional[str]]] = None,
+                     top_k: int = 5, **kwargs) -> List[List[NodeWithScore]]:
+        """
+        Search for similar nodes for several queries at once.
+        
+        Args:
+            queries: Search queries
+            filters: Plan name each query is restricted to, None for all plans
+            top_k: Number of results to return per query
+            **kwargs: Additional search options
+            
+        Returns:
+            List of nodes with similarity scores for each query, in query order
+        """
+        pass
+    
     @abstractmethod
     def delete(self, node_ids: List[str]) -> bool:
         """
@@ -80,3 +145,49 @@ class VectorStoreInterface(ABC):
             True if clearing was successful
         """
         pass
+
+
+class AsyncVectorStoreInterface(ABC):
+    """Abstract base class for vector stores with non-blocking operations."""
+    
+    @abstractmethod
+    async def aadd(self, nodes: Union[List[BaseNode], ChunkBatch], **kwargs) -> List[str]:
+        """
+        Add nodes to the vector store without blocking the event loop.
+        
+        Args:
+            nodes: List of nodes or a chunk batch to add
+            **kwargs: Additional storage options
+            
+        Returns:
+            List of node IDs that were added
+        """
+        pass
+    
+    @abstractmethod
+    async def asearch(self, query: str, top_k: int = 5, **kwargs) -> List[NodeWithScore]:
+        """
+        Search for similar nodes without blocking the event loop.
+        
+        Args:
+            query: Search query
+            top_k: Number of results to return
+            **kwargs: Additional search options
+            
+        Returns:
+            List of nodes with similarity scores
+        """
+        pass
+    
+    @abstractmethod
+    async def adelete(self, node_ids: List[str]) -> bool:
+        """
+        Delete nodes by their IDs without blocking the event loop.
+        
+        Args:
+            node_ids: List of node IDs to delete
+            
+        Returns:
+            True if deletion was successful
+        """
+        pass
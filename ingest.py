@@ -0,0 +1,232 @@
+"""
+Resumable directory ingestion for the Agentic RAG system.
+
+Walks a directory, derives each document's plan name from a configurable rule
+and runs it through parse, chunk and upsert. Progress is checkpointed per file
+in an ingestion journal, so an interrupted run picks up every file from its
+last committed stage.
+
+Usage:
+    python ingest.py documents
+    python ingest.py documents --pattern "**/*.pdf" --name-rule regex --name-pattern "^(\\w+)"
+    python ingest.py --status
+"""
+
+import re
+import sys
+import argparse
+import logging
+from pathlib import Path
+from typing import List, Dict, Optional
+
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from core.component_registry import register_all_components
+from dotenv import load_dotenv
+load_dotenv("./.env")
+
+from core.config.base_config import ConfigManager
+from core.factories.parser_factory import ParserFactory
+from core.factories.chunker_factory import ChunkerFactory
+from core.factories.vector_store_factory import VectorStoreFactory
+from util.cache_util import hash_file
+from util.ingest_journal import IngestJournal, STAGES
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+NAME_RULES = ("camel", "snake", "stem", "regex")
+
+
+def derive_plan_name(file_path: str, rule: str = "camel", pattern: Optional[str] = None) -> str:
+    """
+    Derive a plan name from a document file name.
+
+    Args:
+        file_path: Path to the document
+        rule: "camel" (starHealthGainInsurancePolicy), "snake" (star_health_gain_insurance_policy),
+            "stem" (file name without extension) or "regex"
+        pattern: Regular expression searched in the file stem for the "regex" rule;
+            the first group is used if it has one, otherwise the whole match
+
+    Returns:
+        Plan name
+    """
+    stem = Path(file_path).stem
+
+    if rule == "stem":
+        return stem
+
+    if rule == "regex":
+        if not pattern:
+            raise ValueError("The regex name rule requires a name pattern")
+        match = re.search(pattern, stem)
+        if match is None:
+            raise ValueError(f"Name pattern {pattern!r} does not match {stem!r}")
+        return match.group(1) if match.groups() else match.group(0)
+
+    words = re.findall(r"[A-Za-z0-9]+", stem)
+    if not words:
+        return stem
+    if rule == "snake":
+        return "_".join(word.lower() for word in words)
+    if rule == "camel":
+        return words[0].lower() + "".join(word[:1].upper() + word[1:].lower() for word in words[1:])
+
+    raise ValueError(f"Unknown name rule: {rule}")
+
+
+def discover_documents(directory: str, pattern: str, supported_formats: List[str],
+                       name_rule: str = "camel", name_pattern: Optional[str] = None) -> List[Dict[str, str]]:
+    """
+    Find the documents to ingest.
+
+    Args:
+        directory: Directory to walk
+        pattern: Glob pattern relative to the directory
+        supported_formats: File extensions the parser accepts
+        name_rule: Plan name rule, see derive_plan_name
+        name_pattern: Regular expression for the "regex" name rule
+
+    Returns:
+        List of {"path", "name"} dicts accepted by the parsers, sorted by path
+    """
+    supported = {extension.lower() for extension in supported_formats}
+    return [
+        {"path": str(path), "name": derive_plan_name(str(path), name_rule, name_pattern)}
+        for path in sorted(Path(directory).glob(pattern))
+        if path.is_file() and path.suffix.lower() in supported
+    ]
+
+
+def ingest_document(file_path: Dict[str, str], parser, chunker, vector_store,
+                    journal: IngestJournal, pipeline: str) -> str:
+    """
+    Run one document through the stages it has not completed yet.
+
+    Args:
+        file_path: Path to the document and name of the document
+        parser: Parser instance
+        chunker: Chunker instance
+        vector_store: Vector store instance
+        journal: Ingestion journal
+        pipeline: Identifier of the components, a change restarts the document
+
+    Returns:
+        Stage the document was resumed from
+    """
+    path = file_path["path"]
+    resumed_from = journal.begin(path, file_path["name"], hash_file(path), pipeline)
+    stage = resumed_from
+
+    if stage == "pending":
+        documents = parser.parse(file_path)
+        journal.commit_stage(path, "parsed", documents)
+        stage = "parsed"
+
+    if stage == "parsed":
+        documents = journal.load_artifact(path)
+        if documents is None:
+            documents = parser.parse(file_path)
+        nodes = chunker.chunk(documents)
+        journal.commit_stage(path, "chunked", nodes)
+        stage = "chunked"
+
+    if stage == "chunked":
+        nodes = journal.load_artifact(path)
+        if nodes is None:
+            nodes = chunker.chunk(parser.parse(file_path))
+        # Only new or changed chunks are written, so a revised file costs only its edits
+        vector_store.sync(nodes, file_path["name"])
+        journal.commit_stage(path, "upserted")
+
+    return resumed_from
+
+
+def print_status(journal: IngestJournal) -> None:
+    """Print the journal summary and any files with errors."""
+    summary = journal.get_summary()
+    print("  ".join(f"{stage}: {summary[stage]}" for stage in STAGES) + f"  failed: {summary['failed']}")
+    for entry in journal.get_entries():
+        if entry["error"]:
+            print(f"  {entry['file_path']} [{entry['stage']}] {entry['error']}")
+
+
+def main() -> int:
+    """Ingestion entry point."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", nargs="?", default="documents", help="Directory to ingest")
+    parser.add_argument("--pattern", default="**/*", help="Glob pattern relative to the directory")
+    parser.add_argument("--name-rule", choices=NAME_RULES, default="camel", help="How plan names are derived")
+    parser.add_argument("--name-pattern", help="Regular expression for the regex name rule")
+    parser.add_argument("--config", default="config.json", help="Path to configuration file")
+    parser.add_argument("--parser", help="Parser name from configuration, default if omitted")
+    parser.add_argument("--chunker", help="Chunker name from configuration, default if omitted")
+    parser.add_argument("--vector-store", help="Vector store name from configuration, default if omitted")
+    parser.add_argument("--journal-dir", default="cache/ingest", help="Directory of the ingestion journal")
+    parser.add_argument("--restart", action="store_true", help="Forget the journal and ingest everything again")
+    parser.add_argument("--status", action="store_true", help="Print the journal summary and exit")
+    args = parser.parse_args()
+
+    journal = IngestJournal(args.journal_dir)
+    if args.status:
+        print_status(journal)
+        return 0
+    if args.restart:
+        journal.reset()
+
+    try:
+        config = ConfigManager(args.config).load_config()
+        parser_name = args.parser or config.parsers.default
+        chunker_name = args.chunker or config.chunkers.default
+        vector_store_name = args.vector_store or config.vector_stores.default
+
+        document_parser = ParserFactory.create_from_config(config.parsers, parser_name)
+        chunker = ChunkerFactory.create_from_config(config.chunkers, chunker_name)
+        vector_store = VectorStoreFactory.create_from_config(config.vector_stores, vector_store_name)
+    except Exception as e:
+        logger.error(f"Error initializing components: {e}")
+        return 1
+
+    pipeline = f"{parser_name}|{chunker_name}|{vector_store_name}"
+    failed = 0
+    try:
+        file_paths = discover_documents(
+            args.directory, args.pattern, document_parser.get_supported_formats(),
+            args.name_rule, args.name_pattern,
+        )
+        logger.info(f"Found {len(file_paths)} documents in {args.directory}")
+
+        for index, file_path in enumerate(file_paths, 1):
+            try:
+                resumed_from = ingest_document(file_path, document_parser, chunker, vector_store, journal, pipeline)
+                if resumed_from == "upserted":
+                    logger.info(f"[{index}/{len(file_paths)}] Already ingested: {file_path['path']}")
+                else:
+                    logger.info(f"[{index}/{len(file_paths)}] Ingested {file_path['path']} "
+                                f"as {file_path['name']} (resumed from {resumed_from})")
+            except Exception as e:
+                failed += 1
+                journal.record_error(file_path["path"], str(e))
+                logger.error(f"[{index}/{len(file_paths)}] Error ingesting {file_path['path']}: {e}")
+
+        print_status(journal)
+        dedup = vector_store.get_collection_info().get("dedup")
+        if dedup and dedup.get("enabled", True) and dedup.get("nodes_seen"):
+            logger.info(f"Near-duplicates dropped: {dedup['duplicates_dropped']}/{dedup['nodes_seen']} nodes, "
+                        f"{dedup['chars_saved']} characters not embedded")
+    finally:
+        # Shut down the parser's converter pool and the chunker's worker pool
+        document_parser.close()
+        chunker.close()
+        journal.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
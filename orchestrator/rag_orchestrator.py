@@ -1,7 +1,14 @@
 """
 Main RAG orchestrator for the Agentic RAG system.
 """
-from typing import List, Dict, Any, Optional
+import logging
+import multiprocessing
+import multiprocessing.util
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import List, Dict, Any, Optional, Tuple
 from core.config.base_config import ConfigManager, RAGConfig
 from core.factories.parser_factory import ParserFactory
 from core.factories.chunker_factory import ChunkerFactory
@@ -12,6 +19,52 @@ from core.interfaces.chunker_interface import ChunkerInterface
 from core.interfaces.vector_store_interface import VectorStoreInterface
 from core.interfaces.agent_interface import AgentInterface
 from llama_index.core.schema import Document, BaseNode, NodeWithScore
+from util.chunk_batch import ChunkBatch
+
+logger = logging.getLogger(__name__)
+
+# Per-process parser/chunker instances used by ingestion workers, keyed by
+# (config_path, parser_name, chunker_name) so models are loaded once per worker.
+_worker_components: Dict[Tuple[str, str, str], Tuple[ParserInterface, ChunkerInterface]] = {}
+
+
+def _get_worker_components(config_path: str, parser_name: str,
+                           chunker_name: str) -> Tuple[ParserInterface, ChunkerInterface]:
+    """Get or create the parser and chunker for the current worker process."""
+    key = (config_path, parser_name, chunker_name)
+    if key not in _worker_components:
+        # Registers all component classes with their factories
+        import core.component_registry  # noqa: F401
+
+        config = ConfigManager(config_path).load_config()
+        parser = ParserFactory.create_from_config(config.parsers, parser_name)
+        chunker = ChunkerFactory.create_from_config(config.chunkers, chunker_name)
+        # Worker processes skip atexit handlers, so shut the parser's pool down from a finalizer
+        multiprocessing.util.Finalize(None, parser.close, exitpriority=10)
+        _worker_components[key] = (parser, chunker)
+    return _worker_components[key]
+
+
+def _parse_and_chunk(config_path: str, parser_name: str, chunker_name: str,
+                     file_path: Dict[str, str]) -> ChunkBatch:
+    """
+    Parse and chunk a single document inside an ingestion worker.
+
+    The chunks are returned as a chunk batch, which is much cheaper to send
+    back to the ingestion process than the nodes themselves.
+
+    Args:
+        config_path: Path to configuration file
+        parser_name: Parser name from configuration
+        chunker_name: Chunker name from configuration
+        file_path: Path to the document and name of the document
+
+    Returns:
+        Chunk batch of the chunked nodes
+    """
+    parser, chunker = _get_worker_components(config_path, parser_name, chunker_name)
+    documents = parser.parse(file_path)
+    return chunker.chunk_batch(documents)
 
 
 class RAGOrchestrator:
@@ -27,6 +80,9 @@ class RAGOrchestrator:
         self.config_manager = ConfigManager(config_path)
         self.config: Optional[RAGConfig] = None
         
+        self.parser_name: Optional[str] = None
+        self.chunker_name: Optional[str] = None
+        
         self.parser: Optional[ParserInterface] = None
         self.chunker: Optional[ChunkerInterface] = None
         self.vector_store: Optional[VectorStoreInterface] = None
@@ -40,8 +96,10 @@ class RAGOrchestrator:
         try:
             self.config = self.config_manager.load_config()
             
+            self.parser_name = self.config.parsers.default
             self.parser = ParserFactory.create_from_config(self.config.parsers)
             
+            self.chunker_name = self.config.chunkers.default
             self.chunker = ChunkerFactory.create_from_config(self.config.chunkers)
             
             self.vector_store = VectorStoreFactory.create_from_config(self.config.vector_stores)
@@ -70,6 +128,10 @@ class RAGOrchestrator:
         """
         Process a document through the entire pipeline.
         
+        Chunks are synced against what is already stored for the document, so
+        re-processing a revised document only writes the chunks that changed and
+        deletes the ones that are gone.
+        
         Args:
             file_path: Path to the document to process and name of the document
             
@@ -84,13 +146,144 @@ class RAGOrchestrator:
             
             nodes = self.chunker.chunk(documents)
             
-            node_ids = self.vector_store.add(nodes)
+            result = self.vector_store.sync(nodes, file_path["name"])
+            logger.info(
+                f"Synced {file_path['name']}: {len(result['upserted'])} upserted, "
+                f"{len(result['deleted'])} deleted, {result['unchanged']} unchanged"
+            )
+            
+            return result["upserted"]
+            
+        except Exception as e:
+            raise RuntimeError(f"Failed to process document {file_path}: {str(e)}")
+    
+    def process_document_streaming(self, file_path: {str, str}, batch_size: Optional[int] = None) -> List[str]:
+        """
+        Process a document as a stream, writing nodes while parsing is still running.
+        
+        The parser, chunker and vector store are chained through generators, and
+        nodes are embedded and upserted in fixed-size batches. Only a few batches
+        are held in memory at once, which keeps peak memory flat for large PDFs.
+        Chunks are synced against what is already stored for the document, as in
+        process_document().
+        
+        Args:
+            file_path: Path to the document to process and name of the document
+            batch_size: Number of nodes embedded and upserted per batch
+            
+        Returns:
+            List of node IDs that were upserted to the vector store
+        """
+        if not self.parser or not self.chunker or not self.vector_store:
+            raise RuntimeError("Components not initialized")
+        
+        try:
+            documents = self.parser.parse_iter(file_path)
+            
+            nodes = self.chunker.chunk_iter(documents)
+            
+            result = self.vector_store.sync_stream(nodes, file_path["name"], batch_size=batch_size)
+            logger.info(
+                f"Synced {file_path['name']}: {len(result['upserted'])} upserted, "
+                f"{len(result['deleted'])} deleted, {result['unchanged']} unchanged"
+            )
             
-            return node_ids
+            return result["upserted"]
             
         except Exception as e:
             raise RuntimeError(f"Failed to process document {file_path}: {str(e)}")
     
+    def process_documents(self, file_paths: List[Dict[str, str]], max_workers: Optional[int] = None,
+                          queue_size: int = 4) -> List[Dict[str, Any]]:
+        """
+        Process many documents, parsing and chunking them in parallel.
+        
+        Parsing and chunking run in a process pool. Chunked nodes are handed to a
+        single writer thread through a bounded queue, so embedding and upserts to the
+        vector store happen one document at a time and workers pause when the writer
+        falls behind.
+        
+        Args:
+            file_paths: List of document paths and names ({"path": ..., "name": ...})
+            max_workers: Number of parse/chunk worker processes, defaults to CPU count
+            queue_size: Maximum number of chunked documents waiting for the writer
+            
+        Returns:
+            Per-document results in input order, each with "path", "name", "status"
+            ("success" or "failed"), "node_ids" and "error"
+        """
+        if not self.parser or not self.chunker or not self.vector_store:
+            raise RuntimeError("Components not initialized")
+        
+        results: List[Dict[str, Any]] = [
+            {
+                "path": file_path.get("path"),
+                "name": file_path.get("name"),
+                "status": "failed",
+                "node_ids": [],
+                "error": None,
+            }
+            for file_path in file_paths
+        ]
+        if not file_paths:
+            return results
+        
+        max_workers = max_workers or os.cpu_count() or 1
+        write_queue: "queue.Queue[Optional[Tuple[int, ChunkBatch]]]" = queue.Queue(maxsize=queue_size)
+        
+        def writer() -> None:
+            while True:
+                item = write_queue.get()
+                if item is None:
+                    break
+                index, nodes = item
+                try:
+                    result = self.vector_store.sync(nodes, file_paths[index]["name"])
+                    results[index]["node_ids"] = result["upserted"]
+                    results[index]["status"] = "success"
+                except Exception as e:
+                    results[index]["error"] = f"Failed to add nodes to vector store: {str(e)}"
+                    logger.error(f"Failed to store document {file_paths[index]}: {str(e)}")
+        
+        writer_thread = threading.Thread(target=writer, name="ingest-writer", daemon=True)
+        writer_thread.start()
+        
+        # Spawned workers avoid inheriting loaded models and open client connections
+        mp_context = multiprocessing.get_context("spawn")
+        config_path = self.config_manager.config_path
+        
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context) as executor:
+                pending = {}
+                next_index = 0
+                # Cap in-flight documents so finished nodes cannot pile up unbounded
+                max_in_flight = max_workers + queue_size
+                
+                while next_index < len(file_paths) or pending:
+                    while next_index < len(file_paths) and len(pending) < max_in_flight:
+                        future = executor.submit(
+                            _parse_and_chunk, config_path, self.parser_name,
+                            self.chunker_name, file_paths[next_index]
+                        )
+                        pending[future] = next_index
+                        next_index += 1
+                    
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index = pending.pop(future)
+                        try:
+                            nodes = future.result()
+                        except Exception as e:
+                            results[index]["error"] = f"Failed to process document: {str(e)}"
+                            logger.error(f"Failed to process document {file_paths[index]}: {str(e)}")
+                            continue
+                        write_queue.put((index, nodes))
+        finally:
+            write_queue.put(None)
+            writer_thread.join()
+        
+        return results
+    
     def query(self, question: str, use_manager: bool = True) -> str:
         """
         Process a user query.
@@ -144,9 +337,27 @@ class RAGOrchestrator:
             }
         }
     
+    def close(self) -> None:
+        """Shut down worker pools and open files held by the components."""
+        for component in (self.parser, self.chunker, self.vector_store):
+            self._close_component(component)
+    
+    def __enter__(self) -> "RAGOrchestrator":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    @staticmethod
+    def _close_component(component: Any) -> None:
+        """Close a component that holds workers or files, if it has a close method."""
+        if component is not None and hasattr(component, 'close'):
+            component.close()
+    
     def reload_config(self) -> None:
         """Reload configuration and reinitialize components."""
         self.config_manager.load_config()
+        self.close()
         self._initialize_components()
     
     def switch_parser(self, parser_name: str) -> None:
@@ -154,6 +365,8 @@ class RAGOrchestrator:
         if parser_name not in self.config.parsers.available:
             raise ValueError(f"Parser '{parser_name}' not found in configuration")
         
+        self._close_component(self.parser)
+        self.parser_name = parser_name
         self.parser = ParserFactory.create_from_config(
             self.config.parsers, 
             parser_name
@@ -164,6 +377,8 @@ class RAGOrchestrator:
         if chunker_name not in self.config.chunkers.available:
             raise ValueError(f"Chunker '{chunker_name}' not found in configuration")
         
+        self._close_component(self.chunker)
+        self.chunker_name = chunker_name
         self.chunker = ChunkerFactory.create_from_config(
             self.config.chunkers, 
             chunker_name
@@ -174,6 +389,7 @@ class RAGOrchestrator:
         if vector_store_name not in self.config.vector_stores.available:
             raise ValueError(f"Vector store '{vector_store_name}' not found in configuration")
         
+        self._close_component(self.vector_store)
         self.vector_store = VectorStoreFactory.create_from_config(
             self.config.vector_stores, 
             vector_store_name
@@ -2,28 +2,31 @@
 Base parser implementation.
 """
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator
 from pathlib import Path
 from core.interfaces.parser_interface import ParserInterface
 from llama_index.core.schema import Document
-from util.cache_util import ParserCache
+from util.cache_util import ParserCache, CachedMarkdown
 
 
 class BaseParser(ParserInterface):
     """Base parser implementation with common functionality."""
     
-    def __init__(self, enable_cache: bool = True, cache_dir: str = "cache", **kwargs):
+    def __init__(self, enable_cache: bool = True, cache_dir: str = "cache",
+                 max_cache_bytes: Optional[int] = None, cache_compression: str = "none", **kwargs):
         """
         Initialize base parser.
         
         Args:
             enable_cache: Enable caching functionality
             cache_dir: Directory to store cache files
+            max_cache_bytes: Maximum total size of the cache, unbounded if None
+            cache_compression: Cache storage format ("none", "zlib" or "zstd")
             **kwargs: Additional configuration
         """
         self.config = kwargs
         self.enable_cache = enable_cache
-        self.cache = ParserCache(cache_dir) if enable_cache else None
+        self.cache = ParserCache(cache_dir, max_cache_bytes, cache_compression) if enable_cache else None
     
     def validate_file(self, file_path: str) -> bool:
         """
@@ -41,6 +44,23 @@ class BaseParser(ParserInterface):
         file_ext = Path(file_path).suffix.lower()
         return file_ext in self.get_supported_formats()
     
+    def parse_iter(self, file_path: {str, str}, **kwargs) -> Iterator[Document]:
+        """
+        Parse a document lazily. Parsers that can produce partial output override this.
+        
+        Args:
+            file_path: Path to the document to parse
+            **kwargs: Additional parsing options
+            
+        Yields:
+            Document objects
+        """
+        yield from self.parse(file_path, **kwargs)
+    
+    def close(self) -> None:
+        """Release workers held by the parser. Override in subclasses that start any."""
+        pass
+    
     def _create_document(self, content: str, metadata: Dict[str, Any] = None) -> Document:
         """
         Create a Document object with content and metadata.
@@ -60,6 +80,15 @@ class BaseParser(ParserInterface):
             metadata=metadata
         )
     
+    def _get_cache_options(self) -> Dict[str, Any]:
+        """
+        Get the parse options that affect parser output and so belong in the cache key.
+        
+        Returns:
+            Dictionary of parse options
+        """
+        return {}
+    
     def _get_cached_markdown(self, file_path: str) -> Optional[str]:
         """
         Get cached markdown content if available.
@@ -73,7 +102,37 @@ class BaseParser(ParserInterface):
         if not self.enable_cache or not self.cache:
             return None
         
-        return self.cache.get_cached_markdown(file_path, self.get_parser_name())
+        return self.cache.get_cached_markdown(file_path, self.get_parser_name(), self._get_cache_options())
+    
+    def _open_cached_markdown(self, file_path: str) -> Optional[CachedMarkdown]:
+        """
+        Open cached markdown for lazy, per-section reads.
+        
+        Args:
+            file_path: Path to the file
+            
+        Returns:
+            Cached markdown document, to be closed by the caller, or None if not cached
+        """
+        if not self.enable_cache or not self.cache:
+            return None
+        
+        return self.cache.open_cached_markdown(file_path, self.get_parser_name(), self._get_cache_options())
+    
+    def _get_cached_metadata(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the metadata cached with a file's markdown.
+        
+        Args:
+            file_path: Path to the file
+            
+        Returns:
+            Cached metadata or None if not cached
+        """
+        if not self.enable_cache or not self.cache:
+            return None
+        
+        return self.cache.get_cached_metadata(file_path, self.get_parser_name(), self._get_cache_options())
     
     def _cache_markdown(self, file_path: str, markdown_content: str, 
                        metadata: Dict[str, Any] = None) -> bool:
@@ -91,7 +150,8 @@ class BaseParser(ParserInterface):
         if not self.enable_cache or not self.cache:
             return False
         
-        return self.cache.cache_markdown(file_path, self.get_parser_name(), markdown_content, metadata)
+        return self.cache.cache_markdown(file_path, self.get_parser_name(), markdown_content, metadata,
+                                         self._get_cache_options())
     
     def _is_cached(self, file_path: str) -> bool:
         """
@@ -106,7 +166,7 @@ class BaseParser(ParserInterface):
         if not self.enable_cache or not self.cache:
             return False
         
-        return self.cache.is_cached(file_path, self.get_parser_name())
+        return self.cache.is_cached(file_path, self.get_parser_name(), self._get_cache_options())
     
     def clear_cache(self, file_path: str = None) -> bool:
         """
@@ -133,15 +193,9 @@ class BaseParser(ParserInterface):
         if not self.enable_cache or not self.cache:
             return {"enabled": False}
         
-        cache_info = self.cache.get_cache_info()
+        # Only show files parsed by this parser
+        cache_info = self.cache.get_cache_info(self.get_parser_name())
         cache_info["parser_name"] = self.get_parser_name()
         cache_info["enabled"] = True
         
-        # Filter to only show files parsed by this parser
-        if "cached_files" in cache_info:
-            cache_info["cached_files"] = [
-                file_info for file_info in cache_info["cached_files"]
-                if file_info.get("parser_name") == self.get_parser_name()
-            ]
-        
         return cache_info
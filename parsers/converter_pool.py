@@ -0,0 +1,170 @@
+"""
+Pool of pre-warmed Docling converter worker processes.
+"""
+import os
+import time
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import List, Dict, Any, Optional
+from docling.datamodel.base_models import InputFormat
+
+
+# Parser owned by the current worker process, created by _warm_worker
+_worker_parser = None
+
+
+def _warm_worker(options: Dict[str, Any], startup_queue) -> None:
+    """
+    Create the worker's parser and load its Docling models.
+    
+    Args:
+        options: DoclingParser converter options
+        startup_queue: Queue receiving (pid, startup seconds) once the models are loaded
+    """
+    global _worker_parser
+    from parsers.docling_parser import DoclingParser
+    
+    start = time.perf_counter()
+    _worker_parser = DoclingParser(enable_cache=False, stream_page_window=0, **options)
+    _worker_parser._get_converter().initialize_pipeline(InputFormat.PDF)
+    if _worker_parser.enable_ocr and _worker_parser.ocr_mode == "selective":
+        _worker_parser._get_text_converter().initialize_pipeline(InputFormat.PDF)
+    startup_queue.put((os.getpid(), time.perf_counter() - start))
+
+
+def _ping() -> int:
+    """Return the worker's pid, used to start workers ahead of the first document."""
+    return os.getpid()
+
+
+def _convert(file_path: str, page_range: Optional[tuple] = None,
+             page_plan: Optional[List[Dict[str, Any]]] = None) -> str:
+    """Convert a document, or a range of its pages, with the worker's warm parser."""
+    return _worker_parser._convert_markdown(file_path, page_range, page_plan)
+
+
+class ConverterPool:
+    """Long-lived pool of worker processes with Docling models already loaded."""
+    
+    def __init__(self, options: Dict[str, Any], pool_size: Optional[int] = None,
+                 recycle_after: Optional[int] = None, warm: bool = True):
+        """
+        Initialize the converter pool.
+        
+        Args:
+            options: DoclingParser converter options (enable_ocr, table_structure, ocr_mode, ...)
+            pool_size: Number of worker processes, defaults to the CPU count
+            recycle_after: Replace a worker after it has handled this many tasks (the
+                warm-up task counts as one), to bound memory growth, never if None
+            warm: Start every worker and load its models now rather than on first use
+        """
+        if recycle_after is not None and recycle_after < 1:
+            raise ValueError("recycle_after must be a positive number of tasks")
+        
+        self.options = dict(options)
+        self.pool_size = pool_size or os.cpu_count() or 1
+        self.recycle_after = recycle_after
+        
+        context = multiprocessing.get_context("spawn")
+        self._startup_queue = context.SimpleQueue()
+        self._startup_times: List[Dict[str, Any]] = []
+        self._tasks_submitted = 0
+        self._tasks_failed = 0
+        self._created_at = time.perf_counter()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.pool_size,
+            mp_context=context,
+            initializer=_warm_worker,
+            initargs=(self.options, self._startup_queue),
+            max_tasks_per_child=recycle_after,
+        )
+        
+        if warm:
+            self.warm()
+    
+    def warm(self) -> None:
+        """Start all workers and wait until their models are loaded."""
+        started = len(self._startup_times)
+        for future in [self._executor.submit(_ping) for _ in range(self.pool_size)]:
+            future.result()
+        
+        # A worker that loaded quickly may have answered several pings
+        while len(self._startup_times) < started + self.pool_size:
+            pid, seconds = self._startup_queue.get()
+            self._startup_times.append({"pid": pid, "seconds": seconds})
+    
+    def submit(self, file_path: str, page_range: Optional[tuple] = None,
+               page_plan: Optional[List[Dict[str, Any]]] = None) -> Future:
+        """
+        Dispatch a conversion to a warm worker.
+        
+        Args:
+            file_path: Path to the document
+            page_range: Inclusive (first, last) page numbers, whole document if None
+            page_plan: Per-page OCR decisions from DoclingParser._plan_ocr
+        
+        Returns:
+            Future resolving to the markdown content
+        """
+        self._tasks_submitted += 1
+        future = self._executor.submit(_convert, file_path, page_range, page_plan)
+        future.add_done_callback(self._record_result)
+        return future
+    
+    def convert(self, file_path: str, page_range: Optional[tuple] = None,
+                page_plan: Optional[List[Dict[str, Any]]] = None) -> str:
+        """
+        Convert a document, or a range of its pages, in a warm worker.
+        
+        Args:
+            file_path: Path to the document
+            page_range: Inclusive (first, last) page numbers, whole document if None
+            page_plan: Per-page OCR decisions from DoclingParser._plan_ocr
+        
+        Returns:
+            Markdown content
+        """
+        return self.submit(file_path, page_range, page_plan).result()
+    
+    def _record_result(self, future: Future) -> None:
+        """Count failed conversions."""
+        if not future.cancelled() and future.exception() is not None:
+            self._tasks_failed += 1
+    
+    def _collect_startup_times(self) -> None:
+        """Move startup reports from the workers into the metrics."""
+        while not self._startup_queue.empty():
+            pid, seconds = self._startup_queue.get()
+            self._startup_times.append({"pid": pid, "seconds": seconds})
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get pool metrics.
+        
+        Returns:
+            Pool settings, task counts and worker startup times (model load), including
+            workers started to replace recycled ones
+        """
+        self._collect_startup_times()
+        startup_seconds = [entry["seconds"] for entry in self._startup_times]
+        return {
+            "pool_size": self.pool_size,
+            "recycle_after": self.recycle_after,
+            "tasks_submitted": self._tasks_submitted,
+            "tasks_failed": self._tasks_failed,
+            "workers_started": len(startup_seconds),
+            "startup_seconds_total": sum(startup_seconds),
+            "startup_seconds_mean": sum(startup_seconds) / len(startup_seconds) if startup_seconds else 0.0,
+            "startup_seconds_max": max(startup_seconds, default=0.0),
+            "startup_times": list(self._startup_times),
+            "uptime_seconds": time.perf_counter() - self._created_at,
+        }
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop all workers.
+        
+        Args:
+            wait: Wait for pending conversions to finish
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
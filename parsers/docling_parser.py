@@ -2,12 +2,19 @@
 Docling-based document parser.
 """
 import os
-from typing import List, Dict, Any
+import multiprocessing
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from pathlib import Path
 from docling.document_converter import DocumentConverter, PdfFormatOption
 from docling.datamodel.base_models import InputFormat
 from docling.datamodel.pipeline_options import PdfPipelineOptions, TesseractOcrOptions
 from parsers.base_parser import BaseParser
+from parsers.converter_pool import ConverterPool
+from parsers.pdf_pages import (
+    analyze_text_layer, append_markdown_shard, format_page_ranges, get_page_count, group_page_runs,
+    stitch_markdown_shards
+)
+from util.cache_util import split_markdown_sections
 from llama_index.core.schema import Document
 
 
@@ -15,21 +22,56 @@ class DoclingParser(BaseParser):
     """Docling-based document parser with OCR and table structure support."""
     
     def __init__(self, enable_ocr: bool = True, table_structure: bool = True, 
-                 enable_cache: bool = True, cache_dir: str = "cache", **kwargs):
+                 ocr_mode: str = "full", min_text_chars: int = 32, min_text_coverage: float = 0.01,
+                 enable_cache: bool = True, cache_dir: str = "cache",
+                 max_cache_bytes: Optional[int] = None, cache_compression: str = "none",
+                 stream_page_window: int = 16, stream_section_chars: int = 32000,
+                 shard_pages: int = 0, pool_size: int = 0, pool_recycle_after: Optional[int] = None,
+                 **kwargs):
         """
         Initialize Docling parser.
         
         Args:
             enable_ocr: Enable OCR processing
             table_structure: Enable table structure detection
+            ocr_mode: "full" to OCR every page, or "selective" to OCR only pages without
+                a usable text layer
+            min_text_chars: Pages with fewer text-layer characters are OCR'd in selective mode
+            min_text_coverage: Pages whose text boxes cover less of the page area are
+                OCR'd in selective mode
             enable_cache: Enable caching functionality
             cache_dir: Directory to store cache files
+            max_cache_bytes: Maximum total size of the cache, unbounded if None
+            cache_compression: Cache storage format ("none", "zlib" or "zstd")
+            stream_page_window: Number of PDF pages converted per document in parse_iter
+            stream_section_chars: Approximate size of the documents yielded by parse_iter
+            shard_pages: Number of pages per shard when converting PDFs across the converter
+                pool, 0 to convert each document whole
+            pool_size: Number of pre-warmed converter worker processes documents are
+                dispatched to, 0 to convert in this process (or, when sharding, to use
+                one worker per CPU)
+            pool_recycle_after: Replace a converter worker after this many conversions,
+                never if None
             **kwargs: Additional configuration
         """
-        super().__init__(enable_cache=enable_cache, cache_dir=cache_dir, **kwargs)
+        super().__init__(enable_cache=enable_cache, cache_dir=cache_dir,
+                         max_cache_bytes=max_cache_bytes, cache_compression=cache_compression, **kwargs)
+        if ocr_mode not in ("full", "selective"):
+            raise ValueError(f"Unknown OCR mode: {ocr_mode}")
+        
         self.enable_ocr = enable_ocr
         self.table_structure = table_structure
+        self.ocr_mode = ocr_mode
+        self.min_text_chars = min_text_chars
+        self.min_text_coverage = min_text_coverage
+        self.stream_page_window = stream_page_window
+        self.stream_section_chars = stream_section_chars
+        self.shard_pages = shard_pages
+        self.pool_size = pool_size
+        self.pool_recycle_after = pool_recycle_after
         self._converter = None
+        self._text_converter = None
+        self._pool = None
     
     def _get_converter(self) -> DocumentConverter:
         """Get or create document converter."""
@@ -55,6 +97,206 @@ class DoclingParser(BaseParser):
         
         return self._converter
     
+    def _get_text_converter(self) -> DocumentConverter:
+        """Get or create the converter used for pages with a text layer in selective OCR mode."""
+        if self._text_converter is None:
+            pipeline_options = PdfPipelineOptions()
+            pipeline_options.do_ocr = False
+            pipeline_options.do_table_structure = self.table_structure
+            pipeline_options.table_structure_options.do_cell_matching = True
+            
+            self._text_converter = DocumentConverter(
+                format_options={
+                    InputFormat.PDF: PdfFormatOption(
+                        pipeline_options=pipeline_options,
+                    )
+                }
+            )
+        
+        return self._text_converter
+    
+    def _get_cache_options(self) -> Dict[str, Any]:
+        """Get the parse options that belong in the cache key."""
+        options = {
+            "enable_ocr": self.enable_ocr,
+            "table_structure": self.table_structure,
+        }
+        if self.enable_ocr:
+            options["ocr_mode"] = self.ocr_mode
+        return options
+    
+    def _plan_ocr(self, file_path: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Decide per page whether OCR is needed, when selective OCR applies.
+        
+        Args:
+            file_path: Path to the document
+            
+        Returns:
+            Per-page text layer measurements with an "ocr" decision, or None when
+            every page is converted with the same settings
+        """
+        if not self.enable_ocr or self.ocr_mode != "selective" or Path(file_path).suffix.lower() != ".pdf":
+            return None
+        
+        page_plan = analyze_text_layer(file_path)
+        for page in page_plan:
+            page["ocr"] = (page["char_count"] < self.min_text_chars
+                           or page["text_coverage"] < self.min_text_coverage)
+        return page_plan
+    
+    def _convert_markdown(self, file_path: str, page_range: Optional[tuple] = None,
+                          page_plan: Optional[List[Dict[str, Any]]] = None) -> str:
+        """
+        Convert a document, or a range of its pages, to markdown.
+        
+        With a page plan, consecutive pages sharing an OCR decision are converted
+        together, and only the pages that need it go through the OCR pipeline.
+        
+        Args:
+            file_path: Path to the document
+            page_range: Inclusive (first, last) page numbers, whole document if None
+            page_plan: Per-page OCR decisions from _plan_ocr
+            
+        Returns:
+            Markdown content
+        """
+        if page_plan is None:
+            converter = self._get_converter()
+            if page_range is None:
+                result = converter.convert(file_path)
+            else:
+                result = converter.convert(file_path, page_range=page_range)
+            return result.document.export_to_markdown()
+        
+        first_page, last_page = page_range or (1, len(page_plan))
+        flags = [page["ocr"] for page in page_plan[first_page - 1:last_page]]
+        
+        markdown_parts = []
+        for run_start, run_end, needs_ocr in group_page_runs(flags, first_page):
+            converter = self._get_converter() if needs_ocr else self._get_text_converter()
+            result = converter.convert(file_path, page_range=(run_start, run_end))
+            markdown_parts.append(result.document.export_to_markdown())
+        
+        return stitch_markdown_shards(markdown_parts)
+    
+    def _get_converter_options(self) -> Dict[str, Any]:
+        """Get the converter options pool workers need to reproduce this parser."""
+        return {
+            "enable_ocr": self.enable_ocr,
+            "table_structure": self.table_structure,
+            "ocr_mode": self.ocr_mode,
+            "min_text_chars": self.min_text_chars,
+            "min_text_coverage": self.min_text_coverage,
+        }
+    
+    def _get_pool(self) -> Optional[ConverterPool]:
+        """
+        Get or create the pool of pre-warmed converter workers.
+        
+        Returns:
+            Converter pool, or None when documents are converted in this process. No
+            pool is started from inside a worker process, so parsers created by
+            ingestion or converter workers never nest pools.
+        """
+        if not self.pool_size and not self.shard_pages:
+            return None
+        if multiprocessing.parent_process() is not None:
+            return None
+        
+        if self._pool is None:
+            self._pool = ConverterPool(
+                self._get_converter_options(),
+                pool_size=self.pool_size or None,
+                recycle_after=self.pool_recycle_after,
+            )
+        return self._pool
+    
+    def _get_page_ranges(self, page_count: int, pages_per_range: int) -> List[tuple]:
+        """Split pages into consecutive inclusive (first, last) ranges."""
+        return [
+            (page_start, min(page_start + pages_per_range - 1, page_count))
+            for page_start in range(1, page_count + 1, pages_per_range)
+        ]
+    
+    def _convert_sharded(self, file_path: str,
+                         page_plan: Optional[List[Dict[str, Any]]] = None) -> Optional[str]:
+        """
+        Convert a PDF in page-range shards across the converter pool.
+        
+        Shards are converted in parallel and stitched back together in page
+        order, joining tables that continue across shard boundaries.
+        
+        Args:
+            file_path: Path to the PDF
+            page_plan: Per-page OCR decisions from _plan_ocr
+            
+        Returns:
+            Markdown content, or None when the document is not sharded
+        """
+        if not self.shard_pages or Path(file_path).suffix.lower() != ".pdf":
+            return None
+        
+        pool = self._get_pool()
+        if pool is None:
+            return None
+        
+        page_count = len(page_plan) if page_plan is not None else get_page_count(file_path)
+        if page_count <= self.shard_pages:
+            return None
+        
+        futures = [
+            pool.submit(file_path, page_range, page_plan)
+            for page_range in self._get_page_ranges(page_count, self.shard_pages)
+        ]
+        return stitch_markdown_shards([future.result() for future in futures])
+    
+    def get_pool_metrics(self) -> Dict[str, Any]:
+        """
+        Get converter pool metrics.
+        
+        Returns:
+            Pool settings, task counts and worker startup times, or an empty dict
+            when no pool has been started
+        """
+        if self._pool is None:
+            return {}
+        return self._pool.get_metrics()
+    
+    def close(self):
+        """Shut down the converter pool."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+    
+    def _get_ocr_metadata(self, page_plan: Optional[List[Dict[str, Any]]],
+                          page_range: Optional[tuple] = None) -> Dict[str, Any]:
+        """
+        Summarize per-page OCR decisions for document metadata.
+        
+        Args:
+            page_plan: Per-page OCR decisions from _plan_ocr
+            page_range: Inclusive (first, last) page numbers to summarize, all pages if None
+            
+        Returns:
+            Metadata with the OCR mode and the OCR'd pages as compact ranges
+        """
+        if page_plan is None:
+            return {}
+        
+        first_page, last_page = page_range or (1, len(page_plan))
+        pages = page_plan[first_page - 1:last_page]
+        return {
+            "ocr_mode": "selective",
+            "ocr_pages": format_page_ranges([page["page"] for page in pages if page["ocr"]]),
+            "ocr_page_count": sum(page["ocr"] for page in pages),
+        }
+    
+    def _get_cached_page_plan(self, file_path: str) -> Optional[List[Dict[str, Any]]]:
+        """Get the per-page OCR decisions cached with a file's markdown, None if there are none."""
+        cached_metadata = self._get_cached_metadata(file_path) or {}
+        return cached_metadata.get("page_ocr_decisions")
+    
     def parse(self, file_path: {str,str}, **kwargs) -> List[Document]:
         """
         Parse a document using Docling with caching support.
@@ -78,29 +320,34 @@ class DoclingParser(BaseParser):
                 metadata = {
                     "plan_name": file_path["name"],
                     "parser": "docling",
+                    **self._get_ocr_metadata(self._get_cached_page_plan(file_path["path"])),
                 }
                 document = self._create_document(cached_markdown, metadata)
                 return [document]
         
         # Parse the document if not cached
-        converter = self._get_converter()
-        
         try:
-            result = converter.convert(file_path["path"])
-            doc = result.document
-            
-            markdown_content = doc.export_to_markdown()
+            page_plan = self._plan_ocr(file_path["path"])
+            markdown_content = self._convert_sharded(file_path["path"], page_plan)
+            if markdown_content is None:
+                pool = self._get_pool() if self.pool_size else None
+                if pool is not None:
+                    markdown_content = pool.convert(file_path["path"], page_plan=page_plan)
+                else:
+                    markdown_content = self._convert_markdown(file_path["path"], page_plan=page_plan)
             
             metadata = {
                 "plan_name": file_path["name"],
                 "parser": "docling",
+                **self._get_ocr_metadata(page_plan),
             }
             
             document = self._create_document(markdown_content, metadata)
             documents = [document]
             
             cache_metadata = {
-                "parsing_options": kwargs
+                "parsing_options": kwargs,
+                "page_ocr_decisions": page_plan,
             }
             self._cache_markdown(file_path["path"], markdown_content, cache_metadata)
             
@@ -109,6 +356,135 @@ class DoclingParser(BaseParser):
         except Exception as e:
             raise RuntimeError(f"Failed to parse document {file_path["path"]}: {str(e)}")
     
+    def parse_iter(self, file_path: {str, str}, **kwargs) -> Iterator[Document]:
+        """
+        Parse a document lazily, converting PDFs in windows of pages.
+        
+        PDFs are converted `stream_page_window` pages at a time, so downstream
+        chunking and embedding can start before the whole PDF has been converted.
+        With a converter pool, windows are converted ahead in the pool workers.
+        Documents are cut at section boundaries only, the last section of a window
+        being held back until the next window shows where it ends, and grouped to
+        roughly `stream_section_chars` characters. Cached documents are read lazily
+        and grouped the same way, so a fresh and a cached stream yield the same
+        documents. The full markdown is cached once all windows are done.
+        
+        Args:
+            file_path: Path to the document to parse
+            **kwargs: Additional parsing options
+            
+        Yields:
+            Document objects made of whole sections
+        """
+        if not self.validate_file(file_path["path"]):
+            raise ValueError(f"File {file_path['path']} is not supported by DoclingParser")
+        
+        cached_markdown = self._open_cached_markdown(file_path["path"])
+        if cached_markdown is not None:
+            print(f"Using cached markdown for {file_path}")
+            metadata = {
+                "plan_name": file_path["name"],
+                "parser": "docling",
+                **self._get_ocr_metadata(self._get_cached_page_plan(file_path["path"])),
+            }
+            with cached_markdown:
+                yield from self._group_sections(cached_markdown.sections(), metadata)
+            return
+        
+        if (Path(file_path["path"]).suffix.lower() != ".pdf"
+                or not self.stream_page_window):
+            yield from self.parse(file_path, **kwargs)
+            return
+        
+        page_plan = self._plan_ocr(file_path["path"])
+        page_count = len(page_plan) if page_plan is not None else get_page_count(file_path["path"])
+        page_ranges = self._get_page_ranges(page_count, self.stream_page_window)
+        metadata = {
+            "plan_name": file_path["name"],
+            "parser": "docling",
+            **self._get_ocr_metadata(page_plan),
+        }
+        sections = self._iter_converted_sections(file_path, page_ranges, page_plan, kwargs)
+        yield from self._group_sections(sections, metadata)
+    
+    def _iter_converted_sections(self, file_path: {str, str}, page_ranges: List[Tuple[int, int]],
+                                 page_plan: Optional[List[Dict[str, Any]]],
+                                 options: Dict[str, Any]) -> Iterator[str]:
+        """
+        Convert a PDF window by window, yielding sections once they are complete.
+        
+        Args:
+            file_path: Path to the document and name of the document
+            page_ranges: Page windows to convert, in page order
+            page_plan: Per-page OCR decisions, None to OCR according to enable_ocr
+            options: Parsing options cached with the markdown
+            
+        Yields:
+            Sections of the stitched markdown, in order
+        """
+        markdown = ""
+        emitted = 0
+        
+        pool = self._get_pool() if len(page_ranges) > 1 else None
+        if pool is not None:
+            pending = [pool.submit(file_path["path"], page_range, page_plan) for page_range in page_ranges]
+        else:
+            pending = None
+        
+        for index, (page_start, page_end) in enumerate(page_ranges):
+            try:
+                if pending is not None:
+                    markdown_content = pending[index].result()
+                else:
+                    markdown_content = self._convert_markdown(
+                        file_path["path"], (page_start, page_end), page_plan
+                    )
+            except Exception as e:
+                if pending is not None:
+                    for future in pending[index + 1:]:
+                        future.cancel()
+                raise RuntimeError(
+                    f"Failed to parse pages {page_start}-{page_end} of {file_path['path']}: {str(e)}"
+                )
+            
+            markdown = append_markdown_shard(markdown, markdown_content)
+            # The last section may go on in the next window
+            for section in split_markdown_sections(markdown[emitted:])[:-1]:
+                emitted += len(section)
+                yield section
+        
+        cache_metadata = {
+            "parsing_options": options,
+            "page_ocr_decisions": page_plan,
+        }
+        self._cache_markdown(file_path["path"], markdown, cache_metadata)
+        
+        yield from split_markdown_sections(markdown[emitted:])
+    
+    def _group_sections(self, sections: Iterable[str], metadata: Dict[str, Any]) -> Iterator[Document]:
+        """
+        Group sections into documents of roughly `stream_section_chars` characters.
+        
+        Args:
+            sections: Markdown sections, in order
+            metadata: Metadata of every document
+            
+        Yields:
+            Document objects made of whole sections
+        """
+        group = []
+        length = 0
+        for section in sections:
+            group.append(section)
+            length += len(section)
+            if length >= self.stream_section_chars:
+                yield self._create_document("".join(group), dict(metadata))
+                group = []
+                length = 0
+        
+        if group:
+            yield self._create_document("".join(group), dict(metadata))
+    
     def get_supported_formats(self) -> List[str]:
         """Get supported file formats."""
         return ['.pdf', '.docx', '.doc', '.txt', '.md']
@@ -0,0 +1,223 @@
+"""
+Page-level helpers for PDF parsing.
+"""
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import pypdfium2 as pdfium
+
+_HEADING_PATTERN = re.compile(r"#{1,6}\s+(.*?)\s*#*")
+# Marker some documents add to a heading repeated on the pages a section continues on
+_CONTINUED_PATTERN = re.compile(r"\s*[-:,\u2013\u2014]?\s*[(\[]?\s*(continued|cont'?d\.?)\s*[)\]]?\s*$")
+
+
+def get_page_count(file_path: str) -> int:
+    """
+    Get the number of pages in a PDF.
+
+    Args:
+        file_path: Path to the PDF
+
+    Returns:
+        Number of pages
+    """
+    pdf = pdfium.PdfDocument(file_path)
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+
+def analyze_text_layer(file_path: str) -> List[Dict[str, Any]]:
+    """
+    Measure how much of each page is covered by an embedded text layer.
+
+    Args:
+        file_path: Path to the PDF
+
+    Returns:
+        One entry per page with "page" (1-based), "char_count" (non-whitespace
+        characters in the text layer) and "text_coverage" (fraction of the page
+        area covered by text boxes)
+    """
+    pages = []
+    pdf = pdfium.PdfDocument(file_path)
+    try:
+        for index in range(len(pdf)):
+            page = pdf[index]
+            textpage = page.get_textpage()
+            try:
+                width, height = page.get_size()
+                text = textpage.get_text_range()
+                text_area = 0.0
+                for rect_index in range(textpage.count_rects()):
+                    left, bottom, right, top = textpage.get_rect(rect_index)
+                    text_area += max(right - left, 0) * max(top - bottom, 0)
+
+                pages.append({
+                    "page": index + 1,
+                    "char_count": sum(not char.isspace() for char in text),
+                    "text_coverage": min(text_area / (width * height), 1.0) if width and height else 0.0,
+                })
+            finally:
+                textpage.close()
+                page.close()
+    finally:
+        pdf.close()
+
+    return pages
+
+
+def group_page_runs(flags: Sequence[bool], first_page: int = 1) -> List[Tuple[int, int, bool]]:
+    """
+    Group consecutive pages with the same flag into page ranges.
+
+    Args:
+        flags: One flag per page
+        first_page: Page number of the first flag
+
+    Returns:
+        List of (start_page, end_page, flag) with inclusive page numbers
+    """
+    runs: List[Tuple[int, int, bool]] = []
+    for offset, flag in enumerate(flags):
+        page = first_page + offset
+        if runs and runs[-1][2] == flag:
+            runs[-1] = (runs[-1][0], page, flag)
+        else:
+            runs.append((page, page, flag))
+    return runs
+
+
+def format_page_ranges(pages: Sequence[int]) -> str:
+    """
+    Format page numbers compactly, e.g. [1, 2, 3, 7] -> "1-3,7".
+
+    Args:
+        pages: Sorted page numbers
+
+    Returns:
+        Comma-separated page ranges
+    """
+    ranges = []
+    for page in pages:
+        if ranges and ranges[-1][1] == page - 1:
+            ranges[-1][1] = page
+        else:
+            ranges.append([page, page])
+    return ",".join(str(start) if start == end else f"{start}-{end}" for start, end in ranges)
+
+
+def _table_columns(line: str) -> int:
+    """Count the columns of a markdown table row, 0 if the line is not a table row."""
+    line = line.strip()
+    if not (line.startswith("|") and line.endswith("|") and len(line) > 1):
+        return 0
+    return line.count("|") - 1
+
+
+def _is_separator_row(line: str) -> bool:
+    """Check if a line is a markdown table header separator such as |---|:--|."""
+    cells = [cell.strip() for cell in line.strip().strip("|").split("|")]
+    return bool(cells) and all(cell and set(cell) <= set("-:") for cell in cells)
+
+
+def _normalize_row(line: str) -> List[str]:
+    """Normalize a table row for comparison."""
+    return [" ".join(cell.split()) for cell in line.strip().strip("|").split("|")]
+
+
+def _find_table_header(lines: List[str]) -> Optional[str]:
+    """Find the header row of the table the lines end in, None if it has no header."""
+    for index in range(len(lines) - 1, 0, -1):
+        if not _table_columns(lines[index]):
+            return None
+        if _is_separator_row(lines[index]):
+            return lines[index - 1]
+    return None
+
+
+def _heading_title(line: str) -> Optional[str]:
+    """Get the normalized title of a markdown heading, ignoring a "(continued)" marker."""
+    heading = _HEADING_PATTERN.fullmatch(line.strip())
+    if heading is None:
+        return None
+    return _CONTINUED_PATTERN.sub("", " ".join(heading.group(1).lower().split()))
+
+
+def join_markdown_shards(previous: str, current: str) -> Tuple[str, str]:
+    """
+    Work out how to append the markdown of one page range to the previous one.
+
+    A table cut by a shard boundary is re-exported by Docling as a new table.
+    When the new page repeats the header of the table the previous shard ended
+    in, the repeated header is dropped and the rows are folded back into that
+    table. A new table of the same width with another header is a table of its
+    own and is kept apart. A section continued on the next pages may repeat its
+    heading, optionally marked "(continued)", at the top of the shard; the
+    repeated heading is dropped so the text stays in one section.
+
+    Args:
+        previous: Markdown of the previous page range
+        current: Markdown of the next page range
+
+    Returns:
+        Tuple of (separator, current markdown to append)
+    """
+    previous_lines = previous.rstrip().split("\n")
+    current_lines = current.lstrip("\n").split("\n")
+
+    columns = _table_columns(previous_lines[-1])
+    if (columns and len(current_lines) >= 2 and _table_columns(current_lines[0]) == columns
+            and _is_separator_row(current_lines[1])):
+        header = _find_table_header(previous_lines)
+        if header is not None and _normalize_row(header) == _normalize_row(current_lines[0]):
+            return "\n", "\n".join(current_lines[2:])
+
+    title = _heading_title(current_lines[0])
+    if title is not None:
+        previous_title = next(
+            (_heading_title(line) for line in reversed(previous_lines) if _heading_title(line) is not None),
+            None,
+        )
+        if title == previous_title:
+            return "\n\n", "\n".join(current_lines[1:]).lstrip("\n")
+
+    return "\n\n", current.lstrip("\n")
+
+
+def stitch_markdown_shards(shards: Sequence[str]) -> str:
+    """
+    Join the markdown of consecutive page ranges, repairing tables cut at the boundaries.
+
+    Args:
+        shards: Markdown of each page range, in page order
+
+    Returns:
+        Markdown of the whole document
+    """
+    markdown = ""
+    for shard in shards:
+        markdown = append_markdown_shard(markdown, shard)
+    return markdown
+
+
+def append_markdown_shard(markdown: str, shard: str) -> str:
+    """
+    Append the markdown of the next page range to the markdown stitched so far.
+
+    Only the last section of the stitched markdown can change, so sections
+    before it are final.
+
+    Args:
+        markdown: Markdown of the page ranges stitched so far
+        shard: Markdown of the next page range
+
+    Returns:
+        Markdown of the page ranges including the next one
+    """
+    if not shard.strip():
+        return markdown
+    if not markdown:
+        return shard
+    separator, shard = join_markdown_shards(markdown, shard)
+    return markdown.rstrip() + separator + shard
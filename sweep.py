@@ -0,0 +1,326 @@
+"""
+Chunker x embedding model sweep for the Agentic RAG system.
+
+Builds one temporary collection per grid point of the "sweep" section of the
+configuration and reports ingest time, index size, retrieval latency and
+recall for each. Documents are parsed once (through the parser cache), each
+chunker configuration chunks them once for every embedding model, and texts
+already embedded by a model come from the embedding cache. Grid points are
+built and evaluated in parallel threads.
+
+Recall needs no labelled data: queries are sentences sampled from the parsed
+documents, and a query is a hit when one of the top_k retrieved chunks of its
+plan holds at least half of the sentence, so sentences split across a chunk
+boundary can still be hit by either side.
+
+Usage:
+    python sweep.py documents
+    python sweep.py documents --chunkers hierarchical layout --embed-models BAAI/bge-small-en-v1.5
+"""
+
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import logging
+import tempfile
+import statistics
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Tuple
+
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from core.component_registry import register_all_components
+from dotenv import load_dotenv
+load_dotenv("./.env")
+
+from llama_index.core.schema import BaseNode, Document
+from core.config.base_config import ConfigManager
+from core.factories.parser_factory import ParserFactory
+from core.factories.chunker_factory import ChunkerFactory
+from core.factories.vector_store_factory import VectorStoreFactory
+from benchmarks.common import print_table
+from ingest import discover_documents
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_SWEEP = {
+    "chunkers": [],
+    "embed_models": [],
+    "vector_store": None,
+    "queries_per_document": 25,
+    "top_k": 5,
+    "workers": 2,
+}
+
+_SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
+
+def load_sweep_config(config_path: str) -> Dict[str, Any]:
+    """
+    Load the "sweep" section of the configuration file.
+
+    Chunker entries are either a chunker name from the configuration or a
+    {"name", "label", "config"} object whose config overrides that chunker's.
+
+    Args:
+        config_path: Path to configuration file
+
+    Returns:
+        Sweep settings with defaults filled in
+    """
+    with open(config_path, 'r') as f:
+        data = json.load(f)
+    return {**DEFAULT_SWEEP, **data.get("sweep", {})}
+
+
+def resolve_chunkers(entries: List[Any], chunker_config) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """
+    Resolve sweep chunker entries to (label, class name, config) tuples.
+
+    Args:
+        entries: Chunker names or {"name", "label", "config"} objects
+        chunker_config: Chunker section of the configuration
+
+    Returns:
+        List of (label, chunker class name, chunker config)
+    """
+    resolved = []
+    for entry in entries or [chunker_config.default]:
+        if isinstance(entry, str):
+            entry = {"name": entry}
+        name = entry["name"]
+        if name not in chunker_config.available:
+            raise ValueError(f"Chunker '{name}' not found in configuration")
+        info = chunker_config.available[name]
+        config = {**info.get("config", {}), **entry.get("config", {})}
+        resolved.append((entry.get("label", name), info["class"], config))
+    return resolved
+
+
+def normalize(text: str) -> str:
+    """Lowercase and collapse whitespace so chunk boundaries and joins do not matter."""
+    return " ".join(text.lower().split())
+
+
+def is_hit(expected: str, content: str, min_share: float = 0.5) -> bool:
+    """
+    Check if a retrieved chunk holds enough of a query sentence.
+
+    A sentence that crosses a chunk boundary is cut into a chunk suffix and the
+    next chunk's prefix, so requiring the whole sentence would never count it.
+
+    Args:
+        expected: Normalized query sentence
+        content: Normalized chunk text
+        min_share: Smallest share of the sentence the chunk must hold
+
+    Returns:
+        True if the chunk contains the sentence, or a part of it of at least
+        min_share that the sentence starts or ends with, or lies entirely within it
+    """
+    if expected in content:
+        return True
+    min_length = max(int(len(expected) * min_share), 1)
+    if min_length <= len(content) and content in expected:
+        return True
+    return any(
+        content.endswith(expected[:length]) or content.startswith(expected[-length:])
+        for length in range(min_length, len(expected))
+    )
+
+
+def sample_queries(documents: List[Document], per_document: int, seed: int = 0) -> List[Dict[str, str]]:
+    """
+    Sample sentences of the documents to use as queries.
+
+    Args:
+        documents: Parsed documents
+        per_document: Number of queries per document
+        seed: Random seed, so every grid point gets the same queries
+
+    Returns:
+        List of {"query", "plan_name"} dicts
+    """
+    generator = random.Random(seed)
+    queries = []
+    for document in documents:
+        sentences = [
+            sentence.strip()
+            for sentence in _SENTENCE_PATTERN.split(document.text)
+            # Skip headings, table rows and fragments
+            if 80 <= len(sentence.strip()) <= 300 and "|" not in sentence and "#" not in sentence
+        ]
+        for sentence in generator.sample(sentences, min(per_document, len(sentences))):
+            queries.append({"query": sentence, "plan_name": document.metadata.get("plan_name")})
+    return queries
+
+
+def chunk_documents(documents: List[Document], chunkers) -> Dict[str, Tuple[List[BaseNode], float]]:
+    """
+    Chunk the documents once per chunker configuration.
+
+    Args:
+        documents: Parsed documents
+        chunkers: List of (label, chunker class name, chunker config)
+
+    Returns:
+        Mapping of label to (nodes, chunking seconds)
+    """
+    chunked = {}
+    for label, class_name, config in chunkers:
+        chunker = ChunkerFactory.create_chunker(class_name, config)
+        start = time.perf_counter()
+        nodes = chunker.chunk_parallel(documents)
+        chunked[label] = (nodes, time.perf_counter() - start)
+        chunker.close()
+        logger.info(f"Chunked with {label}: {len(nodes)} nodes in {chunked[label][1]:.1f}s")
+    return chunked
+
+
+def run_grid_point(label: str, nodes: List[BaseNode], chunk_seconds: float, embed_model: str,
+                   store_class: str, store_config: Dict[str, Any], queries: List[Dict[str, str]],
+                   top_k: int, work_dir: str, keep: bool) -> Dict[str, Any]:
+    """
+    Build one temporary collection and evaluate retrieval on it.
+
+    Args:
+        label: Chunker label
+        nodes: Chunked nodes, copied before they are embedded
+        chunk_seconds: Time the chunker took
+        embed_model: Embedding model name
+        store_class: Vector store class name
+        store_config: Vector store configuration
+        queries: Sampled queries
+        top_k: Number of results per query
+        work_dir: Directory for the collection's local files
+        keep: Keep the collection after the sweep
+
+    Returns:
+        Result row as a dictionary
+    """
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", f"{label}_{embed_model}").strip("_").lower()
+    local_dir = Path(work_dir) / slug
+    vector_store = VectorStoreFactory.create_vector_store(store_class, {
+        **store_config,
+        "collection_name": f"sweep_{slug}",
+        "embed_model_name": embed_model,
+        "dedup_index_dir": str(local_dir / "dedup"),
+        "docstore_dir": str(local_dir / "docstore"),
+        "manifest_dir": str(local_dir / "manifest"),
+    })
+
+    try:
+        vector_store.clear_collection()
+        start = time.perf_counter()
+        vector_store.add([node.model_copy(deep=True) for node in nodes])
+        index_seconds = time.perf_counter() - start
+        info = vector_store.get_collection_info()
+
+        latencies = []
+        hits = 0
+        for query in queries:
+            start = time.perf_counter()
+            results = vector_store.search(query["query"], top_k=top_k, plan_name=query["plan_name"])
+            latencies.append((time.perf_counter() - start) * 1000)
+            expected = normalize(query["query"])
+            hits += any(is_hit(expected, normalize(result.node.get_content())) for result in results)
+
+        points = info.get("points_count") or 0
+        dim = info.get("embedding_dim") or 0
+        return {
+            "chunker": label,
+            "embed_model": embed_model,
+            "nodes": len(nodes),
+            "points": points,
+            "chunk_seconds": chunk_seconds,
+            "index_seconds": index_seconds,
+            "vector_mb": points * dim * 4 / 1e6,
+            "latency_ms_mean": statistics.mean(latencies) if latencies else 0.0,
+            "latency_ms_p95": sorted(latencies)[int(len(latencies) * 0.95)] if latencies else 0.0,
+            f"recall_at_{top_k}": hits / len(queries) if queries else 0.0,
+        }
+    finally:
+        if not keep:
+            vector_store.drop_collection()
+
+
+def main() -> int:
+    """Sweep entry point."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", nargs="?", default="documents", help="Directory of documents")
+    parser.add_argument("--pattern", default="**/*", help="Glob pattern relative to the directory")
+    parser.add_argument("--config", default="config.json", help="Path to configuration file")
+    parser.add_argument("--chunkers", nargs="+", help="Chunker names, overrides the sweep configuration")
+    parser.add_argument("--embed-models", nargs="+", help="Embedding models, overrides the sweep configuration")
+    parser.add_argument("--workers", type=int, help="Grid points built in parallel")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--keep", action="store_true", help="Keep the temporary collections")
+    args = parser.parse_args()
+
+    try:
+        config = ConfigManager(args.config).load_config()
+        sweep = load_sweep_config(args.config)
+        chunkers = resolve_chunkers(args.chunkers or sweep["chunkers"], config.chunkers)
+
+        store_name = sweep["vector_store"] or config.vector_stores.default
+        store_info = config.vector_stores.available[store_name]
+        store_config = store_info.get("config", {})
+        embed_models = args.embed_models or sweep["embed_models"] or [store_config["embed_model_name"]]
+
+        document_parser = ParserFactory.create_from_config(config.parsers)
+    except Exception as e:
+        logger.error(f"Error initializing sweep: {e}")
+        return 1
+
+    try:
+        file_paths = discover_documents(args.directory, args.pattern, document_parser.get_supported_formats())
+        documents = [document for file_path in file_paths for document in document_parser.parse(file_path)]
+    finally:
+        # Documents are only parsed once, so the converter pool is not needed past this point
+        document_parser.close()
+    queries = sample_queries(documents, sweep["queries_per_document"])
+    logger.info(f"Parsed {len(documents)} documents, sampled {len(queries)} queries")
+
+    chunked = chunk_documents(documents, chunkers)
+    top_k = sweep["top_k"]
+
+    with tempfile.TemporaryDirectory(prefix="sweep_") as work_dir:
+        with ThreadPoolExecutor(max_workers=args.workers or sweep["workers"]) as executor:
+            futures = [
+                executor.submit(
+                    run_grid_point, label, *chunked[label], embed_model, store_info["class"],
+                    store_config, queries, top_k, work_dir, args.keep,
+                )
+                for label, _, _ in chunkers
+                for embed_model in embed_models
+            ]
+            results = []
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    logger.error(f"Grid point failed: {e}")
+
+    if not results:
+        return 1
+
+    headers = list(results[0].keys())
+    print_table(headers, [[result[header] for header in headers] for result in results])
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0 if len(results) == len(futures) else 1
+
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
@@ -2,149 +2,564 @@
 Cache utility for storing and retrieving parsed documents.
 """
 import os
+import re
 import json
+import mmap
+import time
+import zlib
+import sqlite3
 import hashlib
-from typing import List, Dict, Any, Optional
+import threading
+from typing import List, Dict, Any, Iterator, Optional
 from pathlib import Path
 from llama_index.core.schema import Document
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# File suffix for each cache storage format
+STORAGE_SUFFIXES = {
+    "none": ".md",
+    "zlib": ".md.zlib",
+    "zstd": ".md.zst",
+}
+
+# Markdown sections start at ATX headings
+_SECTION_PATTERN = re.compile(r"^(?=#{1,6} )", re.MULTILINE)
+
+
+def hash_file(file_path: str, block_size: int = 1 << 20) -> str:
+    """
+    Hash the contents of a file.
+    
+    Args:
+        file_path: Path to the file
+        block_size: Number of bytes read at a time
+    
+    Returns:
+        SHA-256 hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def split_markdown_sections(markdown: str) -> List[str]:
+    """
+    Split markdown into sections that start at headings.
+    
+    Joining the sections reproduces the original markdown exactly.
+    
+    Args:
+        markdown: Markdown content
+    
+    Returns:
+        List of sections
+    """
+    return [section for section in _SECTION_PATTERN.split(markdown) if section]
+
+
+def _compress(data: bytes, storage_format: str) -> bytes:
+    """Compress one frame in the given storage format."""
+    if storage_format == "zlib":
+        return zlib.compress(data, 6)
+    if storage_format == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return data
+
+
+def _decompress(data: memoryview, storage_format: str) -> bytes:
+    """Decompress one frame stored in the given storage format."""
+    if storage_format == "zlib":
+        return zlib.decompress(data)
+    if storage_format == "zstd":
+        return zstandard.ZstdDecompressor().decompress(data)
+    return bytes(data)
+
+
+class CachedMarkdown:
+    """
+    Memory-mapped view of a cached markdown document.
+    
+    The document is stored as one frame per markdown section. Sections are read and
+    decompressed on demand, so a chunker can walk a large document without holding
+    the whole text in memory.
+    """
+    
+    def __init__(self, path: Path, storage_format: str, frames: List[List[Any]]):
+        """
+        Open a cached markdown document.
+        
+        Args:
+            path: Path to the cache file
+            storage_format: Storage format of the file ("none", "zlib" or "zstd")
+            frames: Frame index as [offset, length, raw_length, title] entries
+        """
+        self.path = path
+        self.storage_format = storage_format
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        
+        # Entries cached before framing was introduced are one plain frame
+        if not frames and size:
+            frames = [[0, size, size, ""]]
+        self.frames = frames
+    
+    def __len__(self) -> int:
+        return len(self.frames)
+    
+    def __enter__(self) -> "CachedMarkdown":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def section_titles(self) -> List[str]:
+        """Get the heading of each section."""
+        return [frame[3] for frame in self.frames]
+    
+    def section(self, index: int) -> str:
+        """
+        Read a single section.
+        
+        Args:
+            index: Section index
+        
+        Returns:
+            Section markdown
+        """
+        offset, length, _, _ = self.frames[index]
+        data = memoryview(self._mmap)[offset:offset + length]
+        try:
+            return _decompress(data, self.storage_format).decode('utf-8')
+        finally:
+            data.release()
+    
+    def sections(self) -> Iterator[str]:
+        """Iterate over sections lazily."""
+        for index in range(len(self.frames)):
+            yield self.section(index)
+    
+    def read(self) -> str:
+        """Read the whole document."""
+        return "".join(self.sections())
+    
+    def close(self) -> None:
+        """Release the memory map and file handle."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+
+_MANIFEST_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    cache_key TEXT PRIMARY KEY,
+    parser_name TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    options TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    cached_at REAL NOT NULL,
+    last_accessed REAL NOT NULL,
+    content_length INTEGER NOT NULL,
+    cache_size INTEGER NOT NULL,
+    additional_metadata TEXT NOT NULL,
+    storage_format TEXT NOT NULL DEFAULT 'none',
+    frames TEXT NOT NULL DEFAULT '[]'
+);
+CREATE INDEX IF NOT EXISTS entries_parser ON entries (parser_name, content_hash);
+CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_accessed);
+CREATE TABLE IF NOT EXISTS file_hashes (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    content_hash TEXT NOT NULL
+);
+"""
+
 
 class ParserCache:
-    """Cache utility for parser responses."""
+    """
+    Cache utility for parser responses.
     
-    def __init__(self, cache_dir: str = "cache"):
+    Markdown is stored as one file per entry under `documents/`, framed per
+    section and optionally compressed. All metadata, including each entry's frame
+    index, lives in a single SQLite manifest, which also remembers the content hash
+    of each source path so unchanged files are not re-hashed across runs.
+    """
+    
+    def __init__(self, cache_dir: str = "cache", max_cache_bytes: Optional[int] = None,
+                 compression: str = "none"):
         """
         Initialize parser cache.
         
         Args:
             cache_dir: Directory to store cache files
+            max_cache_bytes: Maximum total size of cached markdown, unbounded if None
+            compression: Storage format for new entries ("none", "zlib" or "zstd")
         """
+        if compression not in STORAGE_SUFFIXES:
+            raise ValueError(f"Unknown cache compression: {compression}")
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("zstd cache compression requires the zstandard package")
+        
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
+        self.max_cache_bytes = max_cache_bytes
+        self.compression = compression
         
-        # Create subdirectories for different cache types
+        # Create subdirectory for cached documents
         self.documents_cache_dir = self.cache_dir / "documents"
         self.documents_cache_dir.mkdir(exist_ok=True)
         
-        self.metadata_cache_dir = self.cache_dir / "metadata"
-        self.metadata_cache_dir.mkdir(exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            str(self.cache_dir / "manifest.sqlite"),
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_MANIFEST_SCHEMA)
+        self._migrate_manifest()
+    
+    def _migrate_manifest(self) -> None:
+        """Add columns introduced after a manifest was created."""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(entries)")}
+        if "storage_format" not in columns:
+            self._conn.execute("ALTER TABLE entries ADD COLUMN storage_format TEXT NOT NULL DEFAULT 'none'")
+        if "frames" not in columns:
+            self._conn.execute("ALTER TABLE entries ADD COLUMN frames TEXT NOT NULL DEFAULT '[]'")
     
     def _get_file_hash(self, file_path: str) -> str:
         """
-        Generate a hash for the file based on path and modification time.
+        Generate a hash for the file based on its contents.
+        
+        Identical files share a hash regardless of their path or modification time.
+        The hash is remembered per (path, mtime, size) in the manifest.
         
         Args:
             file_path: Path to the file
-            
+        
         Returns:
             Hash string for the file
         """
         file_path = Path(file_path).resolve()
         stat = file_path.stat()
         
-        # Create hash from file path and modification time
-        hash_input = f"{file_path}_{stat.st_mtime}_{stat.st_size}"
-        return hashlib.md5(hash_input.encode()).hexdigest()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash FROM file_hashes WHERE path = ? AND mtime_ns = ? AND size = ?",
+                (str(file_path), stat.st_mtime_ns, stat.st_size)
+            ).fetchone()
+        if row is not None:
+            return row[0]
+        
+        content_hash = hash_file(str(file_path))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO file_hashes (path, mtime_ns, size, content_hash) VALUES (?, ?, ?, ?)",
+                (str(file_path), stat.st_mtime_ns, stat.st_size, content_hash)
+            )
+        return content_hash
     
-    def _get_cache_path(self, file_path: str, parser_name: str) -> tuple[Path, Path]:
+    def _get_options_hash(self, options: Optional[Dict[str, Any]]) -> str:
         """
-        Get cache file paths for a given file and parser.
+        Generate a hash for the parse options that affect the parser output.
+        
+        Args:
+            options: Parse options such as OCR and table structure settings
+        
+        Returns:
+            Hash string for the options
+        """
+        return hashlib.sha256(self._serialize_options(options).encode()).hexdigest()[:16]
+    
+    def _serialize_options(self, options: Optional[Dict[str, Any]]) -> str:
+        """Serialize parse options deterministically."""
+        return json.dumps(options or {}, sort_keys=True, default=str)
+    
+    def _get_cache_key(self, file_path: str, parser_name: str,
+                       options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Get the cache key for a given file, parser and parse options.
         
         Args:
             file_path: Path to the original file
             parser_name: Name of the parser
-            
+            options: Parse options that affect the parser output
+        
         Returns:
-            Tuple of (markdown_cache_path, metadata_cache_path)
+            Cache key
         """
         file_hash = self._get_file_hash(file_path)
-        cache_filename = f"{parser_name}_{file_hash}"
-        
-        markdown_path = self.documents_cache_dir / f"{cache_filename}.md"
-        metadata_path = self.metadata_cache_dir / f"{cache_filename}.json"
-        
-        return markdown_path, metadata_path
+        return f"{parser_name}_{file_hash}_{self._get_options_hash(options)}"
+    
+    def _get_markdown_path(self, cache_key: str, storage_format: str = "none") -> Path:
+        """Get the markdown file path for a cache key and storage format."""
+        return self.documents_cache_dir / f"{cache_key}{STORAGE_SUFFIXES[storage_format]}"
     
-    def is_cached(self, file_path: str, parser_name: str) -> bool:
+    def _get_entry(self, cache_key: str) -> Optional[tuple]:
+        """Get the (storage_format, frames) manifest row for a cache key."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT storage_format, frames FROM entries WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+    
+    def is_cached(self, file_path: str, parser_name: str,
+                  options: Optional[Dict[str, Any]] = None) -> bool:
         """
         Check if a file is already cached.
         
         Args:
             file_path: Path to the file
             parser_name: Name of the parser
-            
+            options: Parse options that affect the parser output
+        
         Returns:
             True if cached, False otherwise
         """
         if not os.path.exists(file_path):
             return False
-            
-        documents_path, metadata_path = self._get_cache_path(file_path, parser_name)
         
-        # Check if both cache files exist
-        return documents_path.exists() and metadata_path.exists()
+        cache_key = self._get_cache_key(file_path, parser_name, options)
+        return self._get_entry(cache_key) is not None
     
-    def get_cached_markdown(self, file_path: str, parser_name: str) -> Optional[str]:
+    def get_cached_markdown(self, file_path: str, parser_name: str,
+                            options: Optional[Dict[str, Any]] = None) -> Optional[str]:
         """
         Retrieve cached markdown content.
         
         Args:
             file_path: Path to the file
             parser_name: Name of the parser
-            
+            options: Parse options that affect the parser output
+        
         Returns:
             Cached markdown content or None if not cached
         """
-        if not self.is_cached(file_path, parser_name):
-            return None
-        
         try:
-            markdown_path, _ = self._get_cache_path(file_path, parser_name)
-            
-            with open(markdown_path, 'r', encoding='utf-8') as f:
-                markdown_content = f.read()
+            cached_markdown = self.open_cached_markdown(file_path, parser_name, options)
+            if cached_markdown is None:
+                return None
             
-            return markdown_content
+            with cached_markdown:
+                return cached_markdown.read()
         except Exception as e:
             print(f"Error loading cached markdown: {e}")
             return None
     
-    def cache_markdown(self, file_path: str, parser_name: str, markdown_content: str, 
-                       metadata: Dict[str, Any] = None) -> bool:
+    def open_cached_markdown(self, file_path: str, parser_name: str,
+                             options: Optional[Dict[str, Any]] = None) -> Optional[CachedMarkdown]:
+        """
+        Open cached markdown for lazy, memory-mapped reads.
+        
+        The caller is responsible for closing the returned document.
+        
+        Args:
+            file_path: Path to the file
+            parser_name: Name of the parser
+            options: Parse options that affect the parser output
+        
+        Returns:
+            Cached markdown document or None if not cached
+        """
+        if not os.path.exists(file_path):
+            return None
+        
+        cache_key = self._get_cache_key(file_path, parser_name, options)
+        entry = self._get_entry(cache_key)
+        if entry is None:
+            return None
+        
+        storage_format, frames = entry
+        try:
+            cached_markdown = CachedMarkdown(
+                self._get_markdown_path(cache_key, storage_format), storage_format, json.loads(frames)
+            )
+        except FileNotFoundError:
+            # Markdown removed outside the cache, drop the stale entry
+            self._delete_entries([cache_key])
+            return None
+        
+        self._touch(cache_key)
+        
+        return cached_markdown
+    
+    def get_cached_metadata(self, file_path: str, parser_name: str,
+                            options: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve the additional metadata stored with cached markdown.
+        
+        Args:
+            file_path: Path to the file
+            parser_name: Name of the parser
+            options: Parse options that affect the parser output
+        
+        Returns:
+            Metadata passed to cache_markdown(), or None if not cached
+        """
+        if not os.path.exists(file_path):
+            return None
+        
+        cache_key = self._get_cache_key(file_path, parser_name, options)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT additional_metadata FROM entries WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def _touch(self, cache_key: str) -> None:
+        """Record an access to a cache entry."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE entries SET last_accessed = ? WHERE cache_key = ?", (time.time(), cache_key)
+            )
+    
+    def cache_markdown(self, file_path: str, parser_name: str, markdown_content: str,
+                       metadata: Dict[str, Any] = None,
+                       options: Optional[Dict[str, Any]] = None) -> bool:
         """
         Cache markdown content.
         
+        The markdown is written as one frame per section in the configured storage
+        format. The file is written to a temporary path and renamed into place
+        before its manifest entry is committed, so a crash never leaves an entry
+        pointing at a partial file.
+        
         Args:
             file_path: Path to the file
             parser_name: Name of the parser
             markdown_content: Markdown content to cache
             metadata: Additional metadata to cache
-            
+            options: Parse options that affect the parser output
+        
         Returns:
             True if successfully cached, False otherwise
         """
         try:
-            markdown_path, metadata_path = self._get_cache_path(file_path, parser_name)
+            content_hash = self._get_file_hash(file_path)
+            cache_key = f"{parser_name}_{content_hash}_{self._get_options_hash(options)}"
+            markdown_path = self._get_markdown_path(cache_key, self.compression)
             
-            with open(markdown_path, 'w', encoding='utf-8') as f:
-                f.write(markdown_content)
+            frames = []
+            offset = 0
+            temp_path = markdown_path.with_name(f"{markdown_path.name}.tmp")
+            with open(temp_path, 'wb') as f:
+                for section in split_markdown_sections(markdown_content):
+                    raw = section.encode('utf-8')
+                    data = _compress(raw, self.compression)
+                    f.write(data)
+                    title = section.split("\n", 1)[0].lstrip("#").strip()
+                    frames.append([offset, len(data), len(raw), title])
+                    offset += len(data)
             
-            cache_metadata = {
-                "file_path": file_path,
-                "parser_name": parser_name,
-                "cached_at": str(Path(file_path).stat().st_mtime),
-                "content_length": len(markdown_content),
-                "additional_metadata": metadata or {}
-            }
+            # Drop any copy stored in another format before switching
+            existing = self._get_entry(cache_key)
+            if existing is not None and existing[0] != self.compression:
+                self._get_markdown_path(cache_key, existing[0]).unlink(missing_ok=True)
+            os.replace(temp_path, markdown_path)
             
-            with open(metadata_path, 'w') as f:
-                json.dump(cache_metadata, f, indent=2)
+            now = time.time()
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries (cache_key, parser_name, content_hash, options, "
+                    "file_path, cached_at, last_accessed, content_length, cache_size, additional_metadata, "
+                    "storage_format, frames) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        cache_key,
+                        parser_name,
+                        content_hash,
+                        self._serialize_options(options),
+                        file_path,
+                        now,
+                        now,
+                        len(markdown_content),
+                        markdown_path.stat().st_size,
+                        json.dumps(metadata or {}, default=str),
+                        self.compression,
+                        json.dumps(frames),
+                    )
+                )
+            
+            self._enforce_budget(keep=cache_key)
             
             return True
         except Exception as e:
             print(f"Error caching markdown: {e}")
             return False
     
+    def _delete_entries(self, cache_keys: List[str]) -> None:
+        """Delete manifest entries and their markdown files."""
+        with self._lock:
+            storage_formats = {
+                cache_key: (self._get_entry(cache_key) or ("none",))[0] for cache_key in cache_keys
+            }
+            self._conn.executemany(
+                "DELETE FROM entries WHERE cache_key = ?", [(cache_key,) for cache_key in cache_keys]
+            )
+        for cache_key, storage_format in storage_formats.items():
+            self._get_markdown_path(cache_key, storage_format).unlink(missing_ok=True)
+    
+    def _enforce_budget(self, keep: Optional[str] = None) -> None:
+        """
+        Evict least recently accessed entries until the cache fits its byte budget.
+        
+        Args:
+            keep: Cache key that must not be evicted
+        """
+        if self.max_cache_bytes is None:
+            return
+        
+        with self._lock:
+            (total_size,) = self._conn.execute(
+                "SELECT COALESCE(SUM(cache_size), 0) FROM entries"
+            ).fetchone()
+            if total_size <= self.max_cache_bytes:
+                return
+            
+            evicted = []
+            for cache_key, cache_size in self._conn.execute(
+                "SELECT cache_key, cache_size FROM entries ORDER BY last_accessed"
+            ).fetchall():
+                if total_size <= self.max_cache_bytes:
+                    break
+                if cache_key == keep:
+                    continue
+                evicted.append(cache_key)
+                total_size -= cache_size
+            
+            self._delete_entries(evicted)
+    
+    def sweep_orphans(self) -> int:
+        """
+        Delete markdown files that have no manifest entry.
+        
+        These are left behind by a crash between writing a file and committing its
+        entry, or by older cache layouts.
+        
+        Returns:
+            Number of files deleted
+        """
+        with self._lock:
+            known = {
+                cache_key for (cache_key,) in self._conn.execute("SELECT cache_key FROM entries")
+            }
+        
+        deleted = 0
+        for path in self.documents_cache_dir.iterdir():
+            cache_key = path.name.split(".", 1)[0]
+            if cache_key not in known:
+                path.unlink(missing_ok=True)
+                deleted += 1
+        return deleted
+    
     def clear_cache(self, file_path: str = None, parser_name: str = None) -> bool:
         """
         Clear cache for specific file/parser or entire cache.
@@ -152,63 +567,85 @@ class ParserCache:
         Args:
             file_path: Specific file to clear cache for (optional)
             parser_name: Specific parser to clear cache for (optional)
-            
+        
         Returns:
             True if successfully cleared, False otherwise
         """
         try:
             if file_path and parser_name:
-                # Clear specific file/parser cache
-                documents_path, metadata_path = self._get_cache_path(file_path, parser_name)
-                
-                if documents_path.exists():
-                    documents_path.unlink()
-                if metadata_path.exists():
-                    metadata_path.unlink()
+                # Clear specific file/parser cache for every set of parse options
+                with self._lock:
+                    cache_keys = [
+                        cache_key for (cache_key,) in self._conn.execute(
+                            "SELECT cache_key FROM entries WHERE parser_name = ? AND content_hash = ?",
+                            (parser_name, self._get_file_hash(file_path))
+                        )
+                    ]
+                self._delete_entries(cache_keys)
             else:
                 # Clear entire cache
-                import shutil
-                if self.cache_dir.exists():
-                    shutil.rmtree(self.cache_dir)
-                    self.cache_dir.mkdir(exist_ok=True)
-                    self.documents_cache_dir.mkdir(exist_ok=True)
-                    self.metadata_cache_dir.mkdir(exist_ok=True)
+                with self._lock:
+                    self._conn.execute("DELETE FROM entries")
+                    self._conn.execute("DELETE FROM file_hashes")
+                self.sweep_orphans()
             
             return True
         except Exception as e:
             print(f"Error clearing cache: {e}")
             return False
     
-    def get_cache_info(self) -> Dict[str, Any]:
+    def get_cache_info(self, parser_name: str = None) -> Dict[str, Any]:
         """
         Get information about cached files.
         
+        Args:
+            parser_name: Only list files cached by this parser (optional)
+        
         Returns:
             Dictionary with cache information
         """
         cache_info = {
             "cache_dir": str(self.cache_dir),
+            "max_cache_bytes": self.max_cache_bytes,
+            "compression": self.compression,
             "cached_files": [],
-            "total_size": 0
+            "total_size": 0,
+            "total_raw_size": 0
         }
         
         try:
-            for markdown_file in self.documents_cache_dir.glob("*.md"):
-                metadata_file = self.metadata_cache_dir / f"{markdown_file.stem}.json"
-                
-                if metadata_file.exists():
-                    with open(metadata_file, 'r') as f:
-                        metadata = json.load(f)
-                    
-                    file_size = markdown_file.stat().st_size
-                    cache_info["cached_files"].append({
-                        "file_path": metadata.get("file_path"),
-                        "parser_name": metadata.get("parser_name"),
-                        "cached_at": metadata.get("cached_at"),
-                        "content_length": metadata.get("content_length"),
-                        "cache_size": file_size
-                    })
-                    cache_info["total_size"] += file_size
+            query = (
+                "SELECT file_path, parser_name, content_hash, options, cached_at, "
+                "last_accessed, content_length, cache_size, storage_format, frames FROM entries"
+            )
+            params: tuple = ()
+            if parser_name:
+                query += " WHERE parser_name = ?"
+                params = (parser_name,)
+            
+            with self._lock:
+                rows = self._conn.execute(query, params).fetchall()
+            
+            for (entry_path, entry_parser, content_hash, options, cached_at,
+                 last_accessed, content_length, cache_size, storage_format, frames) in rows:
+                raw_size = sum(frame[2] for frame in json.loads(frames)) or cache_size
+                cache_info["cached_files"].append({
+                    "file_path": entry_path,
+                    "parser_name": entry_parser,
+                    "content_hash": content_hash,
+                    "options": json.loads(options),
+                    "cached_at": cached_at,
+                    "last_accessed": last_accessed,
+                    "content_length": content_length,
+                    "cache_size": cache_size,
+                    "storage_format": storage_format,
+                    "compression_ratio": raw_size / cache_size if cache_size else None
+                })
+                cache_info["total_size"] += cache_size
+                cache_info["total_raw_size"] += raw_size
+            
+            if cache_info["total_size"]:
+                cache_info["compression_ratio"] = cache_info["total_raw_size"] / cache_info["total_size"]
         except Exception as e:
             print(f"Error getting cache info: {e}")
         
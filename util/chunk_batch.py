@@ -0,0 +1,248 @@
+"""
+Compact array-backed chunk batches used between chunking and the vector store.
+"""
+from typing import List, Dict, Any, Iterator, Optional, Sequence, Tuple, Union
+import numpy as np
+from llama_index.core.schema import BaseNode, TextNode, NodeRelationship, RelatedNodeInfo
+
+# Relationship values are compact node IDs: one for single relationships, a list for children
+RelatedIds = Union[str, List[str]]
+
+
+def _get_related_ids(node: BaseNode) -> Dict[str, RelatedIds]:
+    """Get the relationships of a node as plain node IDs keyed by relationship value."""
+    relationships: Dict[str, RelatedIds] = {}
+    for relationship, related in node.relationships.items():
+        if isinstance(related, list):
+            relationships[relationship.value] = [info.node_id for info in related]
+        else:
+            relationships[relationship.value] = related.node_id
+    return relationships
+
+
+def _get_related_info(relationships: Dict[str, RelatedIds]) -> Dict[NodeRelationship, Any]:
+    """Turn plain related node IDs back into RelatedNodeInfo objects."""
+    related_info = {}
+    for key, related in relationships.items():
+        relationship = NodeRelationship(key)
+        if isinstance(related, list):
+            related_info[relationship] = [RelatedNodeInfo(node_id=node_id) for node_id in related]
+        else:
+            related_info[relationship] = RelatedNodeInfo(node_id=related)
+    return related_info
+
+
+class ChunkRecord:
+    """
+    One chunk of a batch: its ID, text, metadata and related node IDs.
+    
+    Holds the fields the vector store writes and nothing else. Relationships
+    are kept as plain node IDs rather than RelatedNodeInfo objects, and the
+    embedding lives in the batch matrix rather than on the record.
+    """
+    
+    __slots__ = (
+        "node_id",
+        "text",
+        "metadata",
+        "relationships",
+        "start_char_idx",
+        "end_char_idx",
+        "excluded_embed_metadata_keys",
+        "excluded_llm_metadata_keys",
+    )
+    
+    def __init__(self, node_id: str, text: str, metadata: Dict[str, Any],
+                 relationships: Dict[str, RelatedIds], start_char_idx: Optional[int] = None,
+                 end_char_idx: Optional[int] = None,
+                 excluded_embed_metadata_keys: Tuple[str, ...] = (),
+                 excluded_llm_metadata_keys: Tuple[str, ...] = ()):
+        """
+        Initialize a chunk record.
+        
+        Args:
+            node_id: Node ID
+            text: Chunk text
+            metadata: Chunk metadata
+            relationships: Mapping of NodeRelationship value to related node ID(s)
+            start_char_idx: Start offset of the chunk in its document
+            end_char_idx: End offset of the chunk in its document
+            excluded_embed_metadata_keys: Metadata keys left out of embeddings
+            excluded_llm_metadata_keys: Metadata keys left out of LLM context
+        """
+        self.node_id = node_id
+        self.text = text
+        self.metadata = metadata
+        self.relationships = relationships
+        self.start_char_idx = start_char_idx
+        self.end_char_idx = end_char_idx
+        self.excluded_embed_metadata_keys = excluded_embed_metadata_keys
+        self.excluded_llm_metadata_keys = excluded_llm_metadata_keys
+    
+    def get_content(self) -> str:
+        """Get the chunk text, as BaseNode.get_content() does without metadata."""
+        return self.text
+    
+    def remap_relationships(self, aliases: Dict[str, str]) -> None:
+        """
+        Point relationships at replaced nodes to their replacements.
+        
+        Args:
+            aliases: Mapping of replaced node ID to replacement node ID
+        """
+        for key, related in self.relationships.items():
+            if isinstance(related, list):
+                self.relationships[key] = [aliases.get(node_id, node_id) for node_id in related]
+            else:
+                self.relationships[key] = aliases.get(related, related)
+
+
+class ChunkBatch:
+    """
+    Batch of chunk records with one contiguous float32 embedding matrix.
+    
+    Row i of `embeddings` belongs to record i, and `has_embedding[i]` tells
+    whether it was filled. Batches are converted to TextNodes only where an
+    API needs them, e.g. the final write to the vector store.
+    """
+    
+    def __init__(self, records: List[ChunkRecord], embeddings: Optional[np.ndarray] = None,
+                 has_embedding: Optional[np.ndarray] = None):
+        """
+        Initialize a chunk batch.
+        
+        Args:
+            records: Chunk records
+            embeddings: Embedding matrix with one row per record, None if nothing is embedded
+            has_embedding: Boolean mask of the rows that hold an embedding
+        """
+        self.records = records
+        self.embeddings = embeddings
+        if has_embedding is None:
+            has_embedding = np.zeros(len(records), dtype=bool)
+        self.has_embedding = has_embedding
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    def __iter__(self) -> Iterator[ChunkRecord]:
+        return iter(self.records)
+    
+    @classmethod
+    def from_nodes(cls, nodes: Sequence[BaseNode]) -> "ChunkBatch":
+        """
+        Build a batch from llama_index nodes.
+        
+        Embeddings already on the nodes (e.g. pooled by the semantic chunker) are
+        copied into the matrix.
+        
+        Args:
+            nodes: Chunked nodes
+        
+        Returns:
+            Chunk batch
+        """
+        # Chunks of one document share the same excluded key lists
+        interned: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+        records = []
+        for node in nodes:
+            embed_keys = tuple(node.excluded_embed_metadata_keys)
+            llm_keys = tuple(node.excluded_llm_metadata_keys)
+            records.append(ChunkRecord(
+                node_id=node.node_id,
+                text=node.get_content(),
+                metadata=dict(node.metadata),
+                relationships=_get_related_ids(node),
+                start_char_idx=getattr(node, "start_char_idx", None),
+                end_char_idx=getattr(node, "end_char_idx", None),
+                excluded_embed_metadata_keys=interned.setdefault(embed_keys, embed_keys),
+                excluded_llm_metadata_keys=interned.setdefault(llm_keys, llm_keys),
+            ))
+        
+        batch = cls(records)
+        rows = [index for index, node in enumerate(nodes) if node.embedding is not None]
+        if rows:
+            batch.set_embeddings(rows, [nodes[index].embedding for index in rows])
+        return batch
+    
+    def set_embeddings(self, rows: Sequence[int], embeddings: Sequence[Sequence[float]]) -> None:
+        """
+        Store embeddings for some records.
+        
+        Args:
+            rows: Record indices
+            embeddings: One embedding per index
+        """
+        if not len(rows):
+            return
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        # A batch whose embeddings were all cleared can switch to another dimension
+        if self.embeddings is None or (
+            self.embeddings.shape[1] != vectors.shape[1] and not self.has_embedding.any()
+        ):
+            self.embeddings = np.zeros((len(self.records), vectors.shape[1]), dtype=np.float32)
+        elif self.embeddings.shape[1] != vectors.shape[1]:
+            raise ValueError(
+                f"Embedding dimension {vectors.shape[1]} does not match the batch's {self.embeddings.shape[1]}"
+            )
+        self.embeddings[rows] = vectors
+        self.has_embedding[rows] = True
+    
+    def clear_embeddings(self, rows: Sequence[int]) -> None:
+        """
+        Mark the embeddings of some records as missing, e.g. ones from another model.
+        
+        Args:
+            rows: Record indices
+        """
+        self.has_embedding[list(rows)] = False
+    
+    def select(self, rows: Sequence[int]) -> "ChunkBatch":
+        """
+        Get a batch with a subset of the records, in the given order.
+        
+        Args:
+            rows: Record indices
+        
+        Returns:
+            New batch sharing the records
+        """
+        rows = list(rows)
+        return ChunkBatch(
+            [self.records[row] for row in rows],
+            self.embeddings[rows] if self.embeddings is not None else None,
+            self.has_embedding[rows],
+        )
+    
+    @property
+    def dim(self) -> Optional[int]:
+        """Embedding dimension, None if nothing is embedded."""
+        return None if self.embeddings is None else self.embeddings.shape[1]
+    
+    def to_nodes(self, with_embeddings: bool = True) -> List[TextNode]:
+        """
+        Convert the batch to TextNodes, e.g. for APIs that take llama_index nodes.
+        
+        Args:
+            with_embeddings: Copy the embeddings onto the nodes
+        
+        Returns:
+            One TextNode per record, with its embedding as a list when it has one
+        """
+        nodes = []
+        for index, record in enumerate(self.records):
+            nodes.append(TextNode(
+                id_=record.node_id,
+                text=record.text,
+                metadata=record.metadata,
+                relationships=_get_related_info(record.relationships),
+                start_char_idx=record.start_char_idx,
+                end_char_idx=record.end_char_idx,
+                excluded_embed_metadata_keys=list(record.excluded_embed_metadata_keys),
+                excluded_llm_metadata_keys=list(record.excluded_llm_metadata_keys),
+                embedding=(
+                    self.embeddings[index].tolist()
+                    if with_embeddings and self.has_embedding[index] else None
+                ),
+            ))
+        return nodes
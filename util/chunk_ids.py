@@ -0,0 +1,115 @@
+"""
+Deterministic chunk IDs and content fingerprints.
+"""
+import json
+import uuid
+import hashlib
+from typing import List, Dict, Optional
+from llama_index.core.schema import BaseNode, NodeRelationship
+
+# Namespace of chunk IDs, so the same key always maps to the same UUID
+CHUNK_NAMESPACE = uuid.UUID("6f1d2c3e-8a47-5b9e-9c1d-4e2f7a6b3c58")
+
+
+def _get_depth(node: BaseNode, nodes_by_id: Dict[str, BaseNode]) -> int:
+    """Count the ancestors of a node within its chunk set."""
+    depth = 0
+    parent = node.parent_node
+    while parent is not None and parent.node_id in nodes_by_id and depth < len(nodes_by_id):
+        depth += 1
+        parent = nodes_by_id[parent.node_id].parent_node
+    return depth
+
+
+def stable_node_id(plan_name: str, section_path: str, depth: int, content_hash: str,
+                   occurrence: int = 0) -> str:
+    """
+    Derive a chunk ID from where a chunk sits and what it contains.
+    
+    Args:
+        plan_name: Name of the document the chunk comes from
+        section_path: Heading path of the chunk, empty if unknown
+        depth: Level of the chunk in a hierarchy, 0 for flat chunkers
+        content_hash: Hash of the chunk text
+        occurrence: Index among chunks sharing all the other fields
+    
+    Returns:
+        UUID string, a valid Qdrant point ID
+    """
+    key = "\x1f".join([plan_name, section_path, str(depth), content_hash, str(occurrence)])
+    return str(uuid.uuid5(CHUNK_NAMESPACE, key))
+
+
+def assign_stable_ids(nodes: List[BaseNode], metadata_key: str = "plan_name",
+                      occurrences: Optional[Dict[str, int]] = None) -> List[BaseNode]:
+    """
+    Replace the random IDs of chunked nodes with deterministic ones.
+    
+    Chunking the same text again gives the same IDs, and editing one section
+    only changes the IDs of the chunks whose text changed. Parent, child and
+    neighbour relationships between the nodes are rewritten to the new IDs.
+    
+    Args:
+        nodes: Nodes chunked from one or more documents, modified in place
+        metadata_key: Metadata key holding the document name
+        occurrences: Occurrence counts carried over from earlier nodes of the
+            same documents, updated in place; pass the same dict for every
+            batch of a stream so repeated chunks keep distinct IDs
+    
+    Returns:
+        The same nodes
+    """
+    nodes_by_id = {node.node_id: node for node in nodes}
+    new_ids: Dict[str, str] = {}
+    if occurrences is None:
+        occurrences = {}
+    
+    for node in nodes:
+        plan_name = str(node.metadata.get(metadata_key, ""))
+        section_path = str(node.metadata.get("section_path", ""))
+        depth = _get_depth(node, nodes_by_id)
+        content_hash = hashlib.sha256(node.get_content().encode('utf-8')).hexdigest()
+        
+        key = "\x1f".join([plan_name, section_path, str(depth), content_hash])
+        occurrence = occurrences.get(key, 0)
+        occurrences[key] = occurrence + 1
+        new_ids[node.node_id] = stable_node_id(plan_name, section_path, depth, content_hash, occurrence)
+    
+    for node in nodes:
+        node.id_ = new_ids[node.node_id]
+        for related in node.relationships.values():
+            for related_node in related if isinstance(related, list) else [related]:
+                if related_node.node_id in new_ids:
+                    related_node.node_id = new_ids[related_node.node_id]
+    
+    return nodes
+
+
+def node_fingerprint(node: BaseNode) -> str:
+    """
+    Fingerprint everything about a node that is written to the vector store.
+    
+    The source document relationship is left out, as parsers give every parse
+    a new document ID.
+    
+    Args:
+        node: Chunked node or chunk record
+    
+    Returns:
+        Hex digest that changes when the node's text, metadata or links change
+    """
+    relationships = {}
+    for relationship, related in node.relationships.items():
+        # Chunk records key relationships by value and hold plain node IDs
+        key = getattr(relationship, "value", relationship)
+        if key == NodeRelationship.SOURCE.value:
+            continue
+        related_nodes = related if isinstance(related, list) else [related]
+        relationships[str(key)] = [getattr(related_node, "node_id", related_node) for related_node in related_nodes]
+    
+    payload = json.dumps(
+        [node.node_id, node.get_content(), node.metadata, relationships],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
@@ -0,0 +1,107 @@
+"""
+Manifest of the chunks stored for each document, used for incremental re-ingestion.
+"""
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Any
+
+_MANIFEST_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    source TEXT NOT NULL,
+    node_id TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    PRIMARY KEY (source, node_id)
+);
+"""
+
+
+class ChunkManifest:
+    """
+    Record of which node IDs, with which fingerprints, are stored for each source.
+    
+    Comparing a fresh chunk set against the manifest tells which nodes are new
+    or changed and which ones disappeared from the document.
+    """
+    
+    def __init__(self, manifest_path: str):
+        """
+        Initialize the chunk manifest.
+        
+        Args:
+            manifest_path: SQLite file the manifest is stored in
+        """
+        self.manifest_path = Path(manifest_path)
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.manifest_path),
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_MANIFEST_SCHEMA)
+    
+    def get(self, source: str) -> Dict[str, str]:
+        """
+        Get the stored chunks of a source.
+        
+        Args:
+            source: Document name
+        
+        Returns:
+            Mapping of node ID to fingerprint
+        """
+        with self._lock:
+            return dict(self._conn.execute(
+                "SELECT node_id, fingerprint FROM chunks WHERE source = ?", (source,)
+            ))
+    
+    def replace(self, source: str, fingerprints: Dict[str, str]) -> None:
+        """
+        Replace the stored chunks of a source.
+        
+        Args:
+            source: Document name
+            fingerprints: Mapping of node ID to fingerprint of every stored chunk
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM chunks WHERE source = ?", (source,))
+                self._conn.executemany(
+                    "INSERT INTO chunks (source, node_id, fingerprint) VALUES (?, ?, ?)",
+                    [(source, node_id, fingerprint) for node_id, fingerprint in fingerprints.items()]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+    
+    def get_sources(self) -> List[Dict[str, Any]]:
+        """
+        Get every source with its number of stored chunks.
+        
+        Returns:
+            List of {"source": ..., "chunks": ...} entries
+        """
+        with self._lock:
+            return [
+                {"source": source, "chunks": count}
+                for source, count in self._conn.execute(
+                    "SELECT source, COUNT(*) FROM chunks GROUP BY source ORDER BY source"
+                )
+            ]
+    
+    def clear(self) -> None:
+        """Forget every source."""
+        with self._lock:
+            self._conn.execute("DELETE FROM chunks")
+    
+    def close(self) -> None:
+        """Close the manifest."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,570 @@
+"""
+Persistent embedding cache keyed by model name and text hash.
+"""
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.bridge.pydantic import PrivateAttr
+
+logger = logging.getLogger(__name__)
+
+SparseVector = Tuple[List[int], List[float]]
+SparseEncoder = Callable[[List[str]], Tuple[List[List[int]], List[List[float]]]]
+
+_INITIAL_CAPACITY = 1024
+# Keep IN (...) lookups well below SQLite's bound parameter limit
+_LOOKUP_CHUNK_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS models (
+    model TEXT PRIMARY KEY,
+    file TEXT NOT NULL,
+    dim INTEGER NOT NULL,
+    capacity INTEGER NOT NULL,
+    next_row INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dense (
+    model TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    row INTEGER NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (model, text_hash)
+);
+CREATE INDEX IF NOT EXISTS dense_lru ON dense (model, last_access);
+CREATE TABLE IF NOT EXISTS free_rows (
+    model TEXT NOT NULL,
+    row INTEGER NOT NULL,
+    PRIMARY KEY (model, row)
+);
+CREATE TABLE IF NOT EXISTS sparse (
+    model TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    indices BLOB NOT NULL,
+    vals BLOB NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (model, text_hash)
+);
+CREATE INDEX IF NOT EXISTS sparse_lru ON sparse (model, last_access);
+"""
+
+
+def hash_text(text: str) -> str:
+    """
+    Hash text content for use as a cache key.
+
+    Args:
+        text: Text to hash
+
+    Returns:
+        SHA-256 hex digest of the text
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    On-disk cache for dense and sparse embeddings.
+
+    Entries are keyed by (model name, SHA-256 of text). Dense vectors live in one
+    memory-mapped float32 matrix per model, with a SQLite index mapping keys to
+    matrix rows. Sparse vectors are stored as packed arrays in SQLite. Each table
+    keeps at most `max_entries` entries per model and evicts the least recently
+    used ones beyond that.
+    """
+
+    def __init__(self, cache_dir: str = "cache/embeddings", max_entries: int = 500_000):
+        """
+        Initialize embedding cache.
+
+        Args:
+            cache_dir: Directory to store the index and embedding matrices
+            max_entries: Maximum number of dense and of sparse entries kept per model
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            str(self.cache_dir / "index.sqlite"),
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+        # model -> (matrix, capacity) for matrices mapped by this process
+        self._matrices: Dict[str, Tuple[np.memmap, int]] = {}
+
+    def _get_model_info(self, model: str) -> Optional[Tuple[str, int, int, int]]:
+        """Get (file, dim, capacity, next_row) for a model, or None if unknown."""
+        return self._conn.execute(
+            "SELECT file, dim, capacity, next_row FROM models WHERE model = ?", (model,)
+        ).fetchone()
+
+    def _get_matrix(self, model: str, dim: Optional[int] = None,
+                    min_capacity: int = 0) -> Optional[np.memmap]:
+        """
+        Map the embedding matrix of a model, creating or growing it when needed.
+
+        Creating or growing the matrix must happen inside a write transaction.
+
+        Args:
+            model: Embedding model name
+            dim: Embedding dimension, required to create a new matrix
+            min_capacity: Minimum number of rows the matrix must hold
+
+        Returns:
+            Memory-mapped matrix or None if the model has no matrix yet
+        """
+        info = self._get_model_info(model)
+        if info is None:
+            if dim is None:
+                return None
+            file_name = f"dense_{hashlib.sha1(model.encode('utf-8')).hexdigest()[:16]}.f32"
+            info = (file_name, dim, 0, 0)
+            self._conn.execute(
+                "INSERT INTO models (model, file, dim, capacity, next_row) VALUES (?, ?, ?, 0, 0)",
+                (model, file_name, dim),
+            )
+
+        file_name, model_dim, capacity, _ = info
+        if dim is not None and dim != model_dim:
+            raise ValueError(
+                f"Embedding dimension {dim} does not match cached dimension {model_dim} for {model}"
+            )
+
+        matrix_path = self.cache_dir / file_name
+        if min_capacity > capacity:
+            capacity = max(capacity * 2, min_capacity, _INITIAL_CAPACITY)
+            with open(matrix_path, "ab") as f:
+                f.truncate(capacity * model_dim * 4)
+            self._conn.execute(
+                "UPDATE models SET capacity = ? WHERE model = ?", (capacity, model)
+            )
+
+        # Remap when another process or an earlier call grew the file
+        cached = self._matrices.get(model)
+        if cached is None or cached[1] != capacity:
+            matrix = np.memmap(matrix_path, dtype=np.float32, mode="r+", shape=(capacity, model_dim))
+            self._matrices[model] = (matrix, capacity)
+
+        return self._matrices[model][0]
+
+    def _lookup(self, table: str, columns: str, model: str,
+                hashes: Sequence[str]) -> Dict[str, Tuple[Any, ...]]:
+        """Look up cache rows for a set of text hashes."""
+        found: Dict[str, Tuple[Any, ...]] = {}
+        unique = list(dict.fromkeys(hashes))
+        for start in range(0, len(unique), _LOOKUP_CHUNK_SIZE):
+            chunk = unique[start : start + _LOOKUP_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT text_hash, {columns} FROM {table} "
+                f"WHERE model = ? AND text_hash IN ({placeholders})",
+                (model, *chunk),
+            ).fetchall()
+            for row in rows:
+                found[row[0]] = row[1:]
+        return found
+
+    def _touch(self, table: str, model: str, hashes: Sequence[str]) -> None:
+        """Record an access for cached entries."""
+        now = time.time()
+        # One transaction for all updates, the connection is in autocommit mode
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            for start in range(0, len(hashes), _LOOKUP_CHUNK_SIZE):
+                chunk = hashes[start : start + _LOOKUP_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                self._conn.execute(
+                    f"UPDATE {table} SET last_access = ? "
+                    f"WHERE model = ? AND text_hash IN ({placeholders})",
+                    (now, model, *chunk),
+                )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def get_dense(self, model: str, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """
+        Get cached dense embeddings.
+
+        Args:
+            model: Embedding model name
+            texts: Texts to look up
+
+        Returns:
+            Embeddings in input order, None for texts that are not cached
+        """
+        hashes = [hash_text(text) for text in texts]
+        try:
+            with self._lock:
+                rows = self._lookup("dense", "row", model, hashes)
+                if not rows:
+                    return [None] * len(texts)
+
+                matrix = self._get_matrix(model)
+                if matrix is None:
+                    return [None] * len(texts)
+
+                self._touch("dense", model, list(rows))
+                return [
+                    matrix[rows[text_hash][0]].tolist() if text_hash in rows else None
+                    for text_hash in hashes
+                ]
+        except Exception as e:
+            logger.warning(f"Error reading embedding cache: {e}")
+            return [None] * len(texts)
+
+    def put_dense(self, model: str, texts: Sequence[str], embeddings: Sequence[Sequence[float]]) -> bool:
+        """
+        Cache dense embeddings.
+
+        Args:
+            model: Embedding model name
+            texts: Embedded texts
+            embeddings: Embeddings in the same order as texts
+
+        Returns:
+            True if successfully cached, False otherwise
+        """
+        if not texts:
+            return True
+
+        new_entries: Dict[str, Sequence[float]] = {}
+        for text, embedding in zip(texts, embeddings):
+            new_entries.setdefault(hash_text(text), embedding)
+
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    existing = self._lookup("dense", "row", model, list(new_entries))
+                    for text_hash in existing:
+                        new_entries.pop(text_hash)
+
+                    if new_entries:
+                        self._insert_dense(model, new_entries)
+                        self._evict("dense", model)
+
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+            return True
+        except Exception as e:
+            logger.warning(f"Error writing embedding cache: {e}")
+            return False
+
+    def _insert_dense(self, model: str, entries: Dict[str, Sequence[float]]) -> None:
+        """Write new dense entries into free or appended matrix rows."""
+        vectors = np.asarray(list(entries.values()), dtype=np.float32)
+        count = len(entries)
+
+        free_rows = [
+            row
+            for (row,) in self._conn.execute(
+                "SELECT row FROM free_rows WHERE model = ? ORDER BY row LIMIT ?", (model, count)
+            ).fetchall()
+        ]
+        self._conn.executemany(
+            "DELETE FROM free_rows WHERE model = ? AND row = ?", [(model, row) for row in free_rows]
+        )
+
+        info = self._get_model_info(model)
+        next_row = info[3] if info else 0
+        appended = count - len(free_rows)
+        rows = free_rows + list(range(next_row, next_row + appended))
+
+        matrix = self._get_matrix(model, dim=vectors.shape[1], min_capacity=next_row + appended)
+        matrix[rows] = vectors
+        matrix.flush()
+
+        now = time.time()
+        self._conn.executemany(
+            "INSERT INTO dense (model, text_hash, row, last_access) VALUES (?, ?, ?, ?)",
+            [(model, text_hash, row, now) for text_hash, row in zip(entries, rows)],
+        )
+        self._conn.execute(
+            "UPDATE models SET next_row = ? WHERE model = ?", (next_row + appended, model)
+        )
+
+    def _evict(self, table: str, model: str) -> None:
+        """Evict least recently used entries beyond max_entries."""
+        (count,) = self._conn.execute(
+            f"SELECT COUNT(*) FROM {table} WHERE model = ?", (model,)
+        ).fetchone()
+        excess = count - self.max_entries
+        if excess <= 0:
+            return
+
+        if table == "dense":
+            evicted = self._conn.execute(
+                "SELECT text_hash, row FROM dense WHERE model = ? ORDER BY last_access LIMIT ?",
+                (model, excess),
+            ).fetchall()
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO free_rows (model, row) VALUES (?, ?)",
+                [(model, row) for _, row in evicted],
+            )
+        else:
+            evicted = self._conn.execute(
+                f"SELECT text_hash FROM {table} WHERE model = ? ORDER BY last_access LIMIT ?",
+                (model, excess),
+            ).fetchall()
+
+        self._conn.executemany(
+            f"DELETE FROM {table} WHERE model = ? AND text_hash = ?",
+            [(model, row[0]) for row in evicted],
+        )
+
+    def get_sparse(self, model: str, texts: Sequence[str]) -> List[Optional[SparseVector]]:
+        """
+        Get cached sparse vectors.
+
+        Args:
+            model: Sparse model name
+            texts: Texts to look up
+
+        Returns:
+            (indices, values) pairs in input order, None for texts that are not cached
+        """
+        hashes = [hash_text(text) for text in texts]
+        try:
+            with self._lock:
+                rows = self._lookup("sparse", "indices, vals", model, hashes)
+                if rows:
+                    self._touch("sparse", model, list(rows))
+        except Exception as e:
+            logger.warning(f"Error reading embedding cache: {e}")
+            return [None] * len(texts)
+
+        results: List[Optional[SparseVector]] = []
+        for text_hash in hashes:
+            if text_hash in rows:
+                indices, values = rows[text_hash]
+                results.append((
+                    np.frombuffer(indices, dtype=np.int32).tolist(),
+                    np.frombuffer(values, dtype=np.float32).tolist(),
+                ))
+            else:
+                results.append(None)
+        return results
+
+    def put_sparse(self, model: str, texts: Sequence[str], indices: Sequence[Sequence[int]],
+                   values: Sequence[Sequence[float]]) -> bool:
+        """
+        Cache sparse vectors.
+
+        Args:
+            model: Sparse model name
+            texts: Encoded texts
+            indices: Sparse indices in the same order as texts
+            values: Sparse values in the same order as texts
+
+        Returns:
+            True if successfully cached, False otherwise
+        """
+        if not texts:
+            return True
+
+        now = time.time()
+        records = [
+            (
+                model,
+                hash_text(text),
+                np.asarray(text_indices, dtype=np.int32).tobytes(),
+                np.asarray(text_values, dtype=np.float32).tobytes(),
+                now,
+            )
+            for text, text_indices, text_values in zip(texts, indices, values)
+        ]
+
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO sparse (model, text_hash, indices, vals, last_access) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        records,
+                    )
+                    self._evict("sparse", model)
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+            return True
+        except Exception as e:
+            logger.warning(f"Error writing embedding cache: {e}")
+            return False
+
+    def clear_cache(self, model: str = None) -> bool:
+        """
+        Clear cached embeddings for one model or for all models.
+
+        Args:
+            model: Specific model to clear (optional)
+
+        Returns:
+            True if successfully cleared, False otherwise
+        """
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    where, params = ("WHERE model = ?", (model,)) if model else ("", ())
+                    files = [
+                        file_name
+                        for (file_name,) in self._conn.execute(
+                            f"SELECT file FROM models {where}", params
+                        ).fetchall()
+                    ]
+                    for table in ("models", "dense", "free_rows", "sparse"):
+                        self._conn.execute(f"DELETE FROM {table} {where}", params)
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+
+                for cached_model in [model] if model else list(self._matrices):
+                    self._matrices.pop(cached_model, None)
+                for file_name in files:
+                    (self.cache_dir / file_name).unlink(missing_ok=True)
+            return True
+        except Exception as e:
+            logger.warning(f"Error clearing embedding cache: {e}")
+            return False
+
+    def get_cache_info(self) -> Dict[str, Any]:
+        """
+        Get information about cached embeddings.
+
+        Returns:
+            Dictionary with per-model entry counts and total size on disk
+        """
+        cache_info = {
+            "cache_dir": str(self.cache_dir),
+            "max_entries": self.max_entries,
+            "models": {},
+            "total_size": 0,
+        }
+
+        try:
+            with self._lock:
+                for model, file_name, dim, capacity in self._conn.execute(
+                    "SELECT model, file, dim, capacity FROM models"
+                ).fetchall():
+                    (count,) = self._conn.execute(
+                        "SELECT COUNT(*) FROM dense WHERE model = ?", (model,)
+                    ).fetchone()
+                    cache_info["models"][model] = {"dense_entries": count, "dim": dim, "capacity": capacity}
+                for model, count in self._conn.execute(
+                    "SELECT model, COUNT(*) FROM sparse GROUP BY model"
+                ).fetchall():
+                    cache_info["models"].setdefault(model, {})["sparse_entries"] = count
+
+            cache_info["total_size"] = sum(
+                path.stat().st_size for path in self.cache_dir.iterdir() if path.is_file()
+            )
+        except Exception as e:
+            logger.warning(f"Error getting embedding cache info: {e}")
+
+        return cache_info
+
+
+class CachedEmbedding(BaseEmbedding):
+    """Embedding model wrapper that serves document embeddings from an EmbeddingCache."""
+
+    _embed_model: BaseEmbedding = PrivateAttr()
+    _cache: EmbeddingCache = PrivateAttr()
+
+    def __init__(self, embed_model: BaseEmbedding, cache: EmbeddingCache, **kwargs: Any):
+        """
+        Initialize cached embedding model.
+
+        Args:
+            embed_model: Embedding model used for cache misses
+            cache: Embedding cache
+            **kwargs: Additional configuration
+        """
+        super().__init__(
+            model_name=embed_model.model_name,
+            embed_batch_size=embed_model.embed_batch_size,
+            **kwargs,
+        )
+        self._embed_model = embed_model
+        self._cache = cache
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "CachedEmbedding"
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        # Queries are embedded differently from documents and rarely repeat
+        return self._embed_model.get_query_embedding(query)
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return await self._embed_model.aget_query_embedding(query)
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._get_text_embeddings([text])[0]
+
+    async def _aget_text_embedding(self, text: str) -> List[float]:
+        return await asyncio.to_thread(self._get_text_embedding, text)
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        embeddings = self._cache.get_dense(self.model_name, texts)
+
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            computed = self._embed_model.get_text_embedding_batch(missing_texts)
+            self._cache.put_dense(self.model_name, missing_texts, computed)
+            for i, embedding in zip(missing, computed):
+                embeddings[i] = embedding
+
+        return embeddings
+
+    async def _aget_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return await asyncio.to_thread(self._get_text_embeddings, texts)
+
+
+def cached_sparse_encoder(encoder: SparseEncoder, cache: EmbeddingCache, model: str) -> SparseEncoder:
+    """
+    Wrap a sparse document encoder so repeated texts are served from the cache.
+
+    Args:
+        encoder: Sparse encoder used for cache misses
+        cache: Embedding cache
+        model: Sparse model name used as cache key
+
+    Returns:
+        Sparse encoder with the same signature as `encoder`
+    """
+
+    def compute_vectors(texts: List[str]) -> Tuple[List[List[int]], List[List[float]]]:
+        vectors = cache.get_sparse(model, texts)
+
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            indices, values = encoder(missing_texts)
+            cache.put_sparse(model, missing_texts, indices, values)
+            for i, text_indices, text_values in zip(missing, indices, values):
+                vectors[i] = (text_indices, text_values)
+
+        return [vector[0] for vector in vectors], [vector[1] for vector in vectors]
+
+    return compute_vectors
@@ -0,0 +1,246 @@
+"""
+Crash-safe checkpoint journal for document ingestion.
+"""
+import os
+import json
+import hashlib
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+from llama_index.core.schema import BaseNode
+from llama_index.core.storage.docstore.utils import doc_to_json, json_to_doc
+
+
+# Ingestion stages in pipeline order
+STAGES = ("pending", "parsed", "chunked", "upserted")
+
+_JOURNAL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    file_path TEXT PRIMARY KEY,
+    plan_name TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    pipeline TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    artifact_path TEXT,
+    node_count INTEGER,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class IngestJournal:
+    """
+    Journal of how far each file has progressed through parse, chunk and upsert.
+    
+    Every stage transition is committed to a SQLite database before the next
+    stage starts, and the output of the parse and chunk stages is written to an
+    artifact file first, so a crashed run resumes each file from its last
+    committed stage. A file starts over when its content, its plan name or the
+    pipeline (parser, chunker, vector store) changes.
+    """
+    
+    def __init__(self, journal_dir: str = "cache/ingest"):
+        """
+        Initialize the ingestion journal.
+        
+        Args:
+            journal_dir: Directory holding the journal database and stage artifacts
+        """
+        self.journal_dir = Path(journal_dir)
+        self.artifacts_dir = self.journal_dir / "artifacts"
+        self.artifacts_dir.mkdir(parents=True, exist_ok=True)
+        
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            str(self.journal_dir / "journal.sqlite"),
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript(_JOURNAL_SCHEMA)
+    
+    def begin(self, file_path: str, plan_name: str, content_hash: str, pipeline: str) -> str:
+        """
+        Register a file for ingestion and get the stage to resume from.
+        
+        Args:
+            file_path: Path to the document
+            plan_name: Plan name derived for the document
+            content_hash: Hash of the document content
+            pipeline: Identifier of the parser, chunker and vector store in use
+        
+        Returns:
+            Last committed stage, "pending" for new or changed files
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash, pipeline, plan_name, stage, artifact_path FROM files WHERE file_path = ?",
+                (file_path,)
+            ).fetchone()
+            
+            # Chunks carry the plan name in their metadata and IDs, so a renamed plan starts over too
+            if row is not None and row[:3] == (content_hash, pipeline, plan_name):
+                self._conn.execute(
+                    "UPDATE files SET attempts = attempts + 1, updated_at = ? WHERE file_path = ?",
+                    (time.time(), file_path)
+                )
+                return row[3]
+            
+            if row is not None and row[4]:
+                Path(row[4]).unlink(missing_ok=True)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files (file_path, plan_name, content_hash, pipeline, stage, "
+                "artifact_path, node_count, attempts, error, updated_at) "
+                "VALUES (?, ?, ?, ?, 'pending', NULL, NULL, 1, NULL, ?)",
+                (file_path, plan_name, content_hash, pipeline, time.time())
+            )
+            return "pending"
+    
+    def commit_stage(self, file_path: str, stage: str, nodes: Optional[List[BaseNode]] = None) -> None:
+        """
+        Record that a file completed a stage.
+        
+        Nodes are written to an artifact file, and renamed into place, before the
+        stage is committed. The artifact of the previous stage is then removed.
+        
+        Args:
+            file_path: Path to the document
+            stage: Completed stage
+            nodes: Stage output to keep for resuming (documents or chunked nodes)
+        """
+        if stage not in STAGES:
+            raise ValueError(f"Unknown ingestion stage: {stage}")
+        
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash, artifact_path FROM files WHERE file_path = ?", (file_path,)
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"File {file_path} has not been registered with the journal")
+            content_hash, previous_artifact = row
+            path_hash = hashlib.sha1(file_path.encode('utf-8')).hexdigest()[:16]
+            
+            artifact_path = None
+            if nodes is not None:
+                artifact_path = self.artifacts_dir / f"{path_hash}_{content_hash[:16]}_{stage}.json"
+                temp_path = artifact_path.with_name(f"{artifact_path.name}.tmp")
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump([doc_to_json(node) for node in nodes], f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, artifact_path)
+                artifact_path = str(artifact_path)
+            
+            self._conn.execute(
+                "UPDATE files SET stage = ?, artifact_path = ?, "
+                "node_count = COALESCE(?, node_count), error = NULL, updated_at = ? WHERE file_path = ?",
+                (stage, artifact_path, len(nodes) if nodes is not None else None, time.time(), file_path)
+            )
+            
+            if previous_artifact and previous_artifact != artifact_path:
+                Path(previous_artifact).unlink(missing_ok=True)
+    
+    def load_artifact(self, file_path: str) -> Optional[List[BaseNode]]:
+        """
+        Load the output of a file's last committed stage.
+        
+        Args:
+            file_path: Path to the document
+        
+        Returns:
+            Documents or nodes saved with the stage, None if nothing was saved
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT artifact_path FROM files WHERE file_path = ?", (file_path,)
+            ).fetchone()
+        if row is None or not row[0] or not Path(row[0]).exists():
+            return None
+        
+        with open(row[0], 'r', encoding='utf-8') as f:
+            return [json_to_doc(node_json) for node_json in json.load(f)]
+    
+    def record_error(self, file_path: str, error: str) -> None:
+        """
+        Record a failure without changing the file's committed stage.
+        
+        Args:
+            file_path: Path to the document
+            error: Error message
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE files SET error = ?, updated_at = ? WHERE file_path = ?",
+                (error, time.time(), file_path)
+            )
+    
+    def get_entries(self) -> List[Dict[str, Any]]:
+        """
+        Get the journal entry of every file.
+        
+        Returns:
+            List of entries with file path, plan name, stage, node count, attempts and last error
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT file_path, plan_name, stage, node_count, attempts, error, updated_at "
+                "FROM files ORDER BY file_path"
+            ).fetchall()
+        return [
+            {
+                "file_path": row[0],
+                "plan_name": row[1],
+                "stage": row[2],
+                "node_count": row[3],
+                "attempts": row[4],
+                "error": row[5],
+                "updated_at": row[6],
+            }
+            for row in rows
+        ]
+    
+    def get_summary(self) -> Dict[str, int]:
+        """
+        Count files per stage.
+        
+        Returns:
+            Number of files at each stage, plus the number with a recorded error
+        """
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT stage, COUNT(*) FROM files GROUP BY stage").fetchall())
+            failed = self._conn.execute("SELECT COUNT(*) FROM files WHERE error IS NOT NULL").fetchone()[0]
+        summary = {stage: counts.get(stage, 0) for stage in STAGES}
+        summary["failed"] = failed
+        return summary
+    
+    def reset(self, file_path: str = None) -> None:
+        """
+        Forget journal entries so files are ingested from scratch.
+        
+        Args:
+            file_path: File to reset, all files if None
+        """
+        with self._lock:
+            if file_path is None:
+                rows = self._conn.execute("SELECT artifact_path FROM files").fetchall()
+                self._conn.execute("DELETE FROM files")
+            else:
+                rows = self._conn.execute(
+                    "SELECT artifact_path FROM files WHERE file_path = ?", (file_path,)
+                ).fetchall()
+                self._conn.execute("DELETE FROM files WHERE file_path = ?", (file_path,))
+        
+        for (artifact_path,) in rows:
+            if artifact_path:
+                Path(artifact_path).unlink(missing_ok=True)
+    
+    def close(self) -> None:
+        """Close the journal database."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,465 @@
+"""
+Near-duplicate detection for chunked nodes using MinHash signatures and LSH.
+"""
+import re
+import json
+import zlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+import numpy as np
+from llama_index.core.schema import BaseNode
+
+# Modulus of the MinHash permutations (a Mersenne prime)
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    position INTEGER PRIMARY KEY,
+    node_id TEXT NOT NULL UNIQUE,
+    signature BLOB NOT NULL,
+    sources TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS aliases (
+    node_id TEXT PRIMARY KEY,
+    target_id TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stats (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+class NearDuplicateIndex:
+    """
+    Index of stored nodes that collapses near-duplicates before they are embedded.
+    
+    Each node's text is reduced to a MinHash signature over word shingles.
+    Signatures are split into bands for locality-sensitive hashing, so only
+    nodes sharing a band are compared, and a node whose estimated Jaccard
+    similarity to an indexed node reaches the threshold is dropped. The kept
+    node then references the plan names of every document it stands for.
+    
+    filter() only changes the index in memory. The store persists the changes
+    with save() once the kept nodes are written, and calls rollback() when the
+    write fails, so the index never refers to nodes that were not stored.
+    """
+    
+    def __init__(self, threshold: float = 0.85, num_perm: int = 128, bands: int = 32,
+                 shingle_size: int = 5, metadata_key: str = "plan_name",
+                 index_path: Optional[str] = None, seed: int = 1):
+        """
+        Initialize the near-duplicate index.
+        
+        Args:
+            threshold: Minimum estimated Jaccard similarity for two nodes to be duplicates
+            num_perm: Number of MinHash permutations per signature
+            bands: Number of LSH bands, must divide num_perm
+            shingle_size: Number of consecutive words per shingle
+            metadata_key: Metadata key holding the source names merged on duplicates
+            index_path: SQLite file the index is persisted to, in memory only if None
+            seed: Seed of the MinHash permutations
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.metadata_key = metadata_key
+        self.index_path = Path(index_path) if index_path else None
+        self._conn = None
+        
+        generator = np.random.RandomState(seed)
+        self._a = generator.randint(1, 1 << 61, size=num_perm, dtype=np.uint64)
+        self._b = generator.randint(0, 1 << 61, size=num_perm, dtype=np.uint64)
+        
+        self._lock = threading.RLock()
+        self._signatures: List[np.ndarray] = []
+        self._node_ids: List[str] = []
+        self._sources: List[List[str]] = []
+        self._positions: Dict[str, int] = {}
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+        self._aliases: Dict[str, str] = {}
+        self._unsaved = 0
+        self._stats = {
+            "nodes_seen": 0,
+            "nodes_kept": 0,
+            "duplicates_dropped": 0,
+            "chars_saved": 0,
+            "text_bytes_saved": 0,
+        }
+        
+        if self.index_path is not None:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(
+                str(self.index_path),
+                timeout=30,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_INDEX_SCHEMA)
+            self._load()
+    
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """
+        Compute the MinHash signature of a text.
+        
+        Args:
+            text: Text to sign
+        
+        Returns:
+            uint32 signature of length num_perm, None for text without words
+        """
+        tokens = _TOKEN_PATTERN.findall(text.lower())
+        if not tokens:
+            return None
+        
+        size = min(self.shingle_size, len(tokens))
+        shingles = {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode('utf-8')) for shingle in shingles),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+        
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+    
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        """Split a signature into one hashable key per band."""
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+    
+    def _find_duplicate(self, signature: np.ndarray) -> Optional[int]:
+        """Find the most similar indexed node at or above the threshold."""
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(key, ()))
+        
+        best_position, best_similarity = None, self.threshold
+        for position in candidates:
+            similarity = float(np.mean(self._signatures[position] == signature))
+            if similarity >= best_similarity:
+                best_position, best_similarity = position, similarity
+        return best_position
+    
+    def _insert(self, signature: np.ndarray, node_id: str, sources: List[str]) -> None:
+        """Add a kept node to the index."""
+        position = len(self._node_ids)
+        self._signatures.append(signature)
+        self._node_ids.append(node_id)
+        self._sources.append(sources)
+        self._positions[node_id] = position
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(key, []).append(position)
+    
+    def _get_sources(self, node: BaseNode) -> List[str]:
+        """Get the source names a node stands for."""
+        value = node.metadata.get(self.metadata_key)
+        if value is None:
+            return []
+        return list(value) if isinstance(value, (list, tuple)) else [value]
+    
+    def _remap_relationships(self, node: BaseNode) -> None:
+        """Point relationships at dropped duplicates to the nodes that replaced them."""
+        if hasattr(node, "remap_relationships"):
+            # Chunk records keep related node IDs only
+            node.remap_relationships(self._aliases)
+            return
+        for related in node.relationships.values():
+            related_nodes = related if isinstance(related, list) else [related]
+            for related_node in related_nodes:
+                if related_node.node_id in self._aliases:
+                    related_node.node_id = self._aliases[related_node.node_id]
+    
+    def get_alias(self, node_id: str) -> Optional[str]:
+        """
+        Get the node a dropped duplicate was collapsed into.
+        
+        Args:
+            node_id: Node ID
+        
+        Returns:
+            ID of the stored node, None if the node was not dropped as a duplicate
+        """
+        with self._lock:
+            return self._aliases.get(node_id)
+    
+    def filter(self, nodes: List[BaseNode]
+               ) -> Tuple[List[BaseNode], Dict[str, List[str]], Optional[Dict[str, list]]]:
+        """
+        Drop nodes that near-duplicate an indexed node or an earlier node of the batch.
+        
+        Kept nodes of the batch get the source names of their duplicates merged
+        into their metadata. For duplicates of nodes stored by an earlier call, the
+        merged source names are returned so the store can update those points.
+        The changes are only persisted when passed to save().
+        
+        Args:
+            nodes: Chunked nodes about to be embedded
+        
+        Returns:
+            Tuple of (kept nodes, {stored node ID: merged source names}, changes to
+            pass to save(), None if the index is not persisted)
+        """
+        kept: List[BaseNode] = []
+        kept_by_id: Dict[str, BaseNode] = {}
+        stored_updates: Dict[str, List[str]] = {}
+        new_aliases: Dict[str, str] = {}
+        
+        with self._lock:
+            first_new = len(self._node_ids)
+            for node in nodes:
+                self._stats["nodes_seen"] += 1
+                text = node.get_content()
+                signature = self.signature(text)
+                
+                # Nodes already indexed (e.g. a retried upsert) are written again as they are
+                if signature is None or node.node_id in self._positions:
+                    kept.append(node)
+                    continue
+                
+                position = self._find_duplicate(signature)
+                if position is None:
+                    self._insert(signature, node.node_id, self._get_sources(node))
+                    kept.append(node)
+                    kept_by_id[node.node_id] = node
+                    self._stats["nodes_kept"] += 1
+                    continue
+                
+                target_id = self._node_ids[position]
+                self._aliases[node.node_id] = target_id
+                new_aliases[node.node_id] = target_id
+                self._stats["duplicates_dropped"] += 1
+                self._stats["chars_saved"] += len(text)
+                self._stats["text_bytes_saved"] += len(text.encode('utf-8'))
+                
+                sources = self._sources[position]
+                new_sources = [source for source in self._get_sources(node) if source not in sources]
+                if not new_sources:
+                    continue
+                sources.extend(new_sources)
+                
+                if target_id in kept_by_id:
+                    kept_by_id[target_id].metadata[self.metadata_key] = list(sources)
+                else:
+                    stored_updates[target_id] = list(sources)
+            
+            for node in kept:
+                self._remap_relationships(node)
+            
+            changes = None
+            if self._conn is not None:
+                changes = self._get_changes(first_new, new_aliases, stored_updates)
+                self._unsaved += 1
+        
+        return kept, stored_updates, changes
+    
+    def discard(self, node_ids: List[str], source: str,
+                remaining_ids: Iterable[str] = ()) -> Tuple[List[str], Dict[str, List[str]]]:
+        """
+        Detach a source from nodes it no longer contains.
+        
+        A stored node that still stands for other sources is kept, with the source
+        removed from its names. A stored node left without sources is removed from
+        the index, so later chunks are not collapsed into a deleted point.
+        
+        Args:
+            node_ids: IDs of the nodes removed from the source
+            source: Source name the nodes were removed from
+            remaining_ids: IDs of the nodes the source still contains
+        
+        Returns:
+            Tuple of (node IDs to delete from the store, {stored node ID: remaining source names})
+        """
+        to_delete: List[str] = []
+        stored_updates: Dict[str, List[str]] = {}
+        dropped: List[str] = []
+        
+        with self._lock:
+            # Stored nodes the source still uses directly or through a duplicate
+            still_used = {self._aliases.get(node_id, node_id) for node_id in remaining_ids}
+            
+            for node_id in node_ids:
+                target_id = self._aliases.pop(node_id, node_id)
+                position = self._positions.get(target_id)
+                if position is None:
+                    if target_id == node_id:
+                        to_delete.append(node_id)
+                    continue
+                
+                sources = self._sources[position]
+                if target_id in still_used or source not in sources:
+                    continue
+                sources.remove(source)
+                
+                if sources:
+                    stored_updates[target_id] = list(sources)
+                    continue
+                
+                for band, key in enumerate(self._band_keys(self._signatures[position])):
+                    self._buckets[band][key].remove(position)
+                del self._positions[target_id]
+                self._aliases = {
+                    alias: target for alias, target in self._aliases.items() if target != target_id
+                }
+                stored_updates.pop(target_id, None)
+                dropped.append(target_id)
+                to_delete.append(target_id)
+            
+            if self._conn is not None:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self._conn.executemany(
+                        "DELETE FROM nodes WHERE node_id = ?", [(node_id,) for node_id in dropped]
+                    )
+                    self._conn.executemany(
+                        "DELETE FROM aliases WHERE node_id = ? OR target_id = ?",
+                        [(node_id, node_id) for node_id in list(node_ids) + dropped]
+                    )
+                    self._conn.executemany(
+                        "UPDATE nodes SET sources = ? WHERE node_id = ?",
+                        [(json.dumps(sources), node_id) for node_id, sources in stored_updates.items()]
+                    )
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+        
+        return to_delete, stored_updates
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get deduplication statistics.
+        
+        Returns:
+            Counts of seen, kept and dropped nodes and the text that was not embedded or stored
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["indexed_nodes"] = len(self._positions)
+            stats["duplicate_ratio"] = (
+                stats["duplicates_dropped"] / stats["nodes_seen"] if stats["nodes_seen"] else 0.0
+            )
+            return stats
+    
+    def clear(self) -> None:
+        """Forget every indexed node and reset the statistics."""
+        with self._lock:
+            self._reset()
+            if self._conn is not None:
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._conn.execute("DELETE FROM nodes")
+                self._conn.execute("DELETE FROM aliases")
+                self._conn.execute("DELETE FROM stats")
+                self._conn.execute("COMMIT")
+    
+    def _get_changes(self, first_new: int, new_aliases: Dict[str, str],
+                     stored_updates: Dict[str, List[str]]) -> Dict[str, list]:
+        """Get the rows one filter call changed, as they are at the end of the call."""
+        return {
+            "nodes": [
+                (position, self._node_ids[position], self._signatures[position].tobytes(),
+                 json.dumps(self._sources[position]))
+                for position in range(first_new, len(self._node_ids))
+            ],
+            # Sources of nodes indexed by earlier calls may have grown
+            "sources": [(json.dumps(sources), node_id) for node_id, sources in stored_updates.items()],
+            "aliases": list(new_aliases.items()),
+            "stats": list(self._stats.items()),
+        }
+    
+    def save(self, changes: Optional[Dict[str, list]]) -> None:
+        """
+        Persist the changes of one filter call, once its kept nodes are stored.
+        
+        Args:
+            changes: Changes returned by filter(), None if the index is not persisted
+        """
+        if changes is None:
+            return
+        
+        with self._lock:
+            if self._conn is None:
+                return
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO nodes (position, node_id, signature, sources) VALUES (?, ?, ?, ?)",
+                    changes["nodes"]
+                )
+                self._conn.executemany("UPDATE nodes SET sources = ? WHERE node_id = ?", changes["sources"])
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO aliases (node_id, target_id) VALUES (?, ?)", changes["aliases"]
+                )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO stats (name, value) VALUES (?, ?)", changes["stats"]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._unsaved = max(self._unsaved - 1, 0)
+    
+    def rollback(self) -> None:
+        """
+        Forget the changes of filter calls that were not saved, e.g. after a failed write.
+        
+        The persisted index is loaded again. An index kept in memory only has
+        nothing to go back to and is left as it is.
+        """
+        with self._lock:
+            if self._conn is None or not self._unsaved:
+                return
+            self._reset()
+            self._load()
+    
+    def _reset(self) -> None:
+        """Empty the in-memory index."""
+        self._signatures = []
+        self._node_ids = []
+        self._sources = []
+        self._positions = {}
+        self._buckets = [{} for _ in range(self.bands)]
+        self._aliases = {}
+        self._unsaved = 0
+        for key in self._stats:
+            self._stats[key] = 0
+    
+    def _load(self) -> None:
+        """Load the persisted index."""
+        rows = self._conn.execute(
+            "SELECT position, node_id, signature, sources FROM nodes ORDER BY position"
+        ).fetchall()
+        for _, node_id, signature, sources in rows:
+            signature = np.frombuffer(signature, dtype=np.uint32)
+            if len(signature) != self.num_perm:
+                raise ValueError(f"Near-duplicate index {self.index_path} uses {len(signature)} permutations")
+            self._insert(signature, node_id, json.loads(sources))
+        
+        # Discarded nodes leave gaps; renumber so positions match the loaded order
+        if any(row[0] != position for position, row in enumerate(rows)):
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute("DELETE FROM nodes")
+            self._conn.executemany(
+                "INSERT INTO nodes (position, node_id, signature, sources) VALUES (?, ?, ?, ?)",
+                [(position, node_id, signature, sources)
+                 for position, (_, node_id, signature, sources) in enumerate(rows)]
+            )
+            self._conn.execute("COMMIT")
+        self._aliases = dict(self._conn.execute("SELECT node_id, target_id FROM aliases"))
+        self._stats.update(dict(self._conn.execute("SELECT name, value FROM stats")))
+    
+    def close(self) -> None:
+        """Close the persisted index."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,138 @@
+"""
+SQLite-backed key-value store for llama_index document stores.
+"""
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from llama_index.core.storage.kvstore.types import BaseKVStore, DEFAULT_BATCH_SIZE, DEFAULT_COLLECTION
+
+_KV_SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    collection TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (collection, key)
+);
+"""
+
+
+class SqliteKVStore(BaseKVStore):
+    """
+    Key-value store writing each change to a SQLite file as it happens.
+    
+    Backs a KVDocumentStore so adding or deleting nodes only writes the rows
+    that changed, where SimpleDocumentStore rewrites its whole JSON file on
+    every persist.
+    """
+    
+    def __init__(self, db_path: str):
+        """
+        Initialize the key-value store.
+        
+        Args:
+            db_path: SQLite file the store is kept in
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_KV_SCHEMA)
+    
+    def put(self, key: str, val: dict, collection: str = DEFAULT_COLLECTION) -> None:
+        """Put a key-value pair into the store."""
+        self.put_all([(key, val)], collection=collection)
+    
+    async def aput(self, key: str, val: dict, collection: str = DEFAULT_COLLECTION) -> None:
+        """Put a key-value pair into the store."""
+        self.put(key, val, collection=collection)
+    
+    def put_all(self, kv_pairs: List[Tuple[str, dict]], collection: str = DEFAULT_COLLECTION,
+                batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        """Put key-value pairs into the store in one transaction."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO kv (collection, key, value) VALUES (?, ?, ?)",
+                    [(collection, key, json.dumps(val)) for key, val in kv_pairs]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+    
+    async def aput_all(self, kv_pairs: List[Tuple[str, dict]], collection: str = DEFAULT_COLLECTION,
+                       batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        """Put key-value pairs into the store in one transaction."""
+        self.put_all(kv_pairs, collection=collection, batch_size=batch_size)
+    
+    def get(self, key: str, collection: str = DEFAULT_COLLECTION) -> Optional[dict]:
+        """Get a value from the store."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM kv WHERE collection = ? AND key = ?", (collection, key)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    async def aget(self, key: str, collection: str = DEFAULT_COLLECTION) -> Optional[dict]:
+        """Get a value from the store."""
+        return self.get(key, collection=collection)
+    
+    def get_all(self, collection: str = DEFAULT_COLLECTION) -> Dict[str, dict]:
+        """Get all values of a collection."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value FROM kv WHERE collection = ?", (collection,)
+            ).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+    
+    async def aget_all(self, collection: str = DEFAULT_COLLECTION) -> Dict[str, dict]:
+        """Get all values of a collection."""
+        return self.get_all(collection=collection)
+    
+    def delete(self, key: str, collection: str = DEFAULT_COLLECTION) -> bool:
+        """Delete a value from the store."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM kv WHERE collection = ? AND key = ?", (collection, key)
+            )
+        return cursor.rowcount > 0
+    
+    async def adelete(self, key: str, collection: str = DEFAULT_COLLECTION) -> bool:
+        """Delete a value from the store."""
+        return self.delete(key, collection=collection)
+    
+    def count(self, collection: str = DEFAULT_COLLECTION) -> int:
+        """
+        Count the keys of a collection without loading their values.
+        
+        Args:
+            collection: Collection name
+        
+        Returns:
+            Number of keys
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM kv WHERE collection = ?", (collection,)
+            ).fetchone()[0]
+    
+    def clear(self) -> None:
+        """Delete every collection."""
+        with self._lock:
+            self._conn.execute("DELETE FROM kv")
+    
+    def close(self) -> None:
+        """Close the store."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -1,9 +1,27 @@
 """
 Base vector store implementation.
 """
-from typing import List, Dict, Any
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple, Union
 from core.interfaces.vector_store_interface import VectorStoreInterface
 from llama_index.core.schema import BaseNode, NodeWithScore
+from util.chunk_batch import ChunkBatch
+from util.near_dedup import NearDuplicateIndex
+from util.chunk_ids import node_fingerprint
+from util.chunk_manifest import ChunkManifest
+
+# Sentinel marking the end of a node stream between pipeline stages
+_END_OF_STREAM = object()
+
+
+def get_plan_names(metadata: Dict[str, Any]) -> List[str]:
+    """Get the plan names of a node, a list once near-duplicates were merged."""
+    plan_names = metadata.get("plan_name")
+    if plan_names is None:
+        return []
+    return [str(name) for name in plan_names] if isinstance(plan_names, list) else [str(plan_names)]
 
 
 class BaseVectorStore(VectorStoreInterface):
@@ -13,6 +31,10 @@ class BaseVectorStore(VectorStoreInterface):
         """Initialize base vector store."""
         self.config = kwargs
         self._initialized = False
+        self._dedup_index: Optional[NearDuplicateIndex] = None
+        self._manifest: Optional[ChunkManifest] = None
+        self._embed_model = None
+        self._embedding_dim: Optional[int] = None
     
     def _ensure_initialized(self) -> None:
         """Ensure the vector store is initialized."""
@@ -24,10 +46,403 @@ class BaseVectorStore(VectorStoreInterface):
         """Initialize the vector store. Override in subclasses."""
         pass
     
+    def _prepare_batch(self, nodes: Union[List[BaseNode], ChunkBatch]) -> ChunkBatch:
+        """
+        Pack nodes into a compact chunk batch.
+        
+        Args:
+            nodes: Chunked nodes or a chunk batch
+            
+        Returns:
+            Chunk batch to deduplicate, embed and write
+        """
+        return nodes if isinstance(nodes, ChunkBatch) else ChunkBatch.from_nodes(nodes)
+    
+    def _dedup_nodes(self, batch: ChunkBatch) -> Tuple[ChunkBatch, Dict[str, List[str]], Any]:
+        """
+        Keep only the chunks to index and drop near-duplicates among them before they are embedded.
+        
+        Near-duplicates are only dropped when a dedup index is set. Nothing is
+        written here: the plan names merged into stored nodes and the dedup
+        index changes are passed on to _write_batch().
+        
+        Args:
+            batch: Chunk batch about to be embedded
+            
+        Returns:
+            Tuple of (chunk batch to embed and write, {stored node ID: merged plan
+            names}, dedup index changes)
+        """
+        batch = self._index_nodes(batch)
+        if self._dedup_index is None:
+            return batch, {}, None
+        
+        kept, stored_updates, changes = self._dedup_index.filter(batch.records)
+        if len(kept) != len(batch):
+            kept_records = {id(record) for record in kept}
+            batch = batch.select([row for row, record in enumerate(batch) if id(record) in kept_records])
+        return batch, stored_updates, changes
+    
+    def _index_nodes(self, batch: ChunkBatch) -> ChunkBatch:
+        """Select the chunks to embed and index. Override in subclasses that keep some chunks elsewhere."""
+        return batch
+    
+    def _update_sources(self, sources: Dict[str, List[str]]) -> None:
+        """Update the source names of stored nodes. Override in subclasses that deduplicate."""
+        pass
+    
+    def _write_batch(self, batch: ChunkBatch, stored_updates: Dict[str, List[str]], changes: Any,
+                     **kwargs) -> List[str]:
+        """
+        Write an embedded batch, then what its near-duplicates changed.
+        
+        A chunk can be collapsed into a node of an earlier batch that is still
+        waiting to be written, so stored plan names are updated only once the
+        batches before have been written, and the dedup index records the
+        batch only once it is stored.
+        
+        Args:
+            batch: Embedded chunk batch, may be empty
+            stored_updates: Merged plan names of stored nodes, from _dedup_nodes()
+            changes: Dedup index changes, from _dedup_nodes()
+            **kwargs: Additional storage options
+            
+        Returns:
+            List of node IDs that were written
+        """
+        node_ids = self._upsert_nodes(batch, **kwargs) if len(batch) else []
+        self._commit_dedup(stored_updates, changes)
+        return node_ids
+    
+    def _commit_dedup(self, stored_updates: Dict[str, List[str]], changes: Any) -> None:
+        """Update the plan names of stored nodes and persist the dedup index changes of a written batch."""
+        if stored_updates:
+            self._update_sources(stored_updates)
+        if self._dedup_index is not None:
+            self._dedup_index.save(changes)
+    
+    def _rollback_dedup(self) -> None:
+        """Forget dedup index changes of batches that failed to be written."""
+        if self._dedup_index is not None:
+            self._dedup_index.rollback()
+    
+    def _embed_nodes(self, batch: ChunkBatch) -> None:
+        """
+        Embed the chunks of a batch that do not have an embedding yet.
+        
+        Embeddings computed upstream (e.g. pooled by the semantic chunker) are
+        kept when they come from the store's embedding model. Texts are embedded
+        through the batch embedding API in slices of `batch_size`, with up to
+        `parallel` slices in flight at once, and written into the batch matrix.
+        Stores without an embedding model leave the batch as it is.
+        
+        Args:
+            batch: Chunk batch to embed in place
+        """
+        if self._embed_model is None:
+            return
+        
+        embed_model_name = getattr(self, "embed_model_name", None)
+        batch_size = getattr(self, "batch_size", 64)
+        parallel = getattr(self, "parallel", 1)
+        pending = [
+            row for row, record in enumerate(batch)
+            if not batch.has_embedding[row]
+            or record.metadata.get("embed_model", embed_model_name) != embed_model_name
+        ]
+        if not pending:
+            self._embedding_dim = batch.dim
+            return
+        
+        batch.clear_embeddings(pending)
+        texts = [batch.records[row].get_content() for row in pending]
+        slices = [texts[start:start + batch_size] for start in range(0, len(texts), batch_size)]
+        
+        if parallel > 1 and len(slices) > 1:
+            with ThreadPoolExecutor(max_workers=parallel) as executor:
+                slice_embeddings = list(executor.map(self._embed_model.get_text_embedding_batch, slices))
+        else:
+            slice_embeddings = [self._embed_model.get_text_embedding_batch(texts) for texts in slices]
+        
+        batch.set_embeddings(pending, [embedding for embeddings in slice_embeddings for embedding in embeddings])
+        self._embedding_dim = batch.dim
+    
+    def _upsert_nodes(self, batch: ChunkBatch, **kwargs) -> List[str]:
+        """Write an already embedded batch. Override in subclasses that embed separately."""
+        return self.add(batch.to_nodes(), **kwargs)
+    
+    def add_stream(self, nodes: Iterable[BaseNode], batch_size: Optional[int] = None,
+                   queue_size: int = 2, **kwargs) -> List[str]:
+        """
+        Add a stream of nodes in fixed-size batches.
+        
+        The caller's thread pulls nodes from the stream (so parsing and chunking keep
+        running), one thread embeds each batch and another writes it, connected by
+        bounded queues. At most a few batches are held in memory at any time, as
+        compact chunk batches with one float32 embedding matrix each. Nodes kept
+        out of the index (e.g. parents of hierarchical chunks) and near-duplicates
+        are dropped before embedding. The writer thread also applies what each
+        batch's near-duplicates changed in stored nodes, in batch order.
+        
+        Args:
+            nodes: Iterable of nodes to add
+            batch_size: Number of nodes per batch, defaults to the store's batch size
+            queue_size: Maximum number of batches waiting between stages
+            **kwargs: Additional storage options
+            
+        Returns:
+            List of node IDs that were added
+        """
+        self._ensure_initialized()
+        
+        batch_size = batch_size or getattr(self, "batch_size", 64)
+        embed_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        upsert_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        node_ids: List[str] = []
+        errors: List[Exception] = []
+        
+        def embed_worker() -> None:
+            while True:
+                batch = embed_queue.get()
+                if batch is _END_OF_STREAM:
+                    upsert_queue.put(_END_OF_STREAM)
+                    break
+                # Keep draining after a failure so the producer never blocks
+                if errors:
+                    continue
+                try:
+                    batch, stored_updates, changes = self._dedup_nodes(batch)
+                    if len(batch):
+                        self._embed_nodes(batch)
+                    # Batches left empty by dedup still go through, to update the nodes they merged into
+                    upsert_queue.put((batch, stored_updates, changes))
+                except Exception as e:
+                    errors.append(e)
+        
+        def upsert_worker() -> None:
+            while True:
+                item = upsert_queue.get()
+                if item is _END_OF_STREAM:
+                    break
+                if errors:
+                    continue
+                try:
+                    node_ids.extend(self._write_batch(*item, **kwargs))
+                except Exception as e:
+                    errors.append(e)
+        
+        threads = [
+            threading.Thread(target=embed_worker, name="stream-embed", daemon=True),
+            threading.Thread(target=upsert_worker, name="stream-upsert", daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+        
+        try:
+            batch: List[BaseNode] = []
+            for node in nodes:
+                if errors:
+                    break
+                batch.append(node)
+                if len(batch) >= batch_size:
+                    embed_queue.put(self._prepare_batch(batch))
+                    batch = []
+            if batch and not errors:
+                embed_queue.put(self._prepare_batch(batch))
+        finally:
+            embed_queue.put(_END_OF_STREAM)
+            for thread in threads:
+                thread.join()
+        
+        if errors:
+            self._rollback_dedup()
+            raise RuntimeError(f"Failed to add node stream to {self.get_store_name()}: {str(errors[0])}")
+        
+        return node_ids
+    
+    def sync(self, nodes: Union[List[BaseNode], ChunkBatch], source: str, **kwargs) -> Dict[str, Any]:
+        """
+        Replace the stored nodes of one source, writing only what changed.
+        
+        Nodes are compared to the manifest of the source by ID and fingerprint.
+        New and changed nodes are embedded and upserted, nodes that disappeared
+        are deleted, and unchanged nodes are skipped. With chunkers producing
+        deterministic IDs, re-ingesting a revised document only touches the
+        sections that changed. Without a manifest every node is added.
+        
+        Args:
+            nodes: Every node chunked from the source, as nodes or a chunk batch
+            source: Source (plan) name
+            **kwargs: Additional storage options
+        
+        Returns:
+            Dictionary with the "upserted" and "deleted" node IDs and the "unchanged" count
+        """
+        self._ensure_initialized()
+        
+        if self._manifest is None:
+            return {"upserted": self.add(nodes, **kwargs), "deleted": [], "unchanged": 0}
+        
+        stored = self._manifest.get(source)
+        fingerprints = {node.node_id: node_fingerprint(node) for node in nodes}
+        changed_rows = [
+            row for row, node in enumerate(nodes) if stored.get(node.node_id) != fingerprints[node.node_id]
+        ]
+        if isinstance(nodes, ChunkBatch):
+            changed = nodes.select(changed_rows)
+        else:
+            changed = [nodes[row] for row in changed_rows]
+        removed = [node_id for node_id in stored if node_id not in fingerprints]
+        
+        # Removed nodes go first, so a revised chunk is not collapsed into its old version
+        removed = self._remove_from_source(removed, source, fingerprints)
+        
+        upserted = self.add(changed, **kwargs) if len(changed) else []
+        
+        # Written last, so an interrupted sync is redone in full on the next run
+        self._manifest.replace(source, fingerprints)
+        
+        return {
+            "upserted": upserted,
+            "deleted": removed,
+            "unchanged": len(nodes) - len(changed),
+        }
+    
+    def sync_stream(self, nodes: Iterable[BaseNode], source: str, batch_size: Optional[int] = None,
+                    **kwargs) -> Dict[str, Any]:
+        """
+        Replace the stored nodes of one source from a stream of nodes.
+        
+        Streaming counterpart of sync(): nodes whose ID and fingerprint are in
+        the manifest are skipped, the others go through add_stream(), and nodes
+        of the source that were not streamed are deleted once the stream ends.
+        As removed nodes can only be known at the end, a revised chunk may be
+        collapsed into its old version by near-duplicate filtering; use sync()
+        when that matters. Without a manifest every node is added.
+        
+        Args:
+            nodes: Iterable of every node chunked from the source
+            source: Source (plan) name
+            batch_size: Number of nodes per batch, defaults to the store's batch size
+            **kwargs: Additional storage options
+        
+        Returns:
+            Dictionary with the "upserted" and "deleted" node IDs and the "unchanged" count
+        """
+        self._ensure_initialized()
+        
+        if self._manifest is None:
+            upserted = self.add_stream(nodes, batch_size=batch_size, **kwargs)
+            return {"upserted": upserted, "deleted": [], "unchanged": 0}
+        
+        stored = self._manifest.get(source)
+        fingerprints: Dict[str, str] = {}
+        unchanged = 0
+        
+        def changed_nodes() -> Iterator[BaseNode]:
+            nonlocal unchanged
+            for node in nodes:
+                fingerprint = node_fingerprint(node)
+                fingerprints[node.node_id] = fingerprint
+                if stored.get(node.node_id) == fingerprint:
+                    unchanged += 1
+                    continue
+                yield node
+        
+        upserted = self.add_stream(changed_nodes(), batch_size=batch_size, **kwargs)
+        
+        removed = [node_id for node_id in stored if node_id not in fingerprints]
+        # Points still aliased by the streamed nodes stay
+        removed = self._remove_from_source(removed, source, fingerprints)
+        
+        # Written last, so an interrupted sync is redone in full on the next run
+        self._manifest.replace(source, fingerprints)
+        
+        return {"upserted": upserted, "deleted": removed, "unchanged": unchanged}
+    
+    def _remove_from_source(self, removed: List[str], source: str, remaining: Dict[str, str]) -> List[str]:
+        """
+        Delete nodes that disappeared from a source.
+        
+        Args:
+            removed: IDs of the source's nodes that are gone
+            source: Source (plan) name
+            remaining: Fingerprints of the source's current nodes by ID
+        
+        Returns:
+            IDs of the nodes that were deleted
+        """
+        if removed and self._dedup_index is not None:
+            # Points that near-duplicates of other sources were collapsed into stay
+            removed, stored_updates = self._dedup_index.discard(removed, source, remaining)
+            if stored_updates:
+                self._update_sources(stored_updates)
+        if removed:
+            self.delete(removed)
+        return removed
+    
+    def search_batch(self, queries: List[str], filters: Optional[List[Optional[str]]] = None,
+                     top_k: int = 5, **kwargs) -> List[List[NodeWithScore]]:
+        """
+        Search for similar nodes for several queries at once.
+        
+        Runs one search per query. Override in subclasses that can embed and
+        search several queries in one call.
+        
+        Args:
+            queries: Search queries
+            filters: Plan name each query is restricted to, None for all plans
+            top_k: Number of results to return per query
+            **kwargs: Additional search options
+            
+        Returns:
+            List of nodes with similarity scores for each query, in query order
+        """
+        filters = self._check_filters(queries, filters)
+        return [
+            self.search(query, top_k=top_k, plan_name=plan_name, **kwargs)
+            for query, plan_name in zip(queries, filters)
+        ]
+    
+    def _check_filters(self, queries: List[str], filters: Optional[List[Optional[str]]]) -> List[Optional[str]]:
+        """Get one plan name filter per query, None for all plans."""
+        if filters is None:
+            return [None] * len(queries)
+        if len(filters) != len(queries):
+            raise ValueError(f"Got {len(filters)} filters for {len(queries)} queries")
+        return list(filters)
+    
+    def _embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """
+        Embed several queries in one model call where the model supports it.
+        
+        Repeated queries, such as one question searched in several plans, are
+        embedded once and their embedding is shared.
+        
+        Args:
+            queries: Search queries
+            
+        Returns:
+            One query embedding per query
+        """
+        unique = list(dict.fromkeys(queries))
+        # Queries are not cached, so look through the cache wrapper to the FastEmbed model
+        embed_model = getattr(self._embed_model, "_embed_model", self._embed_model)
+        text_embedding = getattr(embed_model, "_model", None)
+        if hasattr(text_embedding, "query_embed"):
+            embeddings = [embedding.tolist() for embedding in text_embedding.query_embed(unique)]
+        else:
+            embeddings = [self._embed_model.get_query_embedding(query) for query in unique]
+        by_query = dict(zip(unique, embeddings))
+        return [by_query[query] for query in queries]
+    
     def get_collection_info(self) -> Dict[str, Any]:
         """Get collection information. Override in subclasses."""
-        return {
+        info = {
             "store_type": self.get_store_name(),
             "initialized": self._initialized,
             "config": self.config
         }
+        if self._dedup_index is not None:
+            info["dedup"] = self._dedup_index.get_stats()
+        return info
@@ -0,0 +1,636 @@
+"""
+In-process HNSW vector store implementation.
+"""
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Union
+import numpy as np
+from llama_index.core.schema import BaseNode, NodeWithScore
+from llama_index.core.vector_stores.utils import node_to_metadata_dict, metadata_dict_to_node
+from llama_index.embeddings.fastembed import FastEmbedEmbedding
+from vector_stores.base_vector_store import BaseVectorStore, get_plan_names
+from util.embedding_cache import EmbeddingCache, CachedEmbedding
+from util.near_dedup import NearDuplicateIndex
+from util.chunk_manifest import ChunkManifest
+from util.chunk_batch import ChunkBatch
+import logging
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+logger = logging.getLogger(__name__)
+
+_HNSW_SCHEMA = """
+CREATE TABLE IF NOT EXISTS points (
+    label INTEGER PRIMARY KEY,
+    node_id TEXT NOT NULL UNIQUE,
+    plan_names TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    vector BLOB
+);
+CREATE TABLE IF NOT EXISTS store_info (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class HnswStore(BaseVectorStore):
+    """
+    In-process vector store doing approximate search over an HNSW graph.
+    
+    Each collection is one SQLite file holding node payloads and the vectors
+    of points written since the graph was last saved, plus the hnswlib graph
+    saved next to it. The graph is checkpointed every `save_interval` writes
+    and on close() by writing a new graph file and renaming it over the old
+    one; on load, points written after the checkpoint are inserted again and
+    points deleted since are marked deleted, so no write is lost.
+    
+    The plan_name filter is applied inside the graph search through a boolean
+    column per plan. Plans with at most `exact_search_threshold` points are
+    searched exactly instead, as graph search degrades on very selective
+    filters.
+    """
+    
+    def __init__(self, collection_name: str = "documents", store_dir: str = "cache/hnsw_store",
+                 batch_size: int = 64, parallel: int = 1,
+                 embed_model_name: str = "BAAI/bge-small-en-v1.5",
+                 enable_embedding_cache: bool = True, embedding_cache_dir: str = "cache/embeddings",
+                 embedding_cache_max_entries: int = 500_000, enable_dedup: bool = False,
+                 dedup_threshold: float = 0.85, dedup_index_dir: str = "cache/dedup",
+                 manifest_dir: str = "cache/manifest", m: int = 16, ef_construction: int = 200,
+                 ef_search: int = 64, initial_capacity: int = 10_000,
+                 exact_search_threshold: int = 2048, save_interval: int = 10_000, **kwargs):
+        """
+        Initialize HNSW vector store.
+        
+        Args:
+            collection_name: Collection name
+            store_dir: Directory to persist collections, a SQLite file and a graph file per
+                collection
+            batch_size: Batch size for embedding
+            parallel: Number of embedding batches run in parallel
+            embed_model_name: Embedding model name for FastEmbed
+            enable_embedding_cache: Cache document embeddings on disk
+            embedding_cache_dir: Directory to store the embedding cache
+            embedding_cache_max_entries: Maximum number of cached embeddings per model
+            enable_dedup: Collapse near-duplicate nodes into one point listing every plan_name
+            dedup_threshold: Minimum estimated Jaccard similarity of near-duplicate nodes
+            dedup_index_dir: Directory to persist the near-duplicate index, one file per collection
+            manifest_dir: Directory to persist the chunk manifest used by sync, one file per
+                collection
+            m: Number of graph links per point (HNSW M)
+            ef_construction: Candidate list size while inserting
+            ef_search: Candidate list size while searching, raised to top_k when smaller
+            initial_capacity: Number of points the graph is first allocated for, doubled when full
+            exact_search_threshold: Search filtered plans of at most this many points exactly
+            save_interval: Number of written points after which the graph is saved
+            **kwargs: Additional configuration
+        """
+        if hnswlib is None:
+            raise ValueError("HnswStore requires the hnswlib package, install the \"hnsw\" extra")
+        
+        super().__init__(**kwargs)
+        self.collection_name = collection_name
+        self.store_dir = store_dir
+        self.batch_size = batch_size
+        self.parallel = parallel
+        self.embed_model_name = embed_model_name
+        self.enable_embedding_cache = enable_embedding_cache
+        self.embedding_cache_dir = embedding_cache_dir
+        self.embedding_cache_max_entries = embedding_cache_max_entries
+        self.enable_dedup = enable_dedup
+        self.dedup_threshold = dedup_threshold
+        self.dedup_index_dir = dedup_index_dir
+        if enable_dedup:
+            self._dedup_index = NearDuplicateIndex(
+                threshold=dedup_threshold,
+                index_path=f"{dedup_index_dir}/{collection_name}.sqlite",
+            )
+        self.manifest_dir = manifest_dir
+        self._manifest = ChunkManifest(f"{manifest_dir}/{collection_name}.sqlite")
+        self.m = m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.initial_capacity = initial_capacity
+        self.exact_search_threshold = exact_search_threshold
+        self.save_interval = save_interval
+        self._store_path = Path(store_dir) / f"{collection_name}.sqlite"
+        self._graph_path = Path(store_dir) / f"{collection_name}.hnsw"
+        self._lock = threading.RLock()
+        self._embedding_cache = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._graph = None
+        self._labels: Dict[str, int] = {}
+        self._next_label = 0
+        self._unsaved = 0
+        self._plan_masks: Dict[str, np.ndarray] = {}
+        self._plan_counts: Dict[str, int] = {}
+        self._mask_size = max(initial_capacity, 1)
+    
+    def _initialize(self) -> None:
+        """Initialize the embedding model and load the collection from disk."""
+        try:
+            self._embed_model = FastEmbedEmbedding(
+                model_name=self.embed_model_name, embed_batch_size=self.batch_size
+            )
+            if self.enable_embedding_cache:
+                self._embedding_cache = EmbeddingCache(
+                    self.embedding_cache_dir, self.embedding_cache_max_entries
+                )
+                self._embed_model = CachedEmbedding(self._embed_model, self._embedding_cache)
+            self._load()
+        except Exception as e:
+            raise RuntimeError(f"Failed to initialize HNSW vector store: {str(e)}")
+    
+    def _load(self) -> None:
+        """Open the collection file, load the graph and replay writes made after it was saved."""
+        self._store_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self._store_path),
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_HNSW_SCHEMA)
+        
+        info = dict(self._conn.execute("SELECT key, value FROM store_info"))
+        self._embedding_dim = int(info["dim"]) if "dim" in info else None
+        self._next_label = int(info.get("next_label", 0))
+        self._graph = None
+        if self._embedding_dim is not None:
+            if self._graph_path.exists():
+                self._graph = hnswlib.Index(space="cosine", dim=self._embedding_dim)
+                self._graph.load_index(str(self._graph_path), allow_replace_deleted=True)
+            else:
+                self._graph = self._new_graph(self._embedding_dim)
+        
+        self._labels = {}
+        self._plan_masks = {}
+        self._plan_counts = {}
+        self._mask_size = max(self.initial_capacity, 1)
+        replay_labels = []
+        replay_vectors = []
+        for label, node_id, plan_names, vector in self._conn.execute(
+            "SELECT label, node_id, plan_names, vector FROM points"
+        ):
+            self._labels[node_id] = label
+            self._set_plans(label, json.loads(plan_names))
+            if vector is not None:
+                replay_labels.append(label)
+                replay_vectors.append(np.frombuffer(vector, dtype=np.float32))
+        
+        if self._graph is None:
+            return
+        graph_labels = set(self._graph.get_ids_list())
+        if replay_labels:
+            self._add_vectors(
+                replay_labels,
+                np.vstack(replay_vectors),
+                [label not in graph_labels for label in replay_labels],
+            )
+        stored = set(self._labels.values())
+        for label in graph_labels:
+            if label not in stored:
+                try:
+                    self._graph.mark_deleted(label)
+                except RuntimeError:
+                    # Already deleted before the graph was saved
+                    pass
+        self._unsaved = len(replay_labels)
+    
+    def _new_graph(self, dim: int):
+        """Create an empty HNSW graph."""
+        graph = hnswlib.Index(space="cosine", dim=dim)
+        graph.init_index(
+            max_elements=self.initial_capacity,
+            ef_construction=self.ef_construction,
+            M=self.m,
+            allow_replace_deleted=True,
+        )
+        return graph
+    
+    def _set_plans(self, label: int, plan_names: List[str]) -> None:
+        """Set the plan name columns of a label."""
+        if label >= self._mask_size:
+            self._grow_masks(label + 1)
+        for plan_name, mask in self._plan_masks.items():
+            if mask[label]:
+                mask[label] = False
+                self._plan_counts[plan_name] -= 1
+        for plan_name in plan_names:
+            if plan_name not in self._plan_masks:
+                self._plan_masks[plan_name] = np.zeros(self._mask_size, dtype=bool)
+                self._plan_counts[plan_name] = 0
+            self._plan_masks[plan_name][label] = True
+            self._plan_counts[plan_name] += 1
+    
+    def _grow_masks(self, size: int) -> None:
+        """Grow the plan columns to cover at least `size` labels."""
+        while self._mask_size < size:
+            self._mask_size *= 2
+        for plan_name, mask in self._plan_masks.items():
+            self._plan_masks[plan_name] = np.concatenate(
+                [mask, np.zeros(self._mask_size - len(mask), dtype=bool)]
+            )
+    
+    def _add_vectors(self, labels: List[int], vectors: np.ndarray, is_new: List[bool]) -> None:
+        """
+        Insert or update points of the graph.
+        
+        Existing points are updated in place, new points take the slots of
+        deleted ones first.
+        
+        Args:
+            labels: Point labels
+            vectors: One vector per label
+            is_new: Whether each label is not in the graph yet
+        """
+        update_rows = [row for row, new in enumerate(is_new) if not new]
+        insert_rows = [row for row, new in enumerate(is_new) if new]
+        
+        needed = self._graph.get_current_count() + len(insert_rows)
+        capacity = self._graph.get_max_elements()
+        if needed > capacity:
+            while capacity < needed:
+                capacity *= 2
+            self._graph.resize_index(capacity)
+        
+        for rows, replace_deleted in ((update_rows, False), (insert_rows, True)):
+            if rows:
+                self._graph.add_items(
+                    vectors[rows],
+                    np.asarray([labels[row] for row in rows], dtype=np.int64),
+                    num_threads=self.parallel,
+                    replace_deleted=replace_deleted,
+                )
+    
+    def add(self, nodes: Union[List[BaseNode], ChunkBatch], **kwargs) -> List[str]:
+        """
+        Add nodes to the vector store.
+        
+        Args:
+            nodes: List of nodes or a chunk batch to add
+            **kwargs: Additional storage options
+        
+        Returns:
+            List of node IDs that were added
+        """
+        self._ensure_initialized()
+        
+        try:
+            batch, stored_updates, changes = self._dedup_nodes(self._prepare_batch(nodes))
+            if len(batch):
+                self._embed_nodes(batch)
+            return self._write_batch(batch, stored_updates, changes, **kwargs)
+        except Exception as e:
+            self._rollback_dedup()
+            raise RuntimeError(f"Failed to add nodes to HNSW store: {str(e)}")
+    
+    def _upsert_nodes(self, batch: ChunkBatch, **kwargs) -> List[str]:
+        """
+        Write an embedded batch to the graph and the points table.
+        
+        Args:
+            batch: Embedded chunk batch
+            **kwargs: Additional storage options
+        
+        Returns:
+            List of node IDs that were written
+        """
+        if not batch.has_embedding.all():
+            raise ValueError("Every node must be embedded before it is written")
+        
+        vectors = batch.embeddings.astype(np.float32, copy=True)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.where(norms > 0, norms, 1.0)
+        
+        with self._lock:
+            if self._graph is None:
+                self._embedding_dim = vectors.shape[1]
+                self._graph = self._new_graph(self._embedding_dim)
+            elif vectors.shape[1] != self._embedding_dim:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} does not match the collection's {self._embedding_dim}"
+                )
+            
+            labels = []
+            is_new = []
+            for record in batch:
+                label = self._labels.get(record.node_id)
+                is_new.append(label is None)
+                if label is None:
+                    label = self._next_label
+                    self._next_label += 1
+                    self._labels[record.node_id] = label
+                labels.append(label)
+            self._add_vectors(labels, vectors, is_new)
+            
+            points = []
+            for label, vector, node in zip(labels, vectors, batch.to_nodes(with_embeddings=False)):
+                plan_names = get_plan_names(node.metadata)
+                self._set_plans(label, plan_names)
+                payload = node_to_metadata_dict(node, remove_text=False, flat_metadata=False)
+                points.append((label, node.node_id, json.dumps(plan_names), json.dumps(payload), vector.tobytes()))
+            
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO points (label, node_id, plan_names, payload, vector) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    points,
+                )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO store_info (key, value) VALUES (?, ?)",
+                    [("dim", str(self._embedding_dim)), ("next_label", str(self._next_label))],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            
+            self._unsaved += len(points)
+            if self._unsaved >= self.save_interval:
+                self._save_graph()
+        
+        return [record.node_id for record in batch]
+    
+    def _save_graph(self) -> None:
+        """Checkpoint the graph, after which written vectors no longer need to be kept."""
+        if self._graph is None:
+            return
+        # Written beside the old graph and renamed over it, so a crash leaves one whole graph
+        temp_path = self._graph_path.with_name(f"{self._graph_path.name}.tmp")
+        self._graph.save_index(str(temp_path))
+        os.replace(temp_path, self._graph_path)
+        # Vectors already in the saved graph are only re-added if this fails, which is harmless
+        self._conn.execute("UPDATE points SET vector = NULL WHERE vector IS NOT NULL")
+        self._unsaved = 0
+    
+    def _update_sources(self, sources: Dict[str, List[str]]) -> None:
+        """
+        Point stored nodes at every plan their near-duplicates came from.
+        
+        Args:
+            sources: Mapping of stored node ID to its merged plan names
+        """
+        with self._lock:
+            updates = []
+            for node_id, plan_names in sources.items():
+                label = self._labels.get(node_id)
+                if label is None:
+                    continue
+                (payload,) = self._conn.execute("SELECT payload FROM points WHERE label = ?", (label,)).fetchone()
+                node = metadata_dict_to_node(json.loads(payload))
+                node.metadata["plan_name"] = plan_names
+                payload = node_to_metadata_dict(node, remove_text=False, flat_metadata=False)
+                self._set_plans(label, get_plan_names(node.metadata))
+                updates.append((json.dumps(get_plan_names(node.metadata)), json.dumps(payload), label))
+            self._conn.executemany("UPDATE points SET plan_names = ?, payload = ? WHERE label = ?", updates)
+    
+    def search(self, query: str, top_k: int = 5, plan_name: str = None, **kwargs) -> List[NodeWithScore]:
+        """
+        Search for similar nodes.
+        
+        Args:
+            query: Search query
+            top_k: Number of results to return
+            plan_name: Only return nodes of this plan, all plans if None
+            **kwargs: Additional search options, e.g. ef to override ef_search
+        
+        Returns:
+            List of nodes with similarity scores
+        """
+        self._ensure_initialized()
+        
+        try:
+            query_embedding = np.asarray(self._embed_model.get_query_embedding(query), dtype=np.float32)
+            return self.search_by_vector(query_embedding, top_k=top_k, plan_name=plan_name, **kwargs)
+        except Exception as e:
+            logger.error(f"Failed to search in HNSW store: {str(e)}")
+            raise RuntimeError(f"Failed to search in HNSW store: {str(e)}")
+    
+    def search_batch(self, queries: List[str], filters: Optional[List[Optional[str]]] = None,
+                     top_k: int = 5, **kwargs) -> List[List[NodeWithScore]]:
+        """
+        Search for similar nodes for several queries, embedded in one batch.
+        
+        Args:
+            queries: Search queries
+            filters: Plan name each query is restricted to, None for all plans
+            top_k: Number of results to return per query
+            **kwargs: Additional search options
+            
+        Returns:
+            List of nodes with similarity scores for each query, in query order
+        """
+        self._ensure_initialized()
+        filters = self._check_filters(queries, filters)
+        
+        try:
+            embeddings = self._embed_queries(queries) if queries else []
+            return [
+                self.search_by_vector(np.asarray(embedding, dtype=np.float32), top_k=top_k,
+                                      plan_name=plan_name, **kwargs)
+                for embedding, plan_name in zip(embeddings, filters)
+            ]
+        except Exception as e:
+            logger.error(f"Failed to search in HNSW store: {str(e)}")
+            raise RuntimeError(f"Failed to search in HNSW store: {str(e)}")
+    
+    def search_by_vector(self, query_embedding: np.ndarray, top_k: int = 5,
+                         plan_name: Optional[str] = None, ef: Optional[int] = None) -> List[NodeWithScore]:
+        """
+        Search for the nodes closest to an embedding.
+        
+        Args:
+            query_embedding: Query embedding
+            top_k: Number of results to return
+            plan_name: Only return nodes of this plan, all plans if None
+            ef: Candidate list size, defaults to ef_search
+        
+        Returns:
+            List of nodes with similarity scores
+        """
+        self._ensure_initialized()
+        
+        with self._lock:
+            labels, scores = self._query_graph(np.asarray(query_embedding, dtype=np.float32), top_k, plan_name, ef)
+            if not labels:
+                return []
+            placeholders = ",".join("?" * len(labels))
+            payloads = dict(self._conn.execute(
+                f"SELECT label, payload FROM points WHERE label IN ({placeholders})", labels
+            ))
+        
+        return [
+            NodeWithScore(node=metadata_dict_to_node(json.loads(payloads[label])), score=score)
+            for label, score in zip(labels, scores)
+            if label in payloads
+        ]
+    
+    def _query_graph(self, query_embedding: np.ndarray, top_k: int, plan_name: Optional[str],
+                     ef: Optional[int]):
+        """Get the labels and cosine similarities of the nearest points, best first."""
+        if self._graph is None or top_k <= 0 or not self._labels:
+            return [], []
+        
+        mask = None
+        k = min(top_k, len(self._labels))
+        if plan_name is not None:
+            mask = self._plan_masks.get(str(plan_name))
+            k = min(top_k, self._plan_counts.get(str(plan_name), 0))
+            if not k:
+                return [], []
+            if self._plan_counts[str(plan_name)] <= self.exact_search_threshold:
+                return self._exact_search(query_embedding, np.flatnonzero(mask), k)
+        
+        self._graph.set_ef(max(ef or self.ef_search, k))
+        try:
+            labels, distances = self._graph.knn_query(
+                query_embedding,
+                k=k,
+                num_threads=1,
+                filter=(lambda label: bool(mask[label])) if mask is not None else None,
+            )
+        except RuntimeError:
+            # Fewer than k points were reached through the filter
+            if mask is None:
+                raise
+            return self._exact_search(query_embedding, np.flatnonzero(mask), k)
+        return labels[0].tolist(), (1.0 - distances[0]).tolist()
+    
+    def _exact_search(self, query_embedding: np.ndarray, labels: np.ndarray, k: int):
+        """Score the given points exactly and get the best k."""
+        vectors = np.asarray(self._graph.get_items(labels, return_type="numpy"), dtype=np.float32)
+        norm = np.linalg.norm(query_embedding)
+        scores = vectors @ (query_embedding / norm if norm > 0 else query_embedding)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return labels[top].tolist(), scores[top].tolist()
+    
+    def delete(self, node_ids: List[str]) -> bool:
+        """
+        Delete nodes by their IDs.
+        
+        Args:
+            node_ids: List of node IDs to delete
+        
+        Returns:
+            True if deletion was successful
+        """
+        self._ensure_initialized()
+        
+        try:
+            with self._lock:
+                labels = [self._labels.pop(node_id) for node_id in node_ids if node_id in self._labels]
+                if not labels:
+                    return True
+                self._conn.executemany("DELETE FROM points WHERE label = ?", [(label,) for label in labels])
+                for label in labels:
+                    self._set_plans(label, [])
+                    self._graph.mark_deleted(label)
+            return True
+        except Exception as e:
+            raise RuntimeError(f"Failed to delete nodes from HNSW store: {str(e)}")
+    
+    def get_store_name(self) -> str:
+        """Get vector store name."""
+        return "HnswStore"
+    
+    def get_collection_info(self) -> Dict[str, Any]:
+        """Get collection information."""
+        info = super().get_collection_info()
+        with self._lock:
+            info.update({
+                "store_dir": self.store_dir,
+                "collection_name": self.collection_name,
+                "batch_size": self.batch_size,
+                "parallel": self.parallel,
+                "m": self.m,
+                "ef_construction": self.ef_construction,
+                "ef_search": self.ef_search,
+                "points_count": len(self._labels),
+                "capacity": self._graph.get_max_elements() if self._graph is not None else 0,
+                "embedding_dim": self._embedding_dim,
+                "unsaved_points": self._unsaved,
+                "plans": len(self._plan_masks),
+                "embedding_cache": (
+                    self._embedding_cache.get_cache_info()
+                    if self._embedding_cache is not None
+                    else {"enabled": False}
+                ),
+            })
+        if self._dedup_index is not None and self._embedding_dim is not None:
+            info["dedup"]["vector_bytes_saved"] = info["dedup"]["duplicates_dropped"] * self._embedding_dim * 4
+        return info
+    
+    def persist(self) -> None:
+        """Save the graph now rather than after the next `save_interval` writes."""
+        with self._lock:
+            if self._conn is not None and self._unsaved:
+                self._save_graph()
+    
+    def close(self) -> None:
+        """Save the graph and close the collection file."""
+        with self._lock:
+            self.persist()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._graph = None
+            self._initialized = False
+    
+    def drop_collection(self) -> bool:
+        """
+        Delete the collection and graph files and the local dedup index and manifest.
+        
+        Returns:
+            True if dropping was successful
+        """
+        try:
+            with self._lock:
+                if self._conn is not None:
+                    self._conn.close()
+                    self._conn = None
+                for path in (
+                    *(Path(f"{self._store_path}{suffix}") for suffix in ("", "-wal", "-shm")),
+                    self._graph_path,
+                ):
+                    if path.exists():
+                        path.unlink()
+                if self._dedup_index is not None:
+                    self._dedup_index.clear()
+                self._manifest.clear()
+                self._graph = None
+                self._labels = {}
+                self._next_label = 0
+                self._unsaved = 0
+                self._plan_masks = {}
+                self._plan_counts = {}
+                self._mask_size = max(self.initial_capacity, 1)
+                self._embedding_dim = None
+                self._initialized = False
+            return True
+        except Exception as e:
+            raise RuntimeError(f"Failed to drop HNSW store collection: {str(e)}")
+    
+    def clear_collection(self) -> bool:
+        """
+        Clear all data from the collection.
+        
+        Returns:
+            True if clearing was successful
+        """
+        try:
+            self.drop_collection()
+            self._ensure_initialized()
+            return True
+        except Exception as e:
+            raise RuntimeError(f"Failed to clear HNSW store collection: {str(e)}")
@@ -0,0 +1,496 @@
+"""
+In-process NumPy vector store implementation.
+"""
+import json
+import shutil
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Union
+import numpy as np
+from llama_index.core.schema import BaseNode, NodeWithScore
+from llama_index.core.vector_stores.utils import node_to_metadata_dict, metadata_dict_to_node
+from llama_index.embeddings.fastembed import FastEmbedEmbedding
+from vector_stores.base_vector_store import BaseVectorStore, get_plan_names
+from util.embedding_cache import EmbeddingCache, CachedEmbedding
+from util.near_dedup import NearDuplicateIndex
+from util.chunk_manifest import ChunkManifest
+from util.chunk_batch import ChunkBatch
+import logging
+
+logger = logging.getLogger(__name__)
+
+_POINTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS points (
+    row INTEGER PRIMARY KEY,
+    node_id TEXT NOT NULL UNIQUE,
+    plan_names TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS store_info (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class NumpyStore(BaseVectorStore):
+    """
+    In-process vector store doing exact search over a memory-mapped matrix.
+    
+    Unit-normalized embeddings are held in one float32 matrix memory-mapped
+    from disk, one row per point, and searched by cosine similarity with a
+    single matrix-vector product and argpartition. A boolean column per plan
+    name gives the plan_name filter without scanning payloads. Node payloads
+    live in SQLite next to the matrix and are only read for the top-k results.
+    Suited to corpora of a few hundred thousand chunks, where exact search
+    in process is faster than a round trip to a vector database.
+    """
+    
+    def __init__(self, collection_name: str = "documents", store_dir: str = "cache/numpy_store",
+                 batch_size: int = 64, parallel: int = 1,
+                 embed_model_name: str = "BAAI/bge-small-en-v1.5",
+                 enable_embedding_cache: bool = True, embedding_cache_dir: str = "cache/embeddings",
+                 embedding_cache_max_entries: int = 500_000, enable_dedup: bool = False,
+                 dedup_threshold: float = 0.85, dedup_index_dir: str = "cache/dedup",
+                 manifest_dir: str = "cache/manifest", initial_capacity: int = 1024, **kwargs):
+        """
+        Initialize NumPy vector store.
+        
+        Args:
+            collection_name: Collection name
+            store_dir: Directory to persist collections, one subdirectory per collection
+            batch_size: Batch size for embedding
+            parallel: Number of embedding batches run in parallel
+            embed_model_name: Embedding model name for FastEmbed
+            enable_embedding_cache: Cache document embeddings on disk
+            embedding_cache_dir: Directory to store the embedding cache
+            embedding_cache_max_entries: Maximum number of cached embeddings per model
+            enable_dedup: Collapse near-duplicate nodes into one point listing every plan_name
+            dedup_threshold: Minimum estimated Jaccard similarity of near-duplicate nodes
+            dedup_index_dir: Directory to persist the near-duplicate index, one file per collection
+            manifest_dir: Directory to persist the chunk manifest used by sync, one file per
+                collection
+            initial_capacity: Number of rows the matrix is first allocated with, doubled when full
+            **kwargs: Additional configuration
+        """
+        super().__init__(**kwargs)
+        self.collection_name = collection_name
+        self.store_dir = store_dir
+        self.batch_size = batch_size
+        self.parallel = parallel
+        self.embed_model_name = embed_model_name
+        self.enable_embedding_cache = enable_embedding_cache
+        self.embedding_cache_dir = embedding_cache_dir
+        self.embedding_cache_max_entries = embedding_cache_max_entries
+        self.enable_dedup = enable_dedup
+        self.dedup_threshold = dedup_threshold
+        self.dedup_index_dir = dedup_index_dir
+        if enable_dedup:
+            self._dedup_index = NearDuplicateIndex(
+                threshold=dedup_threshold,
+                index_path=f"{dedup_index_dir}/{collection_name}.sqlite",
+            )
+        self.manifest_dir = manifest_dir
+        self._manifest = ChunkManifest(f"{manifest_dir}/{collection_name}.sqlite")
+        self.initial_capacity = initial_capacity
+        self._collection_dir = Path(store_dir) / collection_name
+        self._lock = threading.RLock()
+        self._embedding_cache = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._vectors: Optional[np.memmap] = None
+        self._row_count = 0
+        self._rows: Dict[str, int] = {}
+        self._free_rows: List[int] = []
+        self._alive = np.zeros(0, dtype=bool)
+        self._plan_masks: Dict[str, np.ndarray] = {}
+    
+    def _initialize(self) -> None:
+        """Initialize the embedding model and load the collection from disk."""
+        try:
+            self._embed_model = FastEmbedEmbedding(
+                model_name=self.embed_model_name, embed_batch_size=self.batch_size
+            )
+            if self.enable_embedding_cache:
+                self._embedding_cache = EmbeddingCache(
+                    self.embedding_cache_dir, self.embedding_cache_max_entries
+                )
+                self._embed_model = CachedEmbedding(self._embed_model, self._embedding_cache)
+            self._load()
+        except Exception as e:
+            raise RuntimeError(f"Failed to initialize NumPy vector store: {str(e)}")
+    
+    def _load(self) -> None:
+        """Open the collection's points table and map its matrix."""
+        self._collection_dir.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self._collection_dir / "points.sqlite"),
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_POINTS_SCHEMA)
+        
+        row = self._conn.execute("SELECT value FROM store_info WHERE key = 'dim'").fetchone()
+        self._embedding_dim = int(row[0]) if row else None
+        vectors_path = self._collection_dir / "vectors.f32"
+        if self._embedding_dim is not None and vectors_path.exists():
+            capacity = vectors_path.stat().st_size // (self._embedding_dim * 4)
+            self._vectors = np.memmap(vectors_path, dtype=np.float32, mode="r+",
+                                      shape=(capacity, self._embedding_dim))
+        
+        capacity = len(self._vectors) if self._vectors is not None else 0
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._plan_masks = {}
+        self._rows = {}
+        for row, node_id, plan_names in self._conn.execute("SELECT row, node_id, plan_names FROM points"):
+            self._rows[node_id] = row
+            self._alive[row] = True
+            self._set_plans(row, json.loads(plan_names))
+        self._row_count = max(self._rows.values()) + 1 if self._rows else 0
+        self._free_rows = np.flatnonzero(~self._alive[:self._row_count]).tolist()
+    
+    def _set_plans(self, row: int, plan_names: List[str]) -> None:
+        """Set the plan name columns of a row."""
+        for mask in self._plan_masks.values():
+            mask[row] = False
+        for plan_name in plan_names:
+            if plan_name not in self._plan_masks:
+                self._plan_masks[plan_name] = np.zeros(len(self._alive), dtype=bool)
+            self._plan_masks[plan_name][row] = True
+    
+    def _reserve(self, count: int, dim: int) -> None:
+        """Grow the matrix and the columns to hold `count` more rows."""
+        if self._vectors is None:
+            self._embedding_dim = dim
+            self._conn.execute("INSERT OR REPLACE INTO store_info (key, value) VALUES ('dim', ?)", (str(dim),))
+        elif dim != self._embedding_dim:
+            raise ValueError(f"Embedding dimension {dim} does not match the collection's {self._embedding_dim}")
+        
+        needed = self._row_count + max(count - len(self._free_rows), 0)
+        capacity = len(self._alive)
+        if needed <= capacity:
+            return
+        
+        new_capacity = max(capacity, self.initial_capacity)
+        while new_capacity < needed:
+            new_capacity *= 2
+        
+        # Extend the file in place and map it again; existing rows are not copied
+        vectors_path = self._collection_dir / "vectors.f32"
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._vectors = None
+        with open(vectors_path, "ab") as f:
+            f.truncate(new_capacity * dim * 4)
+        self._vectors = np.memmap(vectors_path, dtype=np.float32, mode="r+", shape=(new_capacity, dim))
+        
+        self._alive = np.concatenate([self._alive, np.zeros(new_capacity - capacity, dtype=bool)])
+        for plan_name, mask in self._plan_masks.items():
+            self._plan_masks[plan_name] = np.concatenate([mask, np.zeros(new_capacity - capacity, dtype=bool)])
+    
+    def add(self, nodes: Union[List[BaseNode], ChunkBatch], **kwargs) -> List[str]:
+        """
+        Add nodes to the vector store.
+        
+        Args:
+            nodes: List of nodes or a chunk batch to add
+            **kwargs: Additional storage options
+        
+        Returns:
+            List of node IDs that were added
+        """
+        self._ensure_initialized()
+        
+        try:
+            batch, stored_updates, changes = self._dedup_nodes(self._prepare_batch(nodes))
+            if len(batch):
+                self._embed_nodes(batch)
+            return self._write_batch(batch, stored_updates, changes, **kwargs)
+        except Exception as e:
+            self._rollback_dedup()
+            raise RuntimeError(f"Failed to add nodes to NumPy store: {str(e)}")
+    
+    def _upsert_nodes(self, batch: ChunkBatch, **kwargs) -> List[str]:
+        """
+        Write an embedded batch to the matrix and the points table.
+        
+        Nodes already in the collection keep their row, new nodes reuse the rows
+        of deleted ones first.
+        
+        Args:
+            batch: Embedded chunk batch
+            **kwargs: Additional storage options
+        
+        Returns:
+            List of node IDs that were written
+        """
+        if not batch.has_embedding.all():
+            raise ValueError("Every node must be embedded before it is written")
+        
+        vectors = batch.embeddings.astype(np.float32, copy=True)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.where(norms > 0, norms, 1.0)
+        
+        with self._lock:
+            new_count = sum(1 for record in batch if record.node_id not in self._rows)
+            self._reserve(new_count, vectors.shape[1])
+            
+            rows = []
+            for record in batch:
+                row = self._rows.get(record.node_id)
+                if row is None:
+                    if self._free_rows:
+                        row = self._free_rows.pop()
+                    else:
+                        row = self._row_count
+                        self._row_count += 1
+                    self._rows[record.node_id] = row
+                rows.append(row)
+            
+            self._vectors[rows] = vectors
+            self._vectors.flush()
+            self._alive[rows] = True
+            
+            points = []
+            for row, node in zip(rows, batch.to_nodes(with_embeddings=False)):
+                plan_names = get_plan_names(node.metadata)
+                self._set_plans(row, plan_names)
+                payload = node_to_metadata_dict(node, remove_text=False, flat_metadata=False)
+                points.append((row, node.node_id, json.dumps(plan_names), json.dumps(payload)))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO points (row, node_id, plan_names, payload) VALUES (?, ?, ?, ?)",
+                points,
+            )
+        
+        return [record.node_id for record in batch]
+    
+    def _update_sources(self, sources: Dict[str, List[str]]) -> None:
+        """
+        Point stored nodes at every plan their near-duplicates came from.
+        
+        Args:
+            sources: Mapping of stored node ID to its merged plan names
+        """
+        with self._lock:
+            updates = []
+            for node_id, plan_names in sources.items():
+                row = self._rows.get(node_id)
+                if row is None:
+                    continue
+                (payload,) = self._conn.execute("SELECT payload FROM points WHERE row = ?", (row,)).fetchone()
+                node = metadata_dict_to_node(json.loads(payload))
+                node.metadata["plan_name"] = plan_names
+                payload = node_to_metadata_dict(node, remove_text=False, flat_metadata=False)
+                self._set_plans(row, get_plan_names(node.metadata))
+                updates.append((json.dumps(get_plan_names(node.metadata)), json.dumps(payload), row))
+            self._conn.executemany("UPDATE points SET plan_names = ?, payload = ? WHERE row = ?", updates)
+    
+    def search(self, query: str, top_k: int = 5, plan_name: str = None, **kwargs) -> List[NodeWithScore]:
+        """
+        Search for similar nodes by exact cosine similarity.
+        
+        Args:
+            query: Search query
+            top_k: Number of results to return
+            plan_name: Only return nodes of this plan, all plans if None
+            **kwargs: Additional search options
+        
+        Returns:
+            List of nodes with similarity scores
+        """
+        self._ensure_initialized()
+        
+        try:
+            query_embedding = np.asarray(self._embed_model.get_query_embedding(query), dtype=np.float32)
+            return self.search_by_vector(query_embedding, top_k=top_k, plan_name=plan_name)
+        except Exception as e:
+            logger.error(f"Failed to search in NumPy store: {str(e)}")
+            raise RuntimeError(f"Failed to search in NumPy store: {str(e)}")
+    
+    def search_batch(self, queries: List[str], filters: Optional[List[Optional[str]]] = None,
+                     top_k: int = 5, **kwargs) -> List[List[NodeWithScore]]:
+        """
+        Search for similar nodes for several queries, embedded in one batch.
+        
+        Args:
+            queries: Search queries
+            filters: Plan name each query is restricted to, None for all plans
+            top_k: Number of results to return per query
+            **kwargs: Additional search options
+            
+        Returns:
+            List of nodes with similarity scores for each query, in query order
+        """
+        self._ensure_initialized()
+        filters = self._check_filters(queries, filters)
+        
+        try:
+            embeddings = self._embed_queries(queries) if queries else []
+            return [
+                self.search_by_vector(np.asarray(embedding, dtype=np.float32), top_k=top_k,
+                                      plan_name=plan_name)
+                for embedding, plan_name in zip(embeddings, filters)
+            ]
+        except Exception as e:
+            logger.error(f"Failed to search in NumPy store: {str(e)}")
+            raise RuntimeError(f"Failed to search in NumPy store: {str(e)}")
+    
+    def search_by_vector(self, query_embedding: np.ndarray, top_k: int = 5,
+                         plan_name: Optional[str] = None) -> List[NodeWithScore]:
+        """
+        Search for the nodes closest to an embedding.
+        
+        Args:
+            query_embedding: Query embedding
+            top_k: Number of results to return
+            plan_name: Only return nodes of this plan, all plans if None
+        
+        Returns:
+            List of nodes with similarity scores
+        """
+        self._ensure_initialized()
+        
+        with self._lock:
+            if self._vectors is None or top_k <= 0:
+                return []
+            mask = self._alive[:self._row_count]
+            if plan_name is not None:
+                plan_mask = self._plan_masks.get(str(plan_name))
+                if plan_mask is None:
+                    return []
+                mask = mask & plan_mask[:self._row_count]
+            
+            query_embedding = np.asarray(query_embedding, dtype=np.float32)
+            norm = np.linalg.norm(query_embedding)
+            if norm > 0:
+                query_embedding = query_embedding / norm
+            
+            # Score only the selected rows when a filter leaves out part of the matrix
+            if mask.all():
+                rows = np.arange(self._row_count)
+                scores = self._vectors[:self._row_count] @ query_embedding
+            else:
+                rows = np.flatnonzero(mask)
+                if not len(rows):
+                    return []
+                scores = self._vectors[rows] @ query_embedding
+            
+            k = min(top_k, len(rows))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            top_rows = rows[top].tolist()
+            top_scores = scores[top].tolist()
+            
+            placeholders = ",".join("?" * len(top_rows))
+            payloads = dict(self._conn.execute(
+                f"SELECT row, payload FROM points WHERE row IN ({placeholders})", top_rows
+            ))
+        
+        return [
+            NodeWithScore(node=metadata_dict_to_node(json.loads(payloads[row])), score=float(score))
+            for row, score in zip(top_rows, top_scores)
+        ]
+    
+    def delete(self, node_ids: List[str]) -> bool:
+        """
+        Delete nodes by their IDs.
+        
+        Args:
+            node_ids: List of node IDs to delete
+        
+        Returns:
+            True if deletion was successful
+        """
+        self._ensure_initialized()
+        
+        try:
+            with self._lock:
+                rows = [self._rows.pop(node_id) for node_id in node_ids if node_id in self._rows]
+                if not rows:
+                    return True
+                self._conn.executemany("DELETE FROM points WHERE row = ?", [(row,) for row in rows])
+                self._alive[rows] = False
+                for mask in self._plan_masks.values():
+                    mask[rows] = False
+                self._free_rows.extend(rows)
+            return True
+        except Exception as e:
+            raise RuntimeError(f"Failed to delete nodes from NumPy store: {str(e)}")
+    
+    def get_store_name(self) -> str:
+        """Get vector store name."""
+        return "NumpyStore"
+    
+    def get_collection_info(self) -> Dict[str, Any]:
+        """Get collection information."""
+        info = super().get_collection_info()
+        with self._lock:
+            info.update({
+                "store_dir": self.store_dir,
+                "collection_name": self.collection_name,
+                "batch_size": self.batch_size,
+                "parallel": self.parallel,
+                "points_count": len(self._rows),
+                "capacity": len(self._alive),
+                "embedding_dim": self._embedding_dim,
+                "plans": len(self._plan_masks),
+                "embedding_cache": (
+                    self._embedding_cache.get_cache_info()
+                    if self._embedding_cache is not None
+                    else {"enabled": False}
+                ),
+            })
+        if self._dedup_index is not None and self._embedding_dim is not None:
+            info["dedup"]["vector_bytes_saved"] = info["dedup"]["duplicates_dropped"] * self._embedding_dim * 4
+        return info
+    
+    def close(self) -> None:
+        """Flush the matrix and close the points table."""
+        with self._lock:
+            if self._vectors is not None:
+                self._vectors.flush()
+                self._vectors = None
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._initialized = False
+    
+    def drop_collection(self) -> bool:
+        """
+        Delete the collection and its local dedup index and manifest.
+        
+        Returns:
+            True if dropping was successful
+        """
+        try:
+            self.close()
+            if self._collection_dir.exists():
+                shutil.rmtree(self._collection_dir)
+            if self._dedup_index is not None:
+                self._dedup_index.clear()
+            self._manifest.clear()
+            self._row_count = 0
+            self._rows = {}
+            self._free_rows = []
+            self._alive = np.zeros(0, dtype=bool)
+            self._plan_masks = {}
+            self._embedding_dim = None
+            return True
+        except Exception as e:
+            raise RuntimeError(f"Failed to drop NumPy store collection: {str(e)}")
+    
+    def clear_collection(self) -> bool:
+        """
+        Clear all data from the collection.
+        
+        Returns:
+            True if clearing was successful
+        """
+        try:
+            self.drop_collection()
+            self._ensure_initialized()
+            return True
+        except Exception as e:
+            raise RuntimeError(f"Failed to clear NumPy store collection: {str(e)}")
@@ -2,26 +2,158 @@
 Qdrant vector store implementation.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Union
+import asyncio
+import json
+import os
+import threading
+import httpx
 import qdrant_client
 from qdrant_client.http import models as rest
-from llama_index.core.schema import BaseNode, NodeWithScore
+from llama_index.core.schema import BaseNode, NodeWithScore, NodeRelationship, QueryBundle
+from llama_index.core.retrievers import AutoMergingRetriever
+from llama_index.core.storage.docstore.keyval_docstore import (
+    DEFAULT_COLLECTION_DATA_SUFFIX,
+    DEFAULT_NAMESPACE,
+    KVDocumentStore,
+)
 from llama_index.vector_stores.qdrant import QdrantVectorStore
+from llama_index.vector_stores.qdrant.utils import fastembed_sparse_encoder
 from llama_index.embeddings.fastembed import FastEmbedEmbedding
-from llama_index.core import VectorStoreIndex, StorageContext, Settings
-from vector_stores.base_vector_store import BaseVectorStore
+from llama_index.core import VectorStoreIndex, StorageContext
+from vector_stores.base_vector_store import BaseVectorStore, get_plan_names
+from core.interfaces.vector_store_interface import AsyncVectorStoreInterface
+from util.embedding_cache import EmbeddingCache, CachedEmbedding, cached_sparse_encoder
 from llama_index.core.vector_stores import (
     MetadataFilter,
     MetadataFilters,
     FilterOperator,
 )
+from util.near_dedup import NearDuplicateIndex
+from util.chunk_manifest import ChunkManifest
+from util.chunk_batch import ChunkBatch
+from util.sqlite_kvstore import SqliteKVStore
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-class QdrantStore(BaseVectorStore):
-    """Qdrant vector store implementation."""
+def get_client_options(
+    url: str,
+    api_key: Optional[str] = None,
+    prefer_grpc: bool = False,
+    grpc_port: int = 6334,
+    timeout: Optional[int] = None,
+    pool_size: Optional[int] = None,
+    keepalive_seconds: float = 30.0,
+) -> Dict[str, Any]:
+    """
+    Get the Qdrant client arguments for a transport.
+
+    The REST client already reuses connections through one pooled httpx
+    client; its limits are only replaced when pool_size is set. The gRPC
+    channel sends keepalive pings so idle connections are not dropped.
+
+    Args:
+        url: Qdrant server URL
+        api_key: API key for authentication
+        prefer_grpc: Talk to Qdrant over gRPC instead of REST
+        grpc_port: Qdrant gRPC port
+        timeout: Request timeout in seconds, the client default if None
+        pool_size: Maximum number of pooled REST connections, httpx's limits if None
+        keepalive_seconds: gRPC keepalive ping interval, and how long idle REST
+            connections are kept when pool_size is set
+
+    Returns:
+        Keyword arguments for QdrantClient and AsyncQdrantClient
+    """
+    keepalive_ms = int(keepalive_seconds * 1000)
+    options = {
+        "url": url,
+        "api_key": api_key,
+        "prefer_grpc": prefer_grpc,
+        "grpc_port": grpc_port,
+        "timeout": timeout,
+        "grpc_options": {
+            "grpc.keepalive_time_ms": keepalive_ms,
+            "grpc.keepalive_timeout_ms": min(keepalive_ms, 10_000),
+        },
+    }
+    if pool_size:
+        options["limits"] = httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size,
+            keepalive_expiry=keepalive_seconds,
+        )
+    return options
+
+
+class AsyncAutoMergingRetriever(AutoMergingRetriever):
+    """
+    Auto-merging retriever that retrieves leaves through the async vector store path.
+
+    With a plan name, leaves are only merged into parents and filled in with
+    neighbours of that plan. A leaf shared by near-duplicate plans has the
+    parent of the plan it was first stored for, whose other leaves may not
+    belong to the plan searched.
+    """
+
+    def __init__(self, *args, plan_name: Optional[str] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._plan_name = plan_name
+
+    def _in_plan(self, node: BaseNode) -> bool:
+        """Check if a node belongs to the plan searched."""
+        return self._plan_name is None or self._plan_name in get_plan_names(
+            node.metadata
+        )
+
+    def _fill_in_nodes(
+        self, nodes: List[NodeWithScore]
+    ) -> Tuple[List[NodeWithScore], bool]:
+        if self._plan_name is None:
+            return super()._fill_in_nodes(nodes)
+        filled, _ = super()._fill_in_nodes(nodes)
+        filled = [node for node in filled if self._in_plan(node.node)]
+        return filled, len(filled) > len(nodes)
+
+    def _get_parents_and_merge(
+        self, nodes: List[NodeWithScore]
+    ) -> Tuple[List[NodeWithScore], bool]:
+        if self._plan_name is None:
+            return super()._get_parents_and_merge(nodes)
+        mergeable, unmerged = [], []
+        docstore = self._storage_context.docstore
+        for node in nodes:
+            parent = node.node.parent_node
+            if parent is None or self._in_plan(docstore.get_document(parent.node_id)):
+                mergeable.append(node)
+            else:
+                unmerged.append(node)
+        merged, is_changed = super()._get_parents_and_merge(mergeable)
+        return merged + unmerged, is_changed
+
+    def merge_nodes(self, nodes: List[NodeWithScore]) -> List[NodeWithScore]:
+        """Merge retrieved leaves into their parents, as retrieve() does."""
+        nodes, is_changed = self._try_merging(nodes)
+        while is_changed:
+            nodes, is_changed = self._try_merging(nodes)
+        nodes.sort(key=lambda node: node.get_score(), reverse=True)
+        return nodes
+
+    async def _aretrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
+        # The base class falls back to the blocking _retrieve
+        return self.merge_nodes(await self._vector_retriever.aretrieve(query_bundle))
+
+
+class QdrantStore(BaseVectorStore, AsyncVectorStoreInterface):
+    """
+    Qdrant vector store implementation.
+
+    Every operation has a blocking and an async variant. The async variants
+    (aadd, asearch, adelete) talk to Qdrant through AsyncQdrantClient and run
+    embedding in worker threads, so many requests can share one event loop.
+    """
 
     def __init__(
         self,
@@ -32,6 +164,22 @@ class QdrantStore(BaseVectorStore):
         batch_size: int = 64,
         parallel: int = 1,
         embed_model_name: str = "BAAI/bge-small-en-v1.5",
+        sparse_model_name: str = "prithivida/Splade_PP_en_v1",
+        enable_embedding_cache: bool = True,
+        embedding_cache_dir: str = "cache/embeddings",
+        embedding_cache_max_entries: int = 500_000,
+        enable_dedup: bool = False,
+        dedup_threshold: float = 0.85,
+        dedup_index_dir: str = "cache/dedup",
+        leaf_only: bool = False,
+        docstore_dir: str = "cache/docstore",
+        merge_ratio: float = 0.5,
+        manifest_dir: str = "cache/manifest",
+        prefer_grpc: bool = False,
+        grpc_port: int = 6334,
+        timeout: Optional[int] = None,
+        pool_size: Optional[int] = None,
+        keepalive_seconds: float = 30.0,
         **kwargs,
     ):
         """
@@ -42,9 +190,29 @@ class QdrantStore(BaseVectorStore):
             collection_name: Collection name
             api_key: API key for authentication
             enable_hybrid: Enable hybrid search
-            batch_size: Batch size for operations
-            parallel: Number of parallel operations
+            batch_size: Batch size for embedding and upsert operations
+            parallel: Number of embedding batches and upload workers run in parallel
             embed_model_name: Embedding model name for FastEmbed
+            sparse_model_name: Sparse model name for FastEmbed, used when hybrid search is enabled
+            enable_embedding_cache: Cache dense and sparse document embeddings on disk
+            embedding_cache_dir: Directory to store the embedding cache
+            embedding_cache_max_entries: Maximum number of cached embeddings per model
+            enable_dedup: Collapse near-duplicate nodes into one point listing every plan_name
+            dedup_threshold: Minimum estimated Jaccard similarity of near-duplicate nodes
+            dedup_index_dir: Directory to persist the near-duplicate index, one file per collection
+            leaf_only: Embed only leaf nodes of hierarchical chunks, keep every node in a
+                local docstore and merge retrieved leaves into their parents
+            docstore_dir: Directory to persist the docstore, one SQLite file per collection
+            merge_ratio: Fraction of a parent's leaves that must be retrieved to merge them
+            manifest_dir: Directory to persist the chunk manifest used by sync, one file per
+                collection
+            prefer_grpc: Talk to Qdrant over gRPC instead of REST where the client supports it
+            grpc_port: Qdrant gRPC port
+            timeout: Request timeout in seconds, the client default if None
+            pool_size: Maximum number of pooled REST connections, httpx's limits
+                if None; gRPC multiplexes requests over a single channel
+            keepalive_seconds: gRPC keepalive ping interval, and how long idle REST
+                connections are kept when pool_size is set
             **kwargs: Additional configuration
         """
         super().__init__(**kwargs)
@@ -55,49 +223,127 @@ class QdrantStore(BaseVectorStore):
         self.batch_size = batch_size
         self.parallel = parallel
         self.embed_model_name = embed_model_name
+        self.sparse_model_name = sparse_model_name
+        self.enable_embedding_cache = enable_embedding_cache
+        self.embedding_cache_dir = embedding_cache_dir
+        self.embedding_cache_max_entries = embedding_cache_max_entries
+        self.enable_dedup = enable_dedup
+        self.dedup_threshold = dedup_threshold
+        self.dedup_index_dir = dedup_index_dir
+        if enable_dedup:
+            self._dedup_index = NearDuplicateIndex(
+                threshold=dedup_threshold,
+                index_path=f"{dedup_index_dir}/{collection_name}.sqlite",
+            )
+        self.leaf_only = leaf_only
+        self.docstore_dir = docstore_dir
+        self.merge_ratio = merge_ratio
+        self._docstore_path = os.path.join(docstore_dir, f"{collection_name}.sqlite")
+        self._docstore_kvstore = None
+        self._docstore = None
+        self._docstore_lock = threading.Lock()
+        self.manifest_dir = manifest_dir
+        self._manifest = ChunkManifest(f"{manifest_dir}/{collection_name}.sqlite")
+        self.prefer_grpc = prefer_grpc
+        self.grpc_port = grpc_port
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.keepalive_seconds = keepalive_seconds
+        self._embedding_cache = None
         self._client = None
+        self._aclient = None
         self._vector_store = None
-        self._embed_model = None
         self._index = None
 
     def _initialize(self) -> None:
         """Initialize Qdrant client and vector store."""
         try:
             # Create embedding model
-            self._embed_model = FastEmbedEmbedding(model_name=self.embed_model_name)
-
-            # Create Qdrant client
-            self._client = qdrant_client.QdrantClient(
-                url=self.url, api_key=self.api_key if self.api_key else None
+            self._embed_model = FastEmbedEmbedding(
+                model_name=self.embed_model_name, embed_batch_size=self.batch_size
             )
+            if self.enable_embedding_cache:
+                self._embedding_cache = EmbeddingCache(
+                    self.embedding_cache_dir, self.embedding_cache_max_entries
+                )
+                self._embed_model = CachedEmbedding(
+                    self._embed_model, self._embedding_cache
+                )
+
+            # Create sparse encoders for hybrid search, sharing one model
+            sparse_doc_fn = None
+            sparse_query_fn = None
+            if self.enable_hybrid:
+                sparse_query_fn = fastembed_sparse_encoder(
+                    model_name=self.sparse_model_name
+                )
+                sparse_doc_fn = sparse_query_fn
+                if self._embedding_cache is not None:
+                    sparse_doc_fn = cached_sparse_encoder(
+                        sparse_query_fn, self._embedding_cache, self.sparse_model_name
+                    )
+
+            # Create Qdrant clients, the async one backs aadd/asearch/adelete
+            self._client = qdrant_client.QdrantClient(**self._client_options())
+            self._aclient = qdrant_client.AsyncQdrantClient(**self._client_options())
 
             # Create vector store
             self._vector_store = QdrantVectorStore(
                 client=self._client,
+                aclient=self._aclient,
                 collection_name=self.collection_name,
                 enable_hybrid=self.enable_hybrid,
                 batch_size=self.batch_size,
                 parallel=self.parallel,
+                sparse_doc_fn=sparse_doc_fn,
+                sparse_query_fn=sparse_query_fn,
             )
 
             # Set up storage context and index
             storage_context = StorageContext.from_defaults(
                 vector_store=self._vector_store
             )
-            Settings.embed_model = self._embed_model
+            # Pass the model explicitly, the global Settings are shared by every
+            # store in the process and sweeps build stores in parallel threads
             self._index = VectorStoreIndex.from_vector_store(
-                vector_store=self._vector_store, storage_context=storage_context
+                vector_store=self._vector_store,
+                storage_context=storage_context,
+                embed_model=self._embed_model,
             )
 
+            if self.leaf_only and self._docstore is None:
+                self._docstore_kvstore = SqliteKVStore(self._docstore_path)
+                self._docstore = KVDocumentStore(self._docstore_kvstore)
+
         except Exception as e:
             raise RuntimeError(f"Failed to initialize Qdrant vector store: {str(e)}")
 
-    def add(self, nodes: List[BaseNode], **kwargs) -> List[str]:
+    @staticmethod
+    def _docstore_nodes_collection() -> str:
+        """Get the key-value collection the docstore keeps its nodes in."""
+        return f"{DEFAULT_NAMESPACE}{DEFAULT_COLLECTION_DATA_SUFFIX}"
+
+    def _client_options(self) -> Dict[str, Any]:
+        """Get the Qdrant client arguments for the configured transport."""
+        return get_client_options(
+            url=self.url,
+            api_key=self.api_key if self.api_key else None,
+            prefer_grpc=self.prefer_grpc,
+            grpc_port=self.grpc_port,
+            timeout=self.timeout,
+            pool_size=self.pool_size,
+            keepalive_seconds=self.keepalive_seconds,
+        )
+
+    def add(self, nodes: Union[List[BaseNode], ChunkBatch], **kwargs) -> List[str]:
         """
         Add nodes to the vector store.
 
+        Nodes are packed into a chunk batch, so embeddings are held in one float32
+        matrix until the batch is written.
+
         Args:
-            nodes: List of nodes to add
+            nodes: List of nodes or a chunk batch to add
             **kwargs: Additional storage options
 
         Returns:
@@ -106,23 +352,218 @@ class QdrantStore(BaseVectorStore):
         self._ensure_initialized()
 
         try:
-            for node in nodes:
-                if not hasattr(node, "embedding") or node.embedding is None:
-                    node.embedding = self._embed_model.get_text_embedding(
-                        node.get_content()
-                    )
+            return self._write_batch(*self._prepare_and_embed(nodes), **kwargs)
+        except Exception as e:
+            self._rollback_dedup()
+            raise RuntimeError(f"Failed to add nodes to Qdrant: {str(e)}")
 
-            # Add to vector store
-            node_ids = self._vector_store.add(nodes, **kwargs)
+    async def aadd(
+        self, nodes: Union[List[BaseNode], ChunkBatch], **kwargs
+    ) -> List[str]:
+        """
+        Add nodes to the vector store without blocking the event loop.
 
-            # Update the index with new nodes
-            if self._index is not None:
-                self._index.insert_nodes(nodes)
+        Deduplication and embedding run in a worker thread, the points are
+        written through the async client.
 
+        Args:
+            nodes: List of nodes or a chunk batch to add
+            **kwargs: Additional storage options
+
+        Returns:
+            List of node IDs that were added
+        """
+        self._ensure_initialized()
+
+        try:
+            batch, stored_updates, changes = await asyncio.to_thread(
+                self._prepare_and_embed, nodes
+            )
+            node_ids = []
+            if len(batch):
+                node_ids = await self._vector_store.async_add(
+                    batch.to_nodes(), **kwargs
+                )
+            await asyncio.to_thread(self._commit_dedup, stored_updates, changes)
             return node_ids
         except Exception as e:
+            await asyncio.to_thread(self._rollback_dedup)
             raise RuntimeError(f"Failed to add nodes to Qdrant: {str(e)}")
 
+    def _prepare_and_embed(
+        self, nodes: Union[List[BaseNode], ChunkBatch]
+    ) -> Tuple[ChunkBatch, Dict[str, List[str]], Any]:
+        """
+        Get the deduplicated, embedded batch of nodes to write.
+
+        Args:
+            nodes: List of nodes or a chunk batch to add
+
+        Returns:
+            Tuple of (embedded chunk batch, empty if nothing is left to write,
+            {stored node ID: merged plan names}, dedup index changes)
+        """
+        batch, stored_updates, changes = self._dedup_nodes(self._prepare_batch(nodes))
+        if len(batch):
+            self._embed_nodes(batch)
+        return batch, stored_updates, changes
+
+    def _index_nodes(self, batch: ChunkBatch) -> ChunkBatch:
+        """
+        Keep parent nodes out of the index in leaf-only mode.
+
+        Only leaves (nodes without children) are embedded; parents go to the
+        docstore once the leaves were deduplicated, see _dedup_nodes().
+
+        Args:
+            batch: Chunk batch about to be embedded
+
+        Returns:
+            Chunk batch to embed and write
+        """
+        if not self.leaf_only:
+            return batch
+
+        child = NodeRelationship.CHILD.value
+        return batch.select(
+            [row for row, record in enumerate(batch) if not record.relationships.get(child)]
+        )
+
+    def _dedup_nodes(
+        self, batch: ChunkBatch
+    ) -> Tuple[ChunkBatch, Dict[str, List[str]], Any]:
+        """
+        Drop near-duplicate leaves, then write the batch to the docstore in leaf-only mode.
+
+        The docstore, which the auto-merging retriever reads parents and skipped
+        neighbours from, gets the parents and the kept leaves, with relationships
+        pointing at the leaves that replaced dropped duplicates. Dropped leaves
+        are removed from their parent's children, so they do not count against
+        `merge_ratio`.
+
+        Args:
+            batch: Chunk batch about to be embedded
+
+        Returns:
+            Tuple of (chunk batch to embed and write, {stored node ID: merged plan
+            names}, dedup index changes)
+        """
+        kept, stored_updates, changes = super()._dedup_nodes(batch)
+        if self.leaf_only:
+            self._add_to_docstore(batch, kept)
+        return kept, stored_updates, changes
+
+    def _add_to_docstore(self, batch: ChunkBatch, kept: ChunkBatch) -> None:
+        """
+        Write the parents and kept leaves of a batch to the docstore.
+
+        Args:
+            batch: Chunk batch as chunked, parents included
+            kept: Leaves of the batch left after deduplication
+        """
+        child = NodeRelationship.CHILD.value
+        parent = NodeRelationship.PARENT.value
+        kept_ids = {record.node_id for record in kept}
+        parents = {
+            record.node_id: record for record in batch if record.relationships.get(child)
+        }
+        dropped = [
+            record
+            for record in batch
+            if record.node_id not in parents and record.node_id not in kept_ids
+        ]
+        dropped_ids = {record.node_id for record in dropped}
+
+        def is_dropped(node_id: str) -> bool:
+            return node_id in dropped_ids or (
+                self._dedup_index is not None
+                and self._dedup_index.get_alias(node_id) is not None
+            )
+
+        with self._docstore_lock:
+            for record in parents.values():
+                record.relationships[child] = [
+                    node_id
+                    for node_id in record.relationships[child]
+                    if not is_dropped(node_id)
+                ]
+
+            # Parents written by earlier batches lose the leaves dropped now
+            stored_parents = {}
+            for record in dropped:
+                parent_id = record.relationships.get(parent)
+                if parent_id is None or parent_id in parents:
+                    continue
+                if parent_id not in stored_parents:
+                    stored_parents[parent_id] = self._docstore.get_document(
+                        parent_id, raise_error=False
+                    )
+                stored_parent = stored_parents[parent_id]
+                if stored_parent is not None:
+                    stored_parent.relationships[NodeRelationship.CHILD] = [
+                        info
+                        for info in stored_parent.child_nodes or []
+                        if info.node_id != record.node_id
+                    ]
+
+            nodes = ChunkBatch(list(parents.values())).to_nodes(with_embeddings=False)
+            nodes += kept.to_nodes(with_embeddings=False)
+            nodes += [node for node in stored_parents.values() if node is not None]
+            self._docstore.add_documents(nodes, allow_update=True)
+
+    def _update_sources(self, sources: Dict[str, List[str]]) -> None:
+        """
+        Point stored nodes at every plan their near-duplicates came from.
+
+        The plan names are set both on the top-level payload key the search
+        filter matches and in the serialized node, so retrieved nodes carry
+        them too. Points that no longer exist are skipped.
+
+        Args:
+            sources: Mapping of stored node ID to its merged plan names
+        """
+        points = self._client.retrieve(
+            collection_name=self.collection_name,
+            ids=list(sources),
+            with_payload=["_node_content"],
+            with_vectors=False,
+        )
+        operations = []
+        for point in points:
+            plan_names = sources[str(point.id)]
+            payload = {"plan_name": plan_names}
+            node_content = (point.payload or {}).get("_node_content")
+            if node_content:
+                node_dict = json.loads(node_content)
+                node_dict.setdefault("metadata", {})["plan_name"] = plan_names
+                payload["_node_content"] = json.dumps(node_dict)
+            operations.append(
+                rest.SetPayloadOperation(
+                    set_payload=rest.SetPayload(payload=payload, points=[point.id])
+                )
+            )
+        if operations:
+            self._client.batch_update_points(
+                collection_name=self.collection_name, update_operations=operations
+            )
+
+    def _upsert_nodes(self, batch: ChunkBatch, **kwargs) -> List[str]:
+        """
+        Write an embedded batch to Qdrant.
+
+        Points are written once through the vector store, which takes TextNodes,
+        so the batch is converted only here. The index is built on top of the
+        same collection, so it sees the new points without a second insert.
+
+        Args:
+            batch: Embedded chunk batch
+            **kwargs: Additional storage options
+
+        Returns:
+            List of node IDs that were written
+        """
+        return self._vector_store.add(batch.to_nodes(), **kwargs)
+
     def search(
         self, query: str, top_k: int = 5, plan_name: str = None, **kwargs
     ) -> List[NodeWithScore]:
@@ -132,6 +573,7 @@ class QdrantStore(BaseVectorStore):
         Args:
             query: Search query
             top_k: Number of results to return
+            plan_name: Only return nodes of this plan, every plan if None
             **kwargs: Additional search options
 
         Returns:
@@ -140,16 +582,10 @@ class QdrantStore(BaseVectorStore):
         self._ensure_initialized()
 
         try:
-            filters = MetadataFilters(
-                filters=[
-                    MetadataFilter(
-                        key="plan_name", value=plan_name, operator=FilterOperator.EQ
-                    ),
-                ]
-            )
-
-            retriever = self._index.as_retriever(
-                similarity_top_k=top_k, filters=filters
+            retriever = self.get_retriever(
+                similarity_top_k=top_k,
+                plan_name=plan_name,
+                filters=self._plan_filters(plan_name),
             )
             nodes_with_scores = retriever.retrieve(query)
             return nodes_with_scores
@@ -157,19 +593,161 @@ class QdrantStore(BaseVectorStore):
             logger.error(f"Failed to search in Qdrant: {str(e)}")
             raise RuntimeError(f"Failed to search in Qdrant: {str(e)}")
 
-    def get_retriever(self, similarity_top_k: int = 5, **kwargs):
+    async def asearch(
+        self, query: str, top_k: int = 5, plan_name: str = None, **kwargs
+    ) -> List[NodeWithScore]:
+        """
+        Search for similar nodes without blocking the event loop.
+
+        The query is embedded in a worker thread and the search runs on the
+        async client.
+
+        Args:
+            query: Search query
+            top_k: Number of results to return
+            plan_name: Only return nodes of this plan, every plan if None
+            **kwargs: Additional search options
+
+        Returns:
+            List of nodes with similarity scores
+        """
+        self._ensure_initialized()
+
+        try:
+            embedding = await asyncio.to_thread(
+                self._embed_model.get_query_embedding, query
+            )
+            retriever = self.get_retriever(
+                similarity_top_k=top_k,
+                plan_name=plan_name,
+                filters=self._plan_filters(plan_name),
+            )
+            return await retriever.aretrieve(
+                QueryBundle(query_str=query, embedding=embedding)
+            )
+        except Exception as e:
+            logger.error(f"Failed to search in Qdrant: {str(e)}")
+            raise RuntimeError(f"Failed to search in Qdrant: {str(e)}")
+
+    def search_batch(
+        self,
+        queries: List[str],
+        filters: Optional[List[Optional[str]]] = None,
+        top_k: int = 5,
+        **kwargs,
+    ) -> List[List[NodeWithScore]]:
+        """
+        Search for similar nodes for several queries in one request.
+
+        All distinct queries are embedded in one model call, so a question
+        searched in several plans is embedded once, and sent to Qdrant as one
+        batch query. Only the dense vectors are queried, even with
+        enable_hybrid, as search() does. In leaf-only mode the leaves retrieved
+        for each query are merged into their parents.
+
+        Args:
+            queries: Search queries
+            filters: Plan name each query is restricted to, None for all plans
+            top_k: Number of results to return per query
+            **kwargs: Additional search options
+
+        Returns:
+            List of nodes with similarity scores for each query, in query order
+        """
+        self._ensure_initialized()
+        filters = self._check_filters(queries, filters)
+        if not queries:
+            return []
+
+        try:
+            embeddings = self._embed_queries(queries)
+            responses = self._client.query_batch_points(
+                collection_name=self.collection_name,
+                requests=[
+                    rest.QueryRequest(
+                        query=embedding,
+                        using=self._vector_store.dense_vector_name or None,
+                        filter=(
+                            rest.Filter(
+                                must=[
+                                    rest.FieldCondition(
+                                        key="plan_name",
+                                        match=rest.MatchValue(value=plan_name),
+                                    )
+                                ]
+                            )
+                            if plan_name is not None
+                            else None
+                        ),
+                        limit=top_k,
+                        with_payload=True,
+                    )
+                    for embedding, plan_name in zip(embeddings, filters)
+                ],
+            )
+
+            results = []
+            retrievers = {}
+            for response, plan_name in zip(responses, filters):
+                result = self._vector_store.parse_to_query_result(response.points)
+                nodes = [
+                    NodeWithScore(node=node, score=score)
+                    for node, score in zip(result.nodes, result.similarities)
+                ]
+                if self.leaf_only:
+                    if plan_name not in retrievers:
+                        retrievers[plan_name] = self.get_retriever(
+                            similarity_top_k=top_k, plan_name=plan_name
+                        )
+                    nodes = retrievers[plan_name].merge_nodes(nodes)
+                results.append(nodes)
+            return results
+        except Exception as e:
+            logger.error(f"Failed to search in Qdrant: {str(e)}")
+            raise RuntimeError(f"Failed to search in Qdrant: {str(e)}")
+
+    def _plan_filters(self, plan_name: Optional[str]) -> Optional[MetadataFilters]:
+        """Get the metadata filter restricting a search to one plan, None for all plans."""
+        if plan_name is None:
+            return None
+        return MetadataFilters(
+            filters=[
+                MetadataFilter(
+                    key="plan_name", value=plan_name, operator=FilterOperator.EQ
+                ),
+            ]
+        )
+
+    def get_retriever(
+        self, similarity_top_k: int = 5, plan_name: Optional[str] = None, **kwargs
+    ):
         """
         Get a retriever for the vector store.
 
+        In leaf-only mode the retriever merges retrieved leaves into their parent
+        when more than `merge_ratio` of the parent's leaves were retrieved.
+
         Args:
             similarity_top_k: Number of results to return
+            plan_name: Plan the search is filtered on, leaves are only merged
+                into parents of this plan
             **kwargs: Additional retriever options
 
         Returns:
             Retriever object
         """
         self._ensure_initialized()
-        return self._index.as_retriever(similarity_top_k=similarity_top_k, **kwargs)
+        retriever = self._index.as_retriever(
+            similarity_top_k=similarity_top_k, **kwargs
+        )
+        if not self.leaf_only:
+            return retriever
+        return AsyncAutoMergingRetriever(
+            retriever,
+            StorageContext.from_defaults(docstore=self._docstore),
+            simple_ratio_thresh=self.merge_ratio,
+            plan_name=plan_name,
+        )
 
     def delete(self, node_ids: List[str]) -> bool:
         """
@@ -188,10 +766,41 @@ class QdrantStore(BaseVectorStore):
                 collection_name=self.collection_name,
                 points_selector=rest.PointIdsList(points=node_ids),
             )
+            self._delete_from_docstore(node_ids)
+            return True
+        except Exception as e:
+            raise RuntimeError(f"Failed to delete nodes from Qdrant: {str(e)}")
+
+    async def adelete(self, node_ids: List[str]) -> bool:
+        """
+        Delete nodes by their IDs without blocking the event loop.
+
+        Args:
+            node_ids: List of node IDs to delete
+
+        Returns:
+            True if deletion was successful
+        """
+        self._ensure_initialized()
+
+        try:
+            await self._aclient.delete(
+                collection_name=self.collection_name,
+                points_selector=rest.PointIdsList(points=node_ids),
+            )
+            await asyncio.to_thread(self._delete_from_docstore, node_ids)
             return True
         except Exception as e:
             raise RuntimeError(f"Failed to delete nodes from Qdrant: {str(e)}")
 
+    def _delete_from_docstore(self, node_ids: List[str]) -> None:
+        """Remove deleted nodes from the leaf-only docstore, if there is one."""
+        if self._docstore is None:
+            return
+        with self._docstore_lock:
+            for node_id in node_ids:
+                self._docstore.delete_document(node_id, raise_error=False)
+
     def get_store_name(self) -> str:
         """Get vector store name."""
         return "QdrantStore"
@@ -202,14 +811,70 @@ class QdrantStore(BaseVectorStore):
         info.update(
             {
                 "url": self.url,
+                "transport": "grpc" if self.prefer_grpc else "rest",
                 "collection_name": self.collection_name,
                 "enable_hybrid": self.enable_hybrid,
                 "batch_size": self.batch_size,
                 "parallel": self.parallel,
+                "points_count": self._get_points_count(),
+                "embedding_dim": self._embedding_dim,
+                "dedup": self._get_dedup_info(),
+                "leaf_only": self.leaf_only,
+                "docstore_nodes": (
+                    self._docstore_kvstore.count(self._docstore_nodes_collection())
+                    if self._docstore_kvstore is not None
+                    else 0
+                ),
+                "embedding_cache": (
+                    self._embedding_cache.get_cache_info()
+                    if self._embedding_cache is not None
+                    else {"enabled": False}
+                ),
             }
         )
         return info
 
+    def _get_points_count(self) -> Optional[int]:
+        """Get the number of points in the collection, None before initialization."""
+        if self._client is None:
+            return None
+        if not self._client.collection_exists(self.collection_name):
+            return 0
+        return self._client.count(collection_name=self.collection_name).count
+
+    def _get_dedup_info(self) -> Dict[str, Any]:
+        """Get deduplication statistics, with the dense vector storage saved."""
+        if self._dedup_index is None:
+            return {"enabled": False}
+
+        stats = self._dedup_index.get_stats()
+        stats["enabled"] = True
+        if self._embedding_dim is not None:
+            stats["vector_bytes_saved"] = (
+                stats["duplicates_dropped"] * self._embedding_dim * 4
+            )
+        return stats
+
+    def drop_collection(self) -> bool:
+        """
+        Delete the collection and its local dedup index, docstore and manifest.
+
+        Returns:
+            True if dropping was successful
+        """
+        self._ensure_initialized()
+
+        try:
+            self._client.delete_collection(collection_name=self.collection_name)
+            if self._dedup_index is not None:
+                self._dedup_index.clear()
+            if self._docstore_kvstore is not None:
+                self._docstore_kvstore.clear()
+            self._manifest.clear()
+            return True
+        except Exception as e:
+            raise RuntimeError(f"Failed to drop Qdrant collection: {str(e)}")
+
     def clear_collection(self) -> bool:
         """
         Clear all data from the collection.
@@ -221,6 +886,11 @@ class QdrantStore(BaseVectorStore):
 
         try:
             self._client.delete_collection(collection_name=self.collection_name)
+            if self._dedup_index is not None:
+                self._dedup_index.clear()
+            if self._docstore_kvstore is not None:
+                self._docstore_kvstore.clear()
+            self._manifest.clear()
             # Recreate the collection
             self._initialize()
             return True